@@ -0,0 +1,110 @@
+# Profil import saat startup (python -X importtime): halaman awal vs upload pertama.
+# Skrip dashboard dijalankan lewat AppTest di proses baru; import streamlit sendiri dihitung terpisah.
+# Dipakai sebagai benchmark regresi: halaman awal tidak boleh meng-import stack berat, dan total
+# waktu import halaman awal dibandingkan dengan baseline yang tersimpan.
+#
+#   python benchmarks/bench_import.py                 # cetak profil dan bandingkan dengan baseline
+#   python benchmarks/bench_import.py --simpan        # tulis ulang baseline
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, 'benchmarks', 'hasil', 'importtime.json')
+
+# Modul yang hanya boleh dimuat setelah ada data yang dibuka
+MODUL_BERAT = ['pandas', 'numpy', 'plotly.express', 'openpyxl', 'pyarrow']
+
+# Batas regresi waktu import halaman awal terhadap baseline
+TOLERANSI = 1.5
+
+PENANDA = "--- fase: {} ---"
+
+SKRIP_ANAK = """
+import sys
+from streamlit.testing.v1 import AppTest
+at = AppTest.from_file({app!r}, default_timeout=120)
+print({penanda_awal!r}, file=sys.stderr, flush=True)
+at.run()
+print({penanda_upload!r}, file=sys.stderr, flush=True)
+at.file_uploader[0].set_value(("Data_Stunting.xlsx", open({data!r}, "rb").read(), "x"))
+at.run()
+assert not at.exception, [e.value for e in at.exception]
+"""
+
+def jalankan(app, data):
+    skrip = SKRIP_ANAK.format(app=app, data=data, penanda_awal=PENANDA.format('halaman awal'),
+                              penanda_upload=PENANDA.format('upload pertama'))
+    # ETL sinkron agar semua import upload pertama terjadi sebelum proses anak selesai
+    env = dict(os.environ, STUNTING_SIMPAN_RIWAYAT='0', STUNTING_ETL_LATAR='0')
+    hasil = subprocess.run([sys.executable, '-X', 'importtime', '-c', skrip], cwd=ROOT, env=env,
+                           capture_output=True, text=True, check=True)
+    return hasil.stderr.splitlines()
+
+def per_fase(baris_stderr):
+    # {fase: {modul: waktu sendiri (us)}}; baris sebelum penanda pertama = import streamlit/AppTest
+    fase = 'streamlit'
+    hasil = {fase: {}}
+    for baris in baris_stderr:
+        if baris.startswith('--- fase: '):
+            fase = baris[len('--- fase: '):-len(' ---')]
+            hasil[fase] = {}
+        elif baris.startswith('import time:') and '|' in baris and 'self [us]' not in baris:
+            sendiri, _, nama = baris[len('import time:'):].split('|')
+            hasil[fase][nama.strip()] = int(sendiri)
+    return hasil
+
+def ringkas(modul):
+    return {'ms': round(sum(modul.values()) / 1000, 1), 'jumlah_modul': len(modul),
+            'modul_berat': [m for m in MODUL_BERAT if m in modul]}
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--app', default=os.path.join(ROOT, 'Code_Dashboard.py'))
+    parser.add_argument('--data', default=os.path.join(ROOT, 'Data_Stunting.xlsx'))
+    parser.add_argument('--ulang', type=int, default=3)
+    parser.add_argument('--top', type=int, default=10)
+    parser.add_argument('--simpan', action='store_true', help="Simpan hasil sebagai baseline baru")
+    args = parser.parse_args()
+
+    # Median dari beberapa proses baru; daftar modul diambil dari proses terakhir
+    semua = [per_fase(jalankan(args.app, args.data)) for _ in range(args.ulang)]
+    hasil = {}
+    for fase in semua[-1]:
+        ringkasan = ringkas(semua[-1][fase])
+        ringkasan['ms'] = sorted(ringkas(run[fase])['ms'] for run in semua)[len(semua) // 2]
+        hasil[fase] = ringkasan
+
+    for fase, ringkasan in hasil.items():
+        print(f"{fase:<16} {ringkasan['ms']:>9.1f} ms  {ringkasan['jumlah_modul']:>5} modul  "
+              f"modul berat: {', '.join(ringkasan['modul_berat']) or '-'}")
+        terlama = sorted(semua[-1][fase].items(), key=lambda item: -item[1])[:args.top]
+        for nama, us in terlama:
+            print(f"    {us / 1000:>8.1f} ms  {nama}")
+
+    if args.simpan:
+        os.makedirs(os.path.dirname(BASELINE), exist_ok=True)
+        with open(BASELINE, 'w') as f:
+            json.dump(hasil, f, indent=2)
+            f.write('\n')
+        print(f"Baseline disimpan ke {os.path.relpath(BASELINE)}")
+        return 0
+
+    gagal = []
+    if hasil['halaman awal']['modul_berat']:
+        gagal.append(f"halaman awal meng-import {', '.join(hasil['halaman awal']['modul_berat'])}")
+    if os.path.exists(BASELINE):
+        with open(BASELINE) as f:
+            baseline = json.load(f)
+        batas = baseline['halaman awal']['ms'] * TOLERANSI
+        print(f"Baseline halaman awal: {baseline['halaman awal']['ms']:.1f} ms (batas {batas:.1f} ms)")
+        if hasil['halaman awal']['ms'] > batas:
+            gagal.append(f"import halaman awal {hasil['halaman awal']['ms']:.1f} ms melebihi batas {batas:.1f} ms")
+    for pesan in gagal:
+        print(f"REGRESI: {pesan}", file=sys.stderr)
+    return 1 if gagal else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
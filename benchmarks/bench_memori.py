@@ -0,0 +1,75 @@
+# Laporan memori per sesi: frame yang dipegang satu sesi dashboard (fakta multi-periode, dimensi,
+# agregat, df_display, df_table) dengan tipe lama (int64/float64/str) vs skema ringkas etl.SKEMA_*.
+#
+#   python benchmarks/bench_memori.py --baris 37 2000 --bulan 36
+import argparse
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl import SKEMA_FAKTA, agregasi_kecamatan, proses_etl, terapkan_skema
+from tables import siapkan_tabel
+from benchmarks.synthetic import buat_workbook_status_gizi
+
+def tanpa_skema(df):
+    # Tipe yang dihasilkan pipeline sebelum skema ringkas: int64, float64, dan string untuk nama
+    tipe = {}
+    for kolom, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            if kolom != 'kategori':
+                tipe[kolom] = 'str'
+        elif dtype.kind == 'u':
+            tipe[kolom] = 'int64'
+        elif dtype.kind == 'f':
+            tipe[kolom] = 'float64'
+    return df.astype(tipe)
+
+def frame_sesi(df_fact, df_wilayah, konversi=lambda df: df):
+    df_agg = konversi(agregasi_kecamatan(df_fact))
+    df_display = df_agg.take(range(len(df_agg)))
+    return {
+        'df_fact': df_fact,
+        'df_wilayah': df_wilayah,
+        'df_agg': df_agg,
+        'df_display': df_display,
+        'df_table': siapkan_tabel(df_display),
+    }
+
+def buat_dataset(jumlah_baris, jumlah_bulan):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = buat_workbook_status_gizi(os.path.join(tmp, 'status_gizi.xlsx'), jumlah_baris)
+        df_fact, df_wilayah, _, success, message = proses_etl(path)
+    if not success:
+        raise RuntimeError(message)
+    # Periode yang sama direplikasi per bulan, seperti muat_riwayat() untuk semua periode
+    df_multi = pd.concat([df_fact.assign(id_waktu=bulan) for bulan in range(1, jumlah_bulan + 1)], ignore_index=True)
+    return terapkan_skema(df_multi, SKEMA_FAKTA), df_wilayah
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--baris', type=int, nargs='+', default=[37, 2000])
+    parser.add_argument('--bulan', type=int, default=36)
+    args = parser.parse_args()
+
+    for jumlah_baris in args.baris:
+        df_fact, df_wilayah = buat_dataset(jumlah_baris, args.bulan)
+        lama = frame_sesi(tanpa_skema(df_fact), tanpa_skema(df_wilayah), tanpa_skema)
+        baru = frame_sesi(df_fact, df_wilayah)
+
+        print(f"\n{jumlah_baris} puskesmas x {args.bulan} bulan ({len(df_fact):,} baris fakta)")
+        print(f"{'frame':<12} {'lama (byte)':>14} {'skema (byte)':>14} {'rasio':>7}")
+        total_lama = total_baru = 0
+        for nama in lama:
+            byte_lama = int(lama[nama].memory_usage(deep=True).sum())
+            byte_baru = int(baru[nama].memory_usage(deep=True).sum())
+            total_lama += byte_lama
+            total_baru += byte_baru
+            print(f"{nama:<12} {byte_lama:>14,} {byte_baru:>14,} {byte_lama / byte_baru:>6.1f}x")
+        print(f"{'per sesi':<12} {total_lama:>14,} {total_baru:>14,} {total_lama / total_baru:>6.1f}x")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+# Benchmark pencarian + pengurutan tab "Tabel Data": str.contains + sort_values per ketikan (cara lama)
+# vs IndeksTabel (suffix array + urutan yang sudah dihitung).
+#
+#   python benchmarks/bench_pencarian.py --baris 32 1000 10000 100000
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.bench_tabel import buat_agregat
+from tables import URUTAN_TABEL, buat_indeks_tabel
+
+# Urutan ketikan pengguna, tiap langkah adalah satu rerun
+KETIKAN = ["C", "CI", "CIB", "CIBI", "CIBIN", "1", "12", "123", ""]
+
+def cari_lama(df_agg, search_term, sort_by):
+    kolom, ascending = URUTAN_TABEL[sort_by]
+    df_display = df_agg.copy()
+    if search_term:
+        df_display = df_display[df_display['nama_kecamatan'].str.contains(search_term.upper())]
+    return df_display.sort_values(kolom, ascending=ascending)
+
+def cari_indeks(df_agg, indeks, search_term, sort_by):
+    posisi, _ = indeks.tampilkan(search_term, sort_by)
+    return df_agg.take(posisi)
+
+def ukur(fungsi, ulang):
+    hasil = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        for search_term in KETIKAN:
+            for sort_by in URUTAN_TABEL:
+                fungsi(search_term, sort_by)
+        hasil.append((time.perf_counter() - mulai) / (len(KETIKAN) * len(URUTAN_TABEL)))
+    return min(hasil)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--baris', type=int, nargs='+', default=[32, 1000, 10000, 100000])
+    parser.add_argument('--ulang', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'baris':>8} {'bangun indeks (ms)':>19} {'lama/query (ms)':>16} {'indeks/query (ms)':>18}")
+    for n in args.baris:
+        df = buat_agregat(n)
+        df['nama_kecamatan'] = [f"CIBINGBIN {i}" if i % 7 == 0 else f"WILAYAH {i}" for i in range(n)]
+        mulai = time.perf_counter()
+        indeks = buat_indeks_tabel(df)
+        bangun = time.perf_counter() - mulai
+        lama = ukur(lambda q, s: cari_lama(df, q, s), args.ulang)
+        baru = ukur(lambda q, s: cari_indeks(df, indeks, q, s), args.ulang)
+        print(f"{n:>8} {bangun * 1000:>19.1f} {lama * 1000:>16.2f} {baru * 1000:>18.2f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+# Benchmark pembacaan sheet "STATUS GIZI": dua kali read_excel (cara lama) vs satu kali
+# baca streaming dengan buka_status_gizi.
+#
+#   python benchmarks/bench_reader.py --baris 37 500 2000 --ulang 5
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl import SHEET_STATUS_GIZI, buka_status_gizi
+from benchmarks.synthetic import buat_workbook_status_gizi
+
+def baca_dua_kali(path):
+    df_title_row = pd.read_excel(path, sheet_name=SHEET_STATUS_GIZI, skiprows=1, nrows=1, header=None)
+    title_string = str(df_title_row.iloc[0, 0])
+    df_gizi_raw = pd.read_excel(path, sheet_name=SHEET_STATUS_GIZI, skiprows=5, header=None, skipfooter=1)
+    return title_string, df_gizi_raw
+
+def baca_sekali(path):
+    title_cell, baris_data = buka_status_gizi(path)
+    return str(title_cell), pd.DataFrame([row for _, row in baris_data])
+
+def ukur(fungsi, path, ulang):
+    hasil = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi(path)
+        hasil.append(time.perf_counter() - mulai)
+    return min(hasil)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--baris', type=int, nargs='+', default=[37, 500, 2000])
+    parser.add_argument('--ulang', type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{'baris':>8} {'read_excel x2 (ms)':>20} {'sekali baca (ms)':>18} {'speedup':>8}")
+        for n in args.baris:
+            path = buat_workbook_status_gizi(os.path.join(tmp, f"status_gizi_{n}.xlsx"), n)
+            lama = ukur(baca_dua_kali, path, args.ulang)
+            baru = ukur(baca_sekali, path, args.ulang)
+            print(f"{n:>8} {lama * 1000:>20.1f} {baru * 1000:>18.1f} {lama / baru:>7.2f}x")
+
+if __name__ == '__main__':
+    main()
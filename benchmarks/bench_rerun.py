@@ -0,0 +1,158 @@
+# Waktu rerun dashboard per interaksi widget, tanpa browser (streamlit.testing AppTest).
+# Skrip Code_Dashboard.py dijalankan apa adanya: halaman awal, upload file, lalu setiap widget
+# (tab, jenis_peta, slider heatmap, jumlah_kecamatan, urutan, search_term, sort_by) diubah satu per
+# satu dan wall time setiap rerun dicatat. Skenario diulang beberapa kali dengan sesi baru; upload
+# pertama (ETL dingin) dilaporkan terpisah dari upload berikutnya yang memakai dataset bersama;
+# waktu upload dihitung sampai dashboard tampil, termasuk menunggu ETL di thread latar.
+# Dipakai sebagai benchmark regresi seperti bench_import.py: median setiap interaksi dibandingkan
+# dengan baseline yang tersimpan.
+#
+#   python benchmarks/bench_rerun.py                  # cetak waktu dan bandingkan dengan baseline
+#   python benchmarks/bench_rerun.py --profil         # sertakan tahap terlama per interaksi
+#   python benchmarks/bench_rerun.py --data a.xlsx b.xlsx   # upload gabungan beberapa file (tanpa baseline)
+#   python benchmarks/bench_rerun.py --simpan         # tulis ulang baseline
+import argparse
+import json
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE = os.path.join(ROOT, 'benchmarks', 'hasil', 'rerun.json')
+
+# Batas regresi per interaksi: median > baseline * TOLERANSI dan selisihnya > MARGIN_MS
+# (rerun yang hanya puluhan ms terlalu berisik untuk rasio saja)
+TOLERANSI = 1.5
+MARGIN_MS = 50
+
+# Jeda polling saat menunggu ETL latar selesai setelah upload
+POLLING_DETIK = 0.02
+
+# (nama interaksi, jenis widget AppTest, key, nilai). Urutan mengikuti cara pengguna berpindah tab;
+# setiap widget dikembalikan ke nilai awalnya sehingga setiap ulangan mulai dari state yang sama.
+SKENARIO = [
+    ('peta: jenis_peta -> Heatmap', 'radio', 'jenis_peta', "Heatmap"),
+    ('peta: radius_heat', 'slider', 'radius_heat', 40),
+    ('peta: opacity_heat', 'slider', 'opacity_heat', 0.5),
+    ('peta: radius_heat (kembali)', 'slider', 'radius_heat', 25),
+    ('peta: opacity_heat (kembali)', 'slider', 'opacity_heat', 0.8),
+    ('peta: jenis_peta -> Scatter Map', 'radio', 'jenis_peta', "Scatter Map"),
+    ('tab -> Perbandingan Kecamatan', 'radio', 'tab_aktif', "📊 Perbandingan Kecamatan"),
+    ('perbandingan: jumlah_kecamatan', 'slider', 'jumlah_kecamatan', 25),
+    ('perbandingan: urutan', 'radio', 'urutan', "Terendah"),
+    ('perbandingan: jumlah_kecamatan (kembali)', 'slider', 'jumlah_kecamatan', 15),
+    ('perbandingan: urutan (kembali)', 'radio', 'urutan', "Tertinggi"),
+    ('tab -> Tabel Data', 'radio', 'tab_aktif', "📋 Tabel Data"),
+    ('tabel: search_term', 'text_input', 'search_term', "kuning"),
+    ('tabel: sort_by', 'selectbox', 'sort_by', "% Stunting"),
+    ('tabel: search_term (kosong)', 'text_input', 'search_term', ""),
+    ('tabel: sort_by (kembali)', 'selectbox', 'sort_by', "Nama Kecamatan"),
+    ('tab -> Peta Sebaran', 'radio', 'tab_aktif', "🗺️ Peta Sebaran"),
+]
+
+def _rerun(at):
+    mulai = time.perf_counter()
+    at.run()
+    ms = (time.perf_counter() - mulai) * 1000
+    if at.exception:
+        raise RuntimeError(f"Exception di skrip dashboard: {[e.value for e in at.exception]}")
+    return ms
+
+def _tahap_terlama(at):
+    # Tahap profiler terlama pada rerun terakhir (tanpa rerun.total)
+    pencatat = at.session_state['pencatat_profil']
+    entri = [e for e in pencatat.catatan() if e['rerun'] == pencatat.rerun and e['tahap'] != 'rerun.total']
+    if not entri:
+        return None
+    terlama = max(entri, key=lambda e: e['ms'])
+    return f"{terlama['tahap']} {terlama['ms']:.0f}ms"
+
+def jalankan_sesi(app, daftar_file, profil):
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app, default_timeout=600)
+    if profil:
+        at.query_params['profil'] = '1'
+    waktu = {'halaman awal': _rerun(at)}
+    tahap = {}
+    at.file_uploader[0].set_value([(nama_file, data, "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet")
+                                   for nama_file, data in daftar_file])
+    waktu['upload (kirim ETL)'] = _rerun(at)
+    # ETL berjalan di thread latar: rerun diulang (seperti polling fragment) sampai dashboard tampil
+    mulai = time.perf_counter()
+    while not at.metric:
+        time.sleep(POLLING_DETIK)
+        _rerun(at)
+    waktu['upload'] = waktu['upload (kirim ETL)'] + (time.perf_counter() - mulai) * 1000
+    for nama, jenis, key, nilai in SKENARIO:
+        getattr(at, jenis)(key=key).set_value(nilai)
+        waktu[nama] = _rerun(at)
+        if profil:
+            tahap[nama] = _tahap_terlama(at)
+    return waktu, tahap
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--app', default=os.path.join(ROOT, 'Code_Dashboard.py'))
+    parser.add_argument('--data', nargs='+', default=[os.path.join(ROOT, 'Data_Stunting.xlsx')],
+                        help="Satu atau beberapa workbook (beberapa file = upload gabungan multi-periode)")
+    parser.add_argument('--ulang', type=int, default=5)
+    parser.add_argument('--profil', action='store_true', help="Aktifkan profiler dan tampilkan tahap terlama")
+    parser.add_argument('--simpan', action='store_true', help="Simpan hasil sebagai baseline baru")
+    args = parser.parse_args()
+
+    # Upload dari benchmark tidak ikut ditulis ke history store
+    os.environ['STUNTING_SIMPAN_RIWAYAT'] = '0'
+    # Peringatan deprecation Streamlit dicetak di setiap rerun dan menenggelamkan hasil
+    logging.disable(logging.WARNING)
+    sys.path.insert(0, ROOT)
+    daftar_file = []
+    for path in args.data:
+        with open(path, 'rb') as f:
+            daftar_file.append((os.path.basename(path), f.read()))
+
+    sesi = [jalankan_sesi(args.app, daftar_file, args.profil) for _ in range(args.ulang)]
+    upload_dingin = sesi[0][0]['upload']
+    # Rerun yang mengirim ETL dingin harus tetap cepat; parsing sendiri berjalan di thread latar
+    hasil = {'upload pertama (ETL dingin)': round(upload_dingin, 1),
+             'upload pertama (kirim ETL)': round(sesi[0][0]['upload (kirim ETL)'], 1)}
+    for nama in sesi[0][0]:
+        # Ulangan pertama dibuang untuk upload; interaksi lain memakai semua ulangan
+        sampel = [waktu[nama] for waktu, _ in (sesi[1:] if nama.startswith('upload') and len(sesi) > 1 else sesi)]
+        hasil[nama] = round(float(np.median(sampel)), 1)
+
+    lebar = max(len(nama) for nama in hasil)
+    print(f"{'interaksi':<{lebar}} {'median (ms)':>12}   ({args.ulang} sesi, {', '.join(nama for nama, _ in daftar_file)})")
+    for nama, ms in hasil.items():
+        tahap = sesi[-1][1].get(nama) if args.profil else None
+        print(f"{nama:<{lebar}} {ms:>12.1f}" + (f"   {tahap}" if tahap else ""))
+
+    if args.simpan:
+        os.makedirs(os.path.dirname(BASELINE), exist_ok=True)
+        with open(BASELINE, 'w') as f:
+            json.dump(hasil, f, indent=2, ensure_ascii=False)
+            f.write('\n')
+        print(f"Baseline disimpan ke {os.path.relpath(BASELINE)}")
+        return 0
+
+    # Baseline hanya berlaku untuk data default
+    if args.data != parser.get_default('data') or not os.path.exists(BASELINE):
+        return 0
+    with open(BASELINE) as f:
+        baseline = json.load(f)
+    gagal = []
+    for nama, ms in hasil.items():
+        if nama not in baseline:
+            continue
+        batas = max(baseline[nama] * TOLERANSI, baseline[nama] + MARGIN_MS)
+        if ms > batas:
+            gagal.append(f"{nama}: {ms:.1f} ms melebihi batas {batas:.1f} ms (baseline {baseline[nama]:.1f} ms)")
+    for pesan in gagal:
+        print(f"REGRESI: {pesan}", file=sys.stderr)
+    return 1 if gagal else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
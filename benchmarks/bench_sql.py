@@ -0,0 +1,43 @@
+# Agregasi riwayat lintas periode: pandas atas partisi file vs GROUP BY di backend SQLite.
+# Mengukur muat_agregat untuk semua periode dan untuk 12 periode terakhir pada kedua jalur.
+#
+#   python benchmarks/bench_sql.py --baris 37 2000 --bulan 36
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import history_store
+from benchmarks.bench_store import buat_store, ukur
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--baris', type=int, nargs='+', default=[37, 2000])
+    parser.add_argument('--bulan', type=int, default=36)
+    parser.add_argument('--ulang', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'puskesmas':>9} {'bulan':>5} {'muat sql (ms)':>14} {'jalur':>6} {'agregat semua':>14} "
+          f"{'agregat 12 periode':>19}")
+    for jumlah_baris in args.baris:
+        with tempfile.TemporaryDirectory() as tmp:
+            history_store.SQL_BACKEND = False
+            root, _, daftar_id = buat_store(tmp, jumlah_baris, args.bulan)
+
+            mulai = time.perf_counter()
+            history_store.sinkronkan_sql(root)
+            durasi_muat = (time.perf_counter() - mulai) * 1000
+
+            for jalur, sql in (('file', False), ('sql', True)):
+                history_store.SQL_BACKEND = sql
+                semua = ukur(lambda: history_store.muat_agregat(root=root), args.ulang)
+                terakhir = daftar_id[-12:]
+                sebagian = ukur(lambda: history_store.muat_agregat(terakhir, root=root), args.ulang)
+                muat = f"{durasi_muat:>14.1f}" if sql else f"{'-':>14}"
+                print(f"{jumlah_baris:>9} {args.bulan:>5} {muat} {jalur:>6} {semua:>14.1f} {sebagian:>19.1f}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,82 @@
+# Waktu muat history store: Arrow IPC memory-mapped (format sekarang) vs Parquet (format lama)
+# vs parse ulang XLSX setiap periode. Angka "arrow" diukur dengan page cache hangat, seperti
+# worker Streamlit yang membaca store yang baru saja ditulis atau sudah dibaca worker lain.
+#
+#   python benchmarks/bench_store.py --baris 37 2000 --bulan 36
+import argparse
+import glob
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl import KOLOM_GIZI_DB, proses_etl
+from history_store import EKSTENSI, EKSTENSI_LAMA, muat_riwayat, simpan_periode
+from benchmarks.synthetic import buat_workbook_status_gizi
+
+def ukur(fungsi, ulang):
+    hasil = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi()
+        hasil.append((time.perf_counter() - mulai) * 1000)
+    return float(np.median(hasil))
+
+def buat_store(tmp, jumlah_baris, jumlah_bulan):
+    root = os.path.join(tmp, 'store_arrow')
+    workbook, daftar_id = [], []
+    for i in range(jumlah_bulan):
+        waktu = datetime(2023 + i // 12, i % 12 + 1, 28, 10, 0, 0)
+        path = buat_workbook_status_gizi(os.path.join(tmp, f'status_gizi_{i:02d}.xlsx'), jumlah_baris, waktu, seed=i)
+        df_fact, df_wilayah, df_waktu, success, message = proses_etl(path)
+        if not success:
+            raise RuntimeError(message)
+        daftar_id.append(simpan_periode(df_fact, df_wilayah, df_waktu, root))
+        workbook.append(path)
+    return root, workbook, daftar_id
+
+def salin_ke_parquet(root, tujuan):
+    # Store yang sama dalam format lama: setiap file .arrow diganti .parquet
+    shutil.copytree(root, tujuan)
+    for path in glob.glob(os.path.join(tujuan, '**', '*' + EKSTENSI), recursive=True):
+        pd.read_feather(path).to_parquet(path[:-len(EKSTENSI)] + EKSTENSI_LAMA, index=False)
+        os.remove(path)
+    return tujuan
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--baris', type=int, nargs='+', default=[37, 2000])
+    parser.add_argument('--bulan', type=int, default=36)
+    parser.add_argument('--ulang', type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'puskesmas':>9} {'bulan':>5} {'xlsx (ms)':>10} {'parquet (ms)':>13} {'arrow (ms)':>11} "
+          f"{'1 periode parquet':>18} {'1 periode arrow':>16}")
+    for jumlah_baris in args.baris:
+        with tempfile.TemporaryDirectory() as tmp:
+            root_arrow, workbook, daftar_id = buat_store(tmp, jumlah_baris, args.bulan)
+            id_pertama = daftar_id[0]
+            root_parquet = salin_ke_parquet(root_arrow, os.path.join(tmp, 'store_parquet'))
+
+            xlsx = ukur(lambda: pd.concat([proses_etl(path)[0] for path in workbook]), 1)
+            parquet = ukur(lambda: muat_riwayat(root=root_parquet), args.ulang)
+            arrow = ukur(lambda: muat_riwayat(root=root_arrow), args.ulang)
+            satu_parquet = ukur(lambda: muat_riwayat(id_pertama, root=root_parquet), args.ulang)
+            satu_arrow = ukur(lambda: muat_riwayat(id_pertama, root=root_arrow), args.ulang)
+
+            # Satu periode dibaca tanpa salinan: buffer kolom jumlah menunjuk ke file yang di-map (read-only)
+            df_fact, _, _ = muat_riwayat(id_pertama, root=root_arrow)
+            zero_copy = not df_fact[KOLOM_GIZI_DB[0]].to_numpy().flags.writeable
+
+            print(f"{jumlah_baris:>9} {args.bulan:>5} {xlsx:>10.1f} {parquet:>13.1f} {arrow:>11.1f} "
+                  f"{satu_parquet:>18.2f} {satu_arrow:>16.2f}   zero-copy={zero_copy}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,251 @@
+# Suite benchmark end-to-end dengan workbook "STATUS GIZI" sintetis (tata letak sama dengan ekspor asli):
+# waktu ETL, agregasi (agregat kecamatan, kubus drill-down, indeks tabel), build + serialisasi setiap
+# figure, dan memori puncak (RSS), untuk setiap ukuran (jumlah baris puskesmas/posyandu) x N bulan.
+# Setiap ukuran diukur di proses terpisah agar memori puncak tidak tercampur. Workbook sintetis
+# di-cache per versi generator, jadi ukuran besar hanya dibuat sekali.
+#
+# Hasil disimpan di benchmarks/hasil/suite/<waktu>-<commit>.json untuk dibandingkan antar commit:
+#
+#   python benchmarks/bench_suite.py                                  # 37, 1k, 10k, 100k baris x 3 bulan
+#   python benchmarks/bench_suite.py --baris 37 1000 --bulan 12
+#   python benchmarks/bench_suite.py --bandingkan                     # bandingkan dengan hasil sebelumnya
+#   python benchmarks/bench_suite.py --bandingkan benchmarks/hasil/suite/<file>.json
+import argparse
+import glob
+import hashlib
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+DIR_HASIL = os.path.join(ROOT, 'benchmarks', 'hasil', 'suite')
+DIR_CACHE = os.environ.get('STUNTING_BENCH_CACHE', os.path.join(tempfile.gettempdir(), 'stunting-bench'))
+
+# Metrik yang dibandingkan antar commit (lebih kecil lebih baik)
+METRIK_BANDING = ['etl_ms', 'agregasi_ms', 'kubus_ms', 'indeks_ms', 'figure_ms', 'serialisasi_ms', 'memori_puncak_mb']
+
+def _versi_generator():
+    with open(os.path.join(ROOT, 'benchmarks', 'synthetic.py'), 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()[:12]
+
+def siapkan_workbook(jumlah_baris, jumlah_bulan):
+    # Satu workbook per bulan (Januari, Februari, ...), seed = indeks bulan agar nilainya berbeda
+    from benchmarks.synthetic import buat_workbook_status_gizi
+
+    folder = os.path.join(DIR_CACHE, _versi_generator())
+    os.makedirs(folder, exist_ok=True)
+    daftar = []
+    for i in range(jumlah_bulan):
+        path = os.path.join(folder, f"status_gizi_{jumlah_baris}_{i:03d}.xlsx")
+        if not os.path.exists(path):
+            waktu = datetime(2024 + i // 12, i % 12 + 1, 28, 10, 0, 0)
+            buat_workbook_status_gizi(path + ".tmp.xlsx", jumlah_baris, waktu, seed=i)
+            os.replace(path + ".tmp.xlsx", path)
+        daftar.append(path)
+    return daftar
+
+def _median(nilai):
+    nilai = sorted(nilai)
+    return nilai[len(nilai) // 2]
+
+def _rss_puncak_mb():
+    # ru_maxrss dalam KB di Linux, byte di macOS
+    puncak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return puncak / (1024 * 1024) if sys.platform == 'darwin' else puncak / 1024
+
+def ukur_ukuran(daftar_workbook):
+    # Dijalankan di proses anak: satu ukuran, semua bulan
+    import pandas as pd
+    import plotly.io as pio
+
+    from charts import (buat_fig_bar, buat_fig_compare, buat_fig_detail, buat_fig_heatmap, buat_fig_kategori,
+                        buat_fig_map, buat_fig_pie, buat_fig_puskesmas, buat_fig_tren)
+    from cube import buat_kubus
+    from etl import SKEMA_FAKTA, agregasi_kecamatan, proses_etl, terapkan_skema
+    from tables import buat_indeks_tabel
+
+    memori_awal = _rss_puncak_mb()
+    hasil = {'etl_per_bulan_ms': [], 'agregasi_per_bulan_ms': []}
+
+    potongan_fakta = []
+    df_wilayah = df_agg = None
+    for id_waktu, path in enumerate(daftar_workbook, start=1):
+        mulai = time.perf_counter()
+        df_fact, df_wilayah, _, success, message = proses_etl(path)
+        hasil['etl_per_bulan_ms'].append((time.perf_counter() - mulai) * 1000)
+        if not success:
+            raise RuntimeError(f"{path}: {message}")
+
+        mulai = time.perf_counter()
+        df_agg = agregasi_kecamatan(df_fact)
+        hasil['agregasi_per_bulan_ms'].append((time.perf_counter() - mulai) * 1000)
+        potongan_fakta.append(df_fact.assign(id_waktu=id_waktu))
+
+    hasil['baris_fakta'] = len(df_fact)
+    hasil['etl_ms'] = _median(hasil['etl_per_bulan_ms'])
+    hasil['agregasi_ms'] = _median(hasil['agregasi_per_bulan_ms'])
+
+    # Kubus drill-down atas semua bulan (seperti dataset riwayat multi-periode)
+    df_multi = terapkan_skema(pd.concat(potongan_fakta, ignore_index=True), SKEMA_FAKTA)
+    mulai = time.perf_counter()
+    kubus = buat_kubus(df_multi, df_wilayah)
+    hasil['kubus_ms'] = (time.perf_counter() - mulai) * 1000
+
+    mulai = time.perf_counter()
+    buat_indeks_tabel(df_agg, df_wilayah)
+    hasil['indeks_ms'] = (time.perf_counter() - mulai) * 1000
+
+    # Figure untuk periode terakhir; tren memakai rollup kecamatan semua bulan dari kubus
+    df_tren = kubus.kecamatan.assign(periode=pd.to_datetime(pd.DataFrame({
+        'year': 2024 + (kubus.kecamatan['id_waktu'].astype(int) - 1) // 12,
+        'month': (kubus.kecamatan['id_waktu'].astype(int) - 1) % 12 + 1,
+        'day': 1,
+    })))
+    total = {kolom: int(df_agg[kolom].sum()) for kolom in
+             ['jumlah_balita_ditimbang', 'jumlah_balita_stunting', 'jumlah_balita_kurang_gizi', 'jumlah_balita_wasting']}
+    kecamatan_teratas = df_agg.sort_values('persentase_stunting', ascending=False)['nama_kecamatan'].astype(str).tolist()
+    figure = {
+        'map': lambda: buat_fig_map(df_agg),
+        'heatmap': lambda: buat_fig_heatmap(df_agg),
+        'bar': lambda: buat_fig_bar(df_agg, 15, "Tertinggi"),
+        'compare': lambda: buat_fig_compare(df_agg),
+        'pie': lambda: buat_fig_pie(total['jumlah_balita_stunting'], total['jumlah_balita_kurang_gizi'],
+                                    total['jumlah_balita_wasting'],
+                                    total['jumlah_balita_ditimbang'] - total['jumlah_balita_stunting']
+                                    - total['jumlah_balita_kurang_gizi'] - total['jumlah_balita_wasting']),
+        'kategori': lambda: buat_fig_kategori(df_agg),
+        'detail': lambda: buat_fig_detail(df_fact, ['tb_per_u_sangat_pendek', 'tb_per_u_pendek',
+                                                    'tb_per_u_normal', 'tb_per_u_tinggi']),
+        'puskesmas': lambda: buat_fig_puskesmas(kubus.rincian_puskesmas(kecamatan_teratas[0]), kecamatan_teratas[0]),
+        'tren': lambda: buat_fig_tren(df_tren, "Stunting", kecamatan_teratas[:5]),
+    }
+    # Build pertama di proses baru ikut menanggung inisialisasi plotly (template, validator); dicatat
+    # terpisah, angka per chart diambil dari build kedua
+    mulai = time.perf_counter()
+    for buat in figure.values():
+        pio.to_json(buat(), validate=False)
+    hasil['figure_pertama_ms'] = (time.perf_counter() - mulai) * 1000
+
+    hasil['figure_per_chart_ms'] = {}
+    hasil['serialisasi_per_chart_ms'] = {}
+    for nama, buat in figure.items():
+        mulai = time.perf_counter()
+        fig = buat()
+        hasil['figure_per_chart_ms'][nama] = (time.perf_counter() - mulai) * 1000
+        # Serialisasi yang dilakukan st.plotly_chart untuk setiap figure
+        mulai = time.perf_counter()
+        pio.to_json(fig, validate=False)
+        hasil['serialisasi_per_chart_ms'][nama] = (time.perf_counter() - mulai) * 1000
+    hasil['figure_ms'] = sum(hasil['figure_per_chart_ms'].values())
+    hasil['serialisasi_ms'] = sum(hasil['serialisasi_per_chart_ms'].values())
+
+    hasil['memori_awal_mb'] = memori_awal
+    hasil['memori_puncak_mb'] = _rss_puncak_mb()
+    return hasil
+
+def jalankan_anak(jumlah_baris, daftar_workbook):
+    perintah = [sys.executable, os.path.abspath(__file__), '--anak', *daftar_workbook]
+    keluaran = subprocess.run(perintah, cwd=ROOT, capture_output=True, text=True)
+    if keluaran.returncode != 0:
+        raise RuntimeError(f"Benchmark {jumlah_baris} baris gagal:\n{keluaran.stderr}")
+    return json.loads(keluaran.stdout.strip().splitlines()[-1])
+
+def info_lingkungan():
+    def git(*args):
+        try:
+            return subprocess.run(['git', *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    import pandas as pd
+    import plotly
+    return {
+        'commit': git('rev-parse', '--short', 'HEAD'),
+        'subjek_commit': git('log', '-1', '--format=%s'),
+        'ada_perubahan': bool(git('status', '--porcelain', '--untracked-files=no')),
+        'waktu': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'plotly': plotly.__version__,
+        'platform': platform.platform(),
+        'cpu': os.cpu_count(),
+        'versi_generator': _versi_generator(),
+    }
+
+def cetak_tabel(hasil):
+    print(f"{'baris':>7} {'bulan':>5} {'ETL/bulan':>10} {'agregasi':>9} {'kubus':>8} {'indeks':>8} "
+          f"{'figure':>8} {'serial':>8} {'mem puncak':>11}")
+    for entri in hasil:
+        print(f"{entri['baris']:>7} {entri['bulan']:>5} {entri['etl_ms']:>8.0f}ms {entri['agregasi_ms']:>7.1f}ms "
+              f"{entri['kubus_ms']:>6.0f}ms {entri['indeks_ms']:>6.0f}ms {entri['figure_ms']:>6.0f}ms "
+              f"{entri['serialisasi_ms']:>6.0f}ms {entri['memori_puncak_mb']:>8.0f} MB")
+
+def bandingkan(sekarang, path_lama):
+    with open(path_lama) as f:
+        lama = json.load(f)
+    print(f"\nDibandingkan dengan {os.path.relpath(path_lama)} "
+          f"(commit {lama['lingkungan']['commit']}: {lama['lingkungan']['subjek_commit']})")
+    per_kunci = {(e['baris'], e['bulan']): e for e in lama['hasil']}
+    print(f"{'baris':>7} {'bulan':>5} " + " ".join(f"{m:>16}" for m in METRIK_BANDING))
+    for entri in sekarang['hasil']:
+        dasar = per_kunci.get((entri['baris'], entri['bulan']))
+        if dasar is None:
+            continue
+        rasio = [f"{entri[m] / dasar[m]:>15.2f}x" if dasar[m] else f"{'-':>16}" for m in METRIK_BANDING]
+        print(f"{entri['baris']:>7} {entri['bulan']:>5} " + " ".join(rasio))
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--baris', type=int, nargs='+', default=[37, 1000, 10000, 100000])
+    parser.add_argument('--bulan', type=int, default=3)
+    parser.add_argument('--bandingkan', nargs='?', const='terakhir', default=None,
+                        help="File hasil pembanding (default: hasil tersimpan terakhir)")
+    parser.add_argument('--tanpa-simpan', action='store_true')
+    parser.add_argument('--anak', nargs='+', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.anak:
+        print(json.dumps(ukur_ukuran(args.anak)))
+        return 0
+
+    tersimpan = sorted(glob.glob(os.path.join(DIR_HASIL, '*.json')))
+    hasil = []
+    for jumlah_baris in args.baris:
+        mulai = time.perf_counter()
+        daftar_workbook = siapkan_workbook(jumlah_baris, args.bulan)
+        durasi_generator = time.perf_counter() - mulai
+        entri = {'baris': jumlah_baris, 'bulan': args.bulan, **jalankan_anak(jumlah_baris, daftar_workbook)}
+        hasil.append(entri)
+        print(f"  {jumlah_baris} baris x {args.bulan} bulan selesai "
+              f"(workbook {durasi_generator:.1f} s, ETL {entri['etl_ms']:.0f} ms/bulan)", file=sys.stderr)
+
+    laporan = {'lingkungan': info_lingkungan(), 'hasil': hasil}
+    cetak_tabel(hasil)
+
+    if not args.tanpa_simpan:
+        os.makedirs(DIR_HASIL, exist_ok=True)
+        nama = f"{datetime.now():%Y%m%d-%H%M%S}-{laporan['lingkungan']['commit'] or 'tanpa-git'}.json"
+        path = os.path.join(DIR_HASIL, nama)
+        with open(path, 'w') as f:
+            json.dump(laporan, f, indent=2)
+            f.write('\n')
+        print(f"Hasil disimpan ke {os.path.relpath(path)}")
+
+    if args.bandingkan:
+        path_lama = tersimpan[-1] if args.bandingkan == 'terakhir' and tersimpan else args.bandingkan
+        if path_lama == 'terakhir':
+            print("Belum ada hasil tersimpan untuk dibandingkan.")
+        else:
+            bandingkan(laporan, path_lama)
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,86 @@
+# Benchmark format tabel tab "Tabel Data": format string per sel + Styler.apply(axis=1) (cara lama)
+# vs kolom numerik + CSS kategori vektor (Styler) vs tanpa Styler, termasuk marshalling Streamlit.
+#
+#   python benchmarks/bench_tabel.py --baris 32 1000 10000
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from streamlit import dataframe_util
+from streamlit.elements.lib.pandas_styler_utils import marshall_styler
+from streamlit.proto.ArrowData_pb2 import ArrowData as ArrowDataProto
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl import BATAS_KATEGORI_STUNTING, KATEGORI_STUNTING
+from tables import KOLOM_TABEL, siapkan_tabel, style_tabel, tandai_kategori
+
+def buat_agregat(n, seed=0):
+    rng = np.random.default_rng(seed)
+    ditimbang = rng.integers(100, 6000, n)
+    df = pd.DataFrame({
+        'nama_kecamatan': [f"WILAYAH {i}" for i in range(n)],
+        'jumlah_balita_ditimbang': ditimbang,
+        'jumlah_balita_stunting': (ditimbang * rng.uniform(0.01, 0.3, n)).astype(int),
+        'jumlah_balita_kurang_gizi': (ditimbang * rng.uniform(0.01, 0.2, n)).astype(int),
+        'jumlah_balita_wasting': (ditimbang * rng.uniform(0.01, 0.1, n)).astype(int),
+    })
+    for nama in ['stunting', 'kurang_gizi', 'wasting']:
+        df[f'persentase_{nama}'] = df[f'jumlah_balita_{nama}'] / df['jumlah_balita_ditimbang'] * 100
+    df['kategori'] = pd.cut(df['persentase_stunting'], bins=BATAS_KATEGORI_STUNTING, labels=KATEGORI_STUNTING)
+    return df
+
+def tabel_lama(df_display):
+    df_table = df_display[list(KOLOM_TABEL)].copy()
+    df_table.columns = list(KOLOM_TABEL.values())
+    for kolom in ['Jml Ditimbang', 'Jml Stunting', 'Jml Kurang Gizi', 'Jml Wasting']:
+        df_table[kolom] = df_table[kolom].apply(lambda x: f"{int(x):,}")
+    for kolom in ['% Stunting', '% Kurang Gizi', '% Wasting']:
+        df_table[kolom] = df_table[kolom].apply(lambda x: f"{x:.2f}%")
+
+    def highlight_kategori(row):
+        if 'Sangat Tinggi' in str(row['Kategori']):
+            return ['background-color: #ffcccc'] * len(row)
+        elif 'Tinggi' in str(row['Kategori']):
+            return ['background-color: #ffe6cc'] * len(row)
+        elif 'Sedang' in str(row['Kategori']):
+            return ['background-color: #fff4cc'] * len(row)
+        else:
+            return ['background-color: #ccffcc'] * len(row)
+
+    marshall_styler(ArrowDataProto(), df_table.style.apply(highlight_kategori, axis=1), "bench")
+
+def tabel_baru_styler(df_display):
+    marshall_styler(ArrowDataProto(), style_tabel(siapkan_tabel(df_display)), "bench")
+
+def tabel_baru_tanpa_styler(df_display):
+    dataframe_util.convert_pandas_df_to_arrow_bytes(tandai_kategori(siapkan_tabel(df_display)))
+
+def ukur(fungsi, df, ulang):
+    hasil = []
+    for _ in range(ulang):
+        mulai = time.perf_counter()
+        fungsi(df)
+        hasil.append(time.perf_counter() - mulai)
+    return min(hasil)
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--baris', type=int, nargs='+', default=[32, 1000, 10000])
+    parser.add_argument('--ulang', type=int, default=3)
+    args = parser.parse_args()
+
+    pd.set_option("styler.render.max_elements", 10_000_000)
+    print(f"{'baris':>8} {'lama (ms)':>12} {'styler vektor (ms)':>20} {'tanpa styler (ms)':>19}")
+    for n in args.baris:
+        df = buat_agregat(n)
+        lama = ukur(tabel_lama, df, args.ulang)
+        styler = ukur(tabel_baru_styler, df, args.ulang)
+        polos = ukur(tabel_baru_tanpa_styler, df, args.ulang)
+        print(f"{n:>8} {lama * 1000:>12.1f} {styler * 1000:>20.1f} {polos * 1000:>19.1f}")
+
+if __name__ == '__main__':
+    main()
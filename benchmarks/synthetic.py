@@ -0,0 +1,56 @@
+import os
+import random
+import sys
+from datetime import datetime
+
+from openpyxl import Workbook
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from etl import SHEET_STATUS_GIZI, GIZI_COLUMN_NAMES, MONTH_MAP
+
+KECAMATAN = [
+    'CIAWIGEBANG', 'CIBEUREUM', 'CIBINGBIN', 'CIDAHU', 'CIGANDAMEKAR', 'CIGUGUR', 'CILEBAK', 'CILIMUS',
+    'CIMAHI', 'CINIRU', 'CIPICUNG', 'CIWARU', 'DARMA', 'GARAWANGI', 'HANTARA', 'JALAKSANA',
+    'JAPARA', 'KADUGEDE', 'KALIMANGGIS', 'KARANGKANCANA', 'KRAMATMULYA', 'KUNINGAN', 'LEBAKWANGI', 'LURAGUNG',
+    'MALEBER', 'MANDIRANCAN', 'NUSAHERANG', 'PANCALANG', 'PASAWAHAN', 'SELAJAMBE', 'SINDANGAGUNG', 'SUBANG'
+]
+
+def bagi_total(rng, total, bobot):
+    # Membagi total ke beberapa sub-kategori (proporsi bobot +-50%) agar TB/U dan BB/TB
+    # berjumlah sama dengan BB/U seperti pada ekspor asli
+    acak = [b * rng.uniform(0.5, 1.5) for b in bobot]
+    bagian = [int(total * a / sum(acak)) for a in acak]
+    bagian[bobot.index(max(bobot))] += total - sum(bagian)
+    return bagian
+
+# Membuat workbook "STATUS GIZI" sintetis dengan tata letak yang sama seperti ekspor asli:
+# judul di baris 1-2, header di baris 3-5, data mulai baris 6, dan baris JUMLAH di akhir
+def buat_workbook_status_gizi(path, jumlah_baris, waktu=None, seed=0):
+    rng = random.Random(seed)
+    waktu = waktu or datetime(2025, 8, 31, 10, 0, 0)
+
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet(SHEET_STATUS_GIZI)
+    n_kolom = len(GIZI_COLUMN_NAMES)
+
+    ws.append([None, f"STATUS GIZI BALITA  BULAN {MONTH_MAP[waktu.month]} {waktu.year}"] + [None] * (n_kolom - 2))
+    ws.append([f"Data Tanggal : {waktu:%Y-%m-%d %H:%M:%S}"] + [None] * (n_kolom - 1))
+    ws.append(['No', 'Puskesmas', 'KECMATAN', 'BB/U', None, None, None, None, 'TB/U', None, None, None, None,
+               'BB/TB', None, None, None, None, None, None])
+    ws.append([None, None, None] + [c.split(' ', 1)[1] for c in GIZI_COLUMN_NAMES[3:]])
+    ws.append(list(range(1, n_kolom + 1)))
+
+    total = [0] * (n_kolom - 3)
+    for i in range(jumlah_baris):
+        kecamatan = KECAMATAN[i % len(KECAMATAN)]
+        puskesmas = kecamatan if i < len(KECAMATAN) else f"{kecamatan} {i // len(KECAMATAN)}"
+        bb_u = [rng.randint(0, 40), rng.randint(20, 300), rng.randint(500, 4000), rng.randint(10, 150), rng.randint(0, 5)]
+        nilai = (bb_u + bagi_total(rng, sum(bb_u), [0.02, 0.06, 0.9, 0.01, 0.01])
+                 + bagi_total(rng, sum(bb_u), [0.005, 0.045, 0.8, 0.08, 0.03, 0.02, 0.02]))
+        total = [t + v for t, v in zip(total, nilai)]
+        ws.append([f"{i + 1}.", puskesmas, kecamatan] + nilai)
+
+    ws.append(['JUMLAH', None, 0] + total)
+    wb.save(path)
+    return path
@@ -0,0 +1,365 @@
+import threading
+from collections import OrderedDict
+
+import plotly.express as px
+import plotly.graph_objects as go
+
+from profiler import tahap
+
+# Cache objek figure Plotly bersama untuk semua sesi, kunci: (id dataset, id chart, nilai widget).
+# Figure yang diambil dari cache dipakai bersama, jadi jangan dimodifikasi setelah dibuat.
+class FigureCache:
+    def __init__(self, max_entries=64):
+        self.max_entries = max_entries
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def ambil(self, key, builder, *args, **kwargs):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+
+        # Dibangun di luar lock agar sesi lain tidak menunggu figure yang berbeda.
+        # Elemen kedua kunci adalah id chart, dipakai sebagai nama tahap di profil.
+        with tahap(f"figure.{key[1]}"):
+            fig = builder(*args, **kwargs)
+
+        with self._lock:
+            self._data[key] = fig
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+        return fig
+
+    def __len__(self):
+        return len(self._data)
+
+def buat_fig_map(df_agg):
+    # Peta Scatter
+    fig_map = px.scatter_mapbox(
+        df_agg,
+        lat='lat',
+        lon='lon',
+        size='jumlah_balita_stunting',
+        color='persentase_stunting',
+        hover_name='nama_kecamatan',
+        hover_data={
+            'jumlah_balita_ditimbang': ':,',
+            'jumlah_balita_stunting': ':,',
+            'persentase_stunting': ':.2f',
+            'lat': False,
+            'lon': False
+        },
+        color_continuous_scale='Reds',
+        size_max=35,
+        zoom=9.5,
+        mapbox_style='open-street-map',
+        title='Sebaran Kasus Stunting (Scatter Map)'
+    )
+
+    fig_map.update_layout(
+        height=650,
+        margin={"r":0,"t":50,"l":0,"b":0},
+        font=dict(size=12),
+        title_font_size=18
+    )
+    return fig_map
+
+HEATMAP_RADIUS_DEFAULT = 25
+HEATMAP_OPACITY_DEFAULT = 0.8
+
+def buat_fig_heatmap(df_agg):
+    fig_heatmap = px.density_mapbox(
+        df_agg,
+        lat='lat',
+        lon='lon',
+        z='persentase_stunting',
+        radius=HEATMAP_RADIUS_DEFAULT,
+        center=dict(lat=-6.98, lon=108.48),
+        zoom=9.5,
+        mapbox_style='open-street-map',
+        color_continuous_scale='Reds',
+        range_color=[0, df_agg['persentase_stunting'].max()],
+        title='Peta Panas (Heatmap) Intensitas Stunting',
+        hover_name='nama_kecamatan',
+        hover_data={
+            'persentase_stunting': ':.2f',
+            'jumlah_balita_stunting': ':,',
+            'lat': False,
+            'lon': False
+        }
+    )
+
+    fig_heatmap.update_layout(
+        height=650,
+        margin={"r":0,"t":50,"l":0,"b":0},
+        font=dict(size=12),
+        title_font_size=18,
+        coloraxis_colorbar=dict(
+            title="Persentase<br>Stunting (%)",
+            ticksuffix="%"
+        )
+    )
+    return fig_heatmap
+
+def patch_fig_heatmap(fig_heatmap, radius, opacity):
+    # Salin figure dasar lalu ubah atribut trace saja, tanpa membangun ulang lewat plotly.express
+    fig_custom = go.Figure(fig_heatmap)
+    fig_custom.update_traces(radius=radius, opacity=opacity)
+    fig_custom.update_layout(title_text='Peta Panas (Heatmap) - Custom Settings')
+    return fig_custom
+
+def buat_fig_bar(df_agg, jumlah_kecamatan, urutan):
+    if urutan == "Tertinggi":
+        df_display = df_agg.nlargest(jumlah_kecamatan, 'persentase_stunting')
+    else:
+        df_display = df_agg.nsmallest(jumlah_kecamatan, 'persentase_stunting')
+
+    # Buat bar chart dengan angka yang lebih jelas
+    fig_bar = go.Figure()
+
+    fig_bar.add_trace(go.Bar(
+        y=df_display['nama_kecamatan'],
+        x=df_display['persentase_stunting'],
+        orientation='h',
+        text=[f"{persen:.1f}% ({int(jml)} balita)"
+              for persen, jml in zip(df_display['persentase_stunting'], df_display['jumlah_balita_stunting'])],
+        textposition='outside',
+        marker=dict(
+            color=df_display['persentase_stunting'],
+            colorscale='Reds',
+            showscale=True,
+            colorbar=dict(title="Persentase (%)")
+        ),
+        hovertemplate='<b>%{y}</b><br>Persentase: %{x:.2f}%<br><extra></extra>'
+    ))
+
+    fig_bar.update_layout(
+        height=max(400, jumlah_kecamatan * 35),
+        xaxis_title='Persentase Stunting (%)',
+        yaxis_title='',
+        yaxis={'categoryorder':'total ascending' if urutan == "Tertinggi" else 'total descending'},
+        font=dict(size=11),
+        margin=dict(l=150, r=150, t=30, b=50)
+    )
+    return fig_bar
+
+def buat_fig_puskesmas(df_puskesmas, nama_kecamatan):
+    # Rincian drill-down: persentase stunting per puskesmas dalam satu kecamatan
+    fig_puskesmas = go.Figure()
+
+    fig_puskesmas.add_trace(go.Bar(
+        y=df_puskesmas['nama_puskesmas'],
+        x=df_puskesmas['persentase_stunting'],
+        orientation='h',
+        text=[f"{persen:.1f}% ({int(jml)} dari {int(total):,} balita)"
+              for persen, jml, total in zip(df_puskesmas['persentase_stunting'],
+                                            df_puskesmas['jumlah_balita_stunting'],
+                                            df_puskesmas['jumlah_balita_ditimbang'])],
+        textposition='outside',
+        marker_color='#e74c3c',
+        hovertemplate='<b>%{y}</b><br>Persentase: %{x:.2f}%<br><extra></extra>'
+    ))
+
+    fig_puskesmas.update_layout(
+        height=max(250, len(df_puskesmas) * 60),
+        title_text=f"Stunting per Puskesmas - Kecamatan {nama_kecamatan}",
+        xaxis_title='Persentase Stunting (%)',
+        yaxis_title='',
+        yaxis={'categoryorder': 'total ascending'},
+        font=dict(size=11),
+        margin=dict(l=150, r=200, t=50, b=50)
+    )
+    return fig_puskesmas
+
+def buat_fig_compare(df_agg):
+    df_compare = df_agg.sort_values('persentase_stunting', ascending=False).head(15)
+
+    fig_compare = go.Figure()
+
+    fig_compare.add_trace(go.Bar(
+        name='Stunting',
+        x=df_compare['nama_kecamatan'],
+        y=df_compare['persentase_stunting'],
+        text=[f"{val:.1f}%<br>({int(jml)})" for val, jml in zip(df_compare['persentase_stunting'], df_compare['jumlah_balita_stunting'])],
+        textposition='outside',
+        marker_color='#e74c3c',
+        hovertemplate='<b>%{x}</b><br>Stunting: %{y:.2f}%<extra></extra>'
+    ))
+    fig_compare.add_trace(go.Bar(
+        name='Kurang Gizi',
+        x=df_compare['nama_kecamatan'],
+        y=df_compare['persentase_kurang_gizi'],
+        text=[f"{val:.1f}%<br>({int(jml)})" for val, jml in zip(df_compare['persentase_kurang_gizi'], df_compare['jumlah_balita_kurang_gizi'])],
+        textposition='outside',
+        marker_color='#f39c12',
+        hovertemplate='<b>%{x}</b><br>Kurang Gizi: %{y:.2f}%<extra></extra>'
+    ))
+    fig_compare.add_trace(go.Bar(
+        name='Wasting',
+        x=df_compare['nama_kecamatan'],
+        y=df_compare['persentase_wasting'],
+        text=[f"{val:.1f}%<br>({int(jml)})" for val, jml in zip(df_compare['persentase_wasting'], df_compare['jumlah_balita_wasting'])],
+        textposition='outside',
+        marker_color='#9b59b6',
+        hovertemplate='<b>%{x}</b><br>Wasting: %{y:.2f}%<extra></extra>'
+    ))
+
+    fig_compare.update_layout(
+        barmode='group',
+        height=550,
+        xaxis_tickangle=-45,
+        yaxis_title='Persentase (%)',
+        xaxis_title='Kecamatan',
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        font=dict(size=10),
+        margin=dict(t=80, b=120)
+    )
+    return fig_compare
+
+def buat_fig_pie(total_stunting, total_kurang_gizi, total_wasting, total_normal):
+    labels = ['Stunting', 'Kurang Gizi', 'Wasting', 'Normal/Lainnya']
+    values = [total_stunting, total_kurang_gizi, total_wasting, total_normal]
+    colors = ['#ff6b6b', '#feca57', '#ee5a6f', '#48dbfb']
+
+    # Pie chart dengan label yang jelas
+    fig_pie = go.Figure(data=[go.Pie(
+        labels=labels,
+        values=values,
+        hole=0.45,
+        marker_colors=colors,
+        textinfo='label+percent+value',
+        texttemplate='<b>%{label}</b><br>%{value:,} balita<br>(%{percent})',
+        textposition='outside',
+        textfont=dict(size=12),
+        hovertemplate='<b>%{label}</b><br>Jumlah: %{value:,} balita<br>Persentase: %{percent}<extra></extra>'
+    )])
+
+    fig_pie.update_layout(
+        height=500,
+        title_text="Proporsi Masalah Gizi",
+        font=dict(size=11),
+        showlegend=False,
+        margin=dict(t=80, b=20, l=20, r=20)
+    )
+    return fig_pie
+
+def buat_fig_kategori(df_agg):
+    kategori_count = df_agg['kategori'].value_counts().sort_index()
+    kategori_colors = ['#2ecc71', '#f39c12', '#e67e22', '#e74c3c']
+
+    fig_kategori = go.Figure(data=[go.Pie(
+        labels=kategori_count.index,
+        values=kategori_count.values,
+        hole=0.45,
+        marker_colors=kategori_colors,
+        textinfo='label+percent+value',
+        texttemplate='<b>%{label}</b><br>%{value} kecamatan<br>(%{percent})',
+        textposition='outside',
+        textfont=dict(size=11),
+        hovertemplate='<b>%{label}</b><br>Jumlah: %{value} kecamatan<br>Persentase: %{percent}<extra></extra>'
+    )])
+
+    fig_kategori.update_layout(
+        height=500,
+        title_text="Kategori Kecamatan Berdasarkan Stunting",
+        font=dict(size=11),
+        showlegend=False,
+        margin=dict(t=80, b=20, l=20, r=20)
+    )
+    return fig_kategori
+
+# Indikator tab tren: label -> (kolom persentase, kolom jumlah) di rollup tren
+INDIKATOR_TREN = {
+    'Stunting': ('persentase_stunting', 'jumlah_balita_stunting'),
+    'Kurang Gizi': ('persentase_kurang_gizi', 'jumlah_balita_kurang_gizi'),
+    'Wasting': ('persentase_wasting', 'jumlah_balita_wasting'),
+}
+
+def buat_fig_tren(df_tren, indikator, daftar_kecamatan):
+    kolom, kolom_jumlah = INDIKATOR_TREN[indikator]
+    fig_tren = go.Figure()
+
+    # Garis kabupaten: persentase dari jumlah seluruh kecamatan per periode
+    df_kabupaten = df_tren.groupby('periode')[['jumlah_balita_ditimbang', kolom_jumlah]].sum()
+    fig_tren.add_trace(go.Scatter(
+        x=df_kabupaten.index,
+        y=df_kabupaten[kolom_jumlah] / df_kabupaten['jumlah_balita_ditimbang'] * 100,
+        name='Kabupaten',
+        mode='lines+markers',
+        line=dict(color='#2c3e50', width=4, dash='dash'),
+        hovertemplate='<b>Kabupaten</b><br>%{x|%B %Y}: %{y:.2f}%<extra></extra>'
+    ))
+
+    for nama_kecamatan, df_kecamatan in df_tren[df_tren['nama_kecamatan'].isin(daftar_kecamatan)].groupby('nama_kecamatan'):
+        fig_tren.add_trace(go.Scatter(
+            x=df_kecamatan['periode'],
+            y=df_kecamatan[kolom],
+            name=nama_kecamatan,
+            mode='lines+markers',
+            hovertemplate=f'<b>{nama_kecamatan}</b><br>%{{x|%B %Y}}: %{{y:.2f}}%<extra></extra>'
+        ))
+
+    fig_tren.update_layout(
+        height=550,
+        title_text=f"Tren Persentase {indikator} per Bulan",
+        xaxis_title='Periode',
+        yaxis_title='Persentase (%)',
+        xaxis=dict(dtick='M1', tickformat='%b %Y'),
+        legend=dict(orientation="h", yanchor="bottom", y=1.02, xanchor="right", x=1),
+        font=dict(size=11),
+        margin=dict(t=80, b=50)
+    )
+    return fig_tren
+
+# Label ringkas untuk kolom kategori detail BB/U, TB/U, BB/TB
+LABEL_KATEGORI_DETAIL = {
+    'bb_per_u_sangat_kurang': 'Sangat Kurang',
+    'bb_per_u_kurang': 'Kurang',
+    'bb_per_u_normal': 'Normal',
+    'bb_per_u_risiko_lebih': 'Risiko Lebih',
+    'tb_per_u_sangat_pendek': 'Sangat Pendek',
+    'tb_per_u_pendek': 'Pendek',
+    'tb_per_u_normal': 'Normal',
+    'tb_per_u_tinggi': 'Tinggi',
+    'bb_per_tb_gizi_buruk': 'Gizi Buruk',
+    'bb_per_tb_gizi_kurang': 'Gizi Kurang',
+    'bb_per_tb_normal': 'Normal',
+    'bb_per_tb_risiko_gizi_lebih': 'Risiko Lebih',
+    'bb_per_tb_gizi_lebih': 'Gizi Lebih',
+    'bb_per_tb_obesitas': 'Obesitas'
+}
+
+def buat_fig_detail(df_fact, kolom_list):
+    # Hitung total per kategori
+    kategori_values = []
+    kategori_labels = []
+    for kolom in kolom_list:
+        if kolom in df_fact.columns:
+            kategori_values.append(df_fact[kolom].sum())
+            kategori_labels.append(LABEL_KATEGORI_DETAIL.get(kolom, kolom))
+
+    fig_detail = go.Figure(data=[go.Bar(
+        x=kategori_labels,
+        y=kategori_values,
+        text=[f"{int(v):,}" for v in kategori_values],
+        textposition='outside',
+        marker_color=['#e74c3c' if 'kurang' in l.lower() or 'pendek' in l.lower() or 'buruk' in l.lower()
+                     else '#f39c12' if 'risiko' in l.lower() or 'lebih' in l.lower() or 'obesitas' in l.lower()
+                     else '#2ecc71' for l in kategori_labels],
+        hovertemplate='<b>%{x}</b><br>Jumlah: %{y:,} balita<extra></extra>'
+    )])
+
+    fig_detail.update_layout(
+        height=350,
+        xaxis_tickangle=-45,
+        yaxis_title='Jumlah Balita',
+        margin=dict(t=20, b=80, l=40, r=20),
+        font=dict(size=9)
+    )
+    return fig_detail
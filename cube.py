@@ -0,0 +1,50 @@
+from etl import KOLOM_JUMLAH_AGREGAT, hitung_persentase
+
+# Kubus agregat hierarkis kabupaten -> kecamatan -> puskesmas per periode (id_waktu).
+# Dibangun sekali per dataset: satu groupby di level puskesmas, level di atasnya di-roll-up dari
+# hasil level di bawahnya. Rincian per kecamatan disimpan sebagai potongan frame siap pakai,
+# jadi drill-down cukup lookup dictionary. Frame hasil dipakai bersama, jangan dimodifikasi.
+class KubusAgregat:
+    def __init__(self, df_fact, df_wilayah):
+        df_puskesmas = df_fact.groupby(['id_waktu', 'nama_kecamatan', 'id_wilayah'], sort=False)[KOLOM_JUMLAH_AGREGAT].sum()
+        df_puskesmas = df_puskesmas.reset_index()
+        nama_puskesmas = df_wilayah.drop_duplicates('id_wilayah').set_index('id_wilayah')['nama_puskesmas']
+        df_puskesmas.insert(3, 'nama_puskesmas', nama_puskesmas.reindex(df_puskesmas['id_wilayah']).to_numpy())
+        self.puskesmas = hitung_persentase(df_puskesmas)
+
+        df_kecamatan = self.puskesmas.groupby(['id_waktu', 'nama_kecamatan'])[KOLOM_JUMLAH_AGREGAT].sum()
+        df_kecamatan['jumlah_puskesmas'] = self.puskesmas.groupby(['id_waktu', 'nama_kecamatan']).size()
+        self.kecamatan = hitung_persentase(df_kecamatan.reset_index())
+
+        df_kabupaten = self.kecamatan.groupby('id_waktu')[KOLOM_JUMLAH_AGREGAT + ['jumlah_puskesmas']].sum()
+        df_kabupaten['jumlah_kecamatan'] = self.kecamatan.groupby('id_waktu').size()
+        self.kabupaten = hitung_persentase(df_kabupaten)
+
+        self.periode = sorted(self.kabupaten.index)
+
+        # Rincian puskesmas per (id_waktu, kecamatan), diurutkan dari persentase stunting tertinggi
+        self._rincian = {
+            kunci: frame.drop(columns=['id_waktu', 'nama_kecamatan']).reset_index(drop=True)
+            for kunci, frame in self.puskesmas.sort_values('persentase_stunting', ascending=False)
+                                              .groupby(['id_waktu', 'nama_kecamatan'], sort=False)
+        }
+        self._ringkasan_kecamatan = self.kecamatan.set_index(['id_waktu', 'nama_kecamatan'])
+
+    def _id_waktu(self, id_waktu):
+        # Tanpa id_waktu dipakai periode terakhir di dataset
+        return self.periode[-1] if id_waktu is None else id_waktu
+
+    def ringkasan_kabupaten(self, id_waktu=None):
+        return self.kabupaten.loc[self._id_waktu(id_waktu)]
+
+    def ringkasan_kecamatan(self, nama_kecamatan, id_waktu=None):
+        kunci = (self._id_waktu(id_waktu), nama_kecamatan)
+        if kunci not in self._ringkasan_kecamatan.index:
+            return None
+        return self._ringkasan_kecamatan.loc[kunci]
+
+    def rincian_puskesmas(self, nama_kecamatan, id_waktu=None):
+        return self._rincian.get((self._id_waktu(id_waktu), nama_kecamatan))
+
+def buat_kubus(df_fact, df_wilayah):
+    return KubusAgregat(df_fact, df_wilayah)
@@ -0,0 +1,832 @@
+import hashlib
+import io
+import os
+import time
+
+import pandas as pd
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from etl import (proses_etl, agregasi_kecamatan, wilayah_tanpa_koordinat, gabung_periode, kunci_periode,
+                 KATEGORI_STUNTING, MONTH_MAP, LaporanValidasi)
+import history_store
+from exports import FORMAT_EKSPOR, MIME_XLSX, encode_xlsx
+from tables import (KOLOM_JUMLAH, KOLOM_PERSEN, TABEL_STYLER_MAKS_BARIS, URUTAN_TABEL, siapkan_tabel,
+                    style_tabel, tandai_kategori)
+from charts import (FigureCache, HEATMAP_RADIUS_DEFAULT, HEATMAP_OPACITY_DEFAULT,
+                    buat_fig_map, buat_fig_heatmap, patch_fig_heatmap, buat_fig_bar, buat_fig_puskesmas,
+                    buat_fig_compare, buat_fig_pie, buat_fig_kategori, buat_fig_detail, buat_fig_tren, INDIKATOR_TREN)
+from dataset_registry import Dataset, DatasetGabungan, DatasetRegistry
+from pekerja_etl import PekerjaETL
+import profiler
+from profiler import tahap
+
+# Halaman dashboard setelah data dibuka (upload atau riwayat). Modul ini memuat stack berat (pandas,
+# plotly, openpyxl, pyarrow) dan di-import oleh Code_Dashboard.py hanya saat dibutuhkan, sehingga
+# halaman awal tampil tanpa menunggu import tersebut.
+
+# CSS yang hanya dipakai di dalam dashboard (kotak info, tab pada mode non-lazy)
+CSS_DASHBOARD = """
+<style>
+    .metric-card {
+        background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+        padding: 1.5rem;
+        border-radius: 10px;
+        color: white;
+        box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    }
+    .stTabs [data-baseweb="tab-list"] {
+        gap: 2rem;
+    }
+    .stTabs [data-baseweb="tab"] {
+        height: 4rem;
+        padding: 0 2rem;
+        font-size: 1.1rem;
+        font-weight: 600;
+    }
+    .info-box {
+        background: #f8f9fa;
+        padding: 1rem;
+        border-radius: 8px;
+        border-left: 4px solid #3498db;
+        margin: 1rem 0;
+    }
+</style>
+"""
+
+# Konfigurasi cache hasil ETL (dibagi ke semua sesi, bisa diatur lewat environment variable)
+ETL_CACHE_MAX_ENTRIES = int(os.environ.get("ETL_CACHE_MAX_ENTRIES", "16"))
+ETL_CACHE_TTL = int(os.environ.get("ETL_CACHE_TTL", "3600"))  # detik
+FIGURE_CACHE_MAX_ENTRIES = int(os.environ.get("FIGURE_CACHE_MAX_ENTRIES", "128"))
+EKSPOR_CACHE_MAX_ENTRIES = int(os.environ.get("EKSPOR_CACHE_MAX_ENTRIES", "32"))
+
+# Mode lazy: hanya tab yang sedang dibuka yang dijalankan pada setiap rerun
+MODE_TAB_LAZY = os.environ.get("STUNTING_TAB_LAZY", "1") == "1"
+
+# Nilai awal widget di dalam tab. Nilainya dikelola lewat session_state (bukan argumen default widget)
+# karena pada mode lazy widget di tab yang tidak aktif tidak dirender dan statenya akan dibuang Streamlit.
+WIDGET_TAB_DEFAULTS = {
+    'jenis_peta': "Scatter Map",
+    'radius_heat': HEATMAP_RADIUS_DEFAULT,
+    'opacity_heat': HEATMAP_OPACITY_DEFAULT,
+    'jumlah_kecamatan': 15,
+    'urutan': "Tertinggi",
+    'search_term': "",
+    'sort_by': "Nama Kecamatan",
+    'format_ekspor': "CSV",
+    'indikator_tren': "Stunting",
+    'kecamatan_tren': [],
+}
+
+# ETL upload dijalankan di thread latar; skrip sesi hanya menampilkan progres dan melakukan polling
+# sehingga klik pengguna selama parsing tidak memblokir atau mengulang ETL
+ETL_LATAR = os.environ.get("STUNTING_ETL_LATAR", "1") == "1"
+ETL_POLLING_DETIK = float(os.environ.get("STUNTING_ETL_POLLING", "0.5"))
+
+# Label dan posisi (0-1) progres untuk setiap tahap yang dilaporkan proses_etl / bangun_dataset_upload
+TAHAP_ETL = {
+    'antre': ("Menunggu antrean ETL", 0.0),
+    'buka_workbook': ("Membuka workbook", 0.05),
+    'baca_validasi_baris': ("Membaca dan memvalidasi sheet STATUS GIZI", 0.15),
+    'transformasi': ("Transformasi star schema", 0.75),
+    'agregasi_kecamatan': ("Agregasi per kecamatan", 0.9),
+    'selesai': ("Selesai", 1.0),
+}
+
+# Setiap upload yang berhasil diproses ikut disimpan ke riwayat multi-periode
+SIMPAN_RIWAYAT = os.environ.get("STUNTING_SIMPAN_RIWAYAT", "1") == "1"
+
+def hitung_hash_file(uploaded_file):
+    return hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+
+# Registry dataset untuk seluruh proses Streamlit: hasil ETL satu file (atau satu periode riwayat)
+# disimpan sekali dan dipakai bersama oleh semua sesi yang membuka dataset yang sama, sehingga
+# interaksi widget tidak memicu parsing ulang dan memori tidak bertambah per pengguna.
+@st.cache_resource(show_spinner=False)
+def dataset_registry():
+    return DatasetRegistry(lease_ttl=ETL_CACHE_TTL, maks_idle=ETL_CACHE_MAX_ENTRIES)
+
+# Pool ETL latar untuk seluruh proses Streamlit (lihat pekerja_etl.py)
+@st.cache_resource(show_spinner=False)
+def pekerja_etl():
+    return PekerjaETL(ttl=ETL_CACHE_TTL)
+
+def bangun_dataset_upload(file_hash, file_bytes, pekerjaan=None):
+    # Laporan validasi ikut disimpan agar diagnostik tetap tampil tanpa membaca ulang file.
+    # pekerjaan (Pekerjaan) diisi saat dijalankan di thread latar, untuk melaporkan progres
+    laporan = LaporanValidasi()
+    progres = None
+    if pekerjaan is not None:
+        pekerjaan.laporan = laporan
+        progres = pekerjaan.lapor_tahap
+    try:
+        df_fact, df_wilayah, df_waktu, success, message = proses_etl(io.BytesIO(file_bytes), laporan, progres)
+        if success and progres is not None:
+            progres('agregasi_kecamatan')
+        df_agg = agregasi_kecamatan(df_fact) if success else None
+    except Exception as e:
+        # Sama seperti kegagalan parsing di proses_etl: ditampilkan sebagai pesan, bukan traceback
+        return Dataset(file_hash, None, None, None, None, False, f"Error: {str(e)}", laporan)
+    return Dataset(file_hash, df_fact, df_wilayah, df_waktu, df_agg, success, message, laporan)
+
+def bangun_dataset_gabungan(dataset_id, daftar_file, detik_total):
+    # daftar_file: [(nama file, Dataset hasil ETL file itu, detik ETL)] -> satu DatasetGabungan multi-periode.
+    # Satu periode per file; jika beberapa file berisi periode yang sama, file dengan timestamp judul terbaru dipakai
+    ringkasan = []
+    terpilih = {}  # kunci periode -> (timestamp judul, dataset, posisi di ringkasan)
+    for nama_file, dataset, detik in daftar_file:
+        baris = {'File': nama_file, 'Periode': "-",
+                 'Baris': dataset.laporan.baris_diperiksa if dataset.laporan is not None else 0,
+                 'Waktu ETL (detik)': round(detik, 2), 'Status': dataset.message}
+        if dataset.success:
+            waktu = dataset.df_waktu.iloc[0]
+            baris['Periode'] = f"{waktu['bulan']} {waktu['tahun']}"
+            if dataset.laporan is not None and dataset.laporan.jumlah_peringatan:
+                baris['Status'] += f" ({dataset.laporan.jumlah_peringatan} peringatan validasi)"
+            kunci = kunci_periode(dataset.df_waktu)
+            stempel = tuple(int(waktu[kolom]) for kolom in ('tanggal', 'jam', 'menit'))
+            lama = terpilih.get(kunci)
+            if lama is not None and lama[0] > stempel:
+                baris['Status'] = f"Tidak dipakai: periode sama dengan {ringkasan[lama[2]]['File']} yang lebih baru"
+            else:
+                if lama is not None:
+                    ringkasan[lama[2]]['Status'] = f"Tidak dipakai: periode sama dengan {nama_file} yang lebih baru"
+                terpilih[kunci] = (stempel, dataset, len(ringkasan))
+        ringkasan.append(baris)
+    df_ringkasan = pd.DataFrame(ringkasan)
+    
+    if not terpilih:
+        return DatasetGabungan(dataset_id, None, None, None, None, None, df_ringkasan, False,
+                               "Tidak ada file yang berhasil diproses.")
+    df_fact, df_wilayah, df_waktu, df_agg = gabung_periode(
+        [(d.df_fact, d.df_wilayah, d.df_waktu, d.df_agg) for _, d, _ in terpilih.values()])
+    df_tren = history_store.lengkapi_tren(
+        df_agg.merge(df_waktu[['id_waktu', 'tahun', 'bulan']], on='id_waktu')[history_store.KOLOM_TREN])
+    message = (f"{len(terpilih)} periode dari {len(daftar_file)} file berhasil digabung "
+               f"(ETL {detik_total:.1f} detik, jumlah waktu per file {sum(d for _, _, d in daftar_file):.1f} detik)")
+    return DatasetGabungan(dataset_id, df_fact, df_wilayah, df_waktu, df_agg, df_tren, df_ringkasan, True, message)
+
+# Polling pekerjaan ETL latar: hanya fragment ini yang dijalankan ulang setiap ETL_POLLING_DETIK,
+# setelah semua selesai seluruh skrip dijalankan ulang untuk menampilkan dashboard
+@st.fragment(run_every=ETL_POLLING_DETIK)
+def pantau_pekerjaan_etl(daftar_pekerjaan):
+    if all(pekerjaan.selesai for _, pekerjaan in daftar_pekerjaan):
+        st.rerun()
+    for nama_file, pekerjaan in daftar_pekerjaan:
+        label, posisi = TAHAP_ETL.get(pekerjaan.tahap, (pekerjaan.tahap, 0.0))
+        teks = f"🔄 {label}... ({pekerjaan.baris_dibaca:,} baris dibaca, {pekerjaan.durasi:.1f} detik)"
+        st.progress(posisi, text=f"{nama_file}: {teks}" if len(daftar_pekerjaan) > 1 else teks)
+    st.caption("File diproses di latar belakang; halaman tetap bisa dipakai dan tidak perlu upload ulang.")
+
+def lampirkan_upload(uploaded_files):
+    # Dataset upload: langsung dari registry bila sudah ada, selain itu ETL setiap file dikirim ke pool latar
+    # (file-file berjalan bersamaan). Beberapa file digabung menjadi satu DatasetGabungan.
+    # Mengembalikan (dataset_id, dataset); dataset None selama ETL masih berjalan (progres sudah ditampilkan).
+    file_per_hash = {hitung_hash_file(f): f for f in uploaded_files}
+    if len(file_per_hash) == 1:
+        dataset_id = next(iter(file_per_hash))
+    else:
+        dataset_id = "gabungan-" + hashlib.sha256("".join(sorted(file_per_hash)).encode()).hexdigest()
+    
+    if not ETL_LATAR or dataset_registry().ada(dataset_id):
+        with st.spinner("🔄 Memproses data... Mohon tunggu..."):
+            return dataset_id, lampirkan_dataset(dataset_id, lambda: bangun_dataset_sinkron(dataset_id, file_per_hash))
+    
+    pekerja = pekerja_etl()
+    daftar_pekerjaan = []
+    for file_hash, uploaded_file in file_per_hash.items():
+        file_bytes = uploaded_file.getvalue()
+        pekerjaan = pekerja.kirim(file_hash, lambda p, h=file_hash, b=file_bytes: bangun_dataset_upload(h, b, p))
+        daftar_pekerjaan.append((uploaded_file.name, pekerjaan))
+    if not all(pekerjaan.selesai for _, pekerjaan in daftar_pekerjaan):
+        pantau_pekerjaan_etl(daftar_pekerjaan)
+        return dataset_id, None
+    
+    if len(daftar_pekerjaan) == 1:
+        pembuat = daftar_pekerjaan[0][1].hasil
+    else:
+        detik_total = (max(p.selesai_pada for _, p in daftar_pekerjaan) - min(p.mulai for _, p in daftar_pekerjaan))
+        pembuat = lambda: bangun_dataset_gabungan(
+            dataset_id, [(nama_file, p.hasil(), p.durasi) for nama_file, p in daftar_pekerjaan], detik_total)
+    try:
+        return dataset_id, lampirkan_dataset(dataset_id, pembuat)
+    finally:
+        # Dataset yang berhasil sudah di registry; sesi lain yang menunggu pekerjaan ini mengambilnya dari sana.
+        # Hasil gagal tidak disimpan registry, jadi pekerjaannya juga dilupakan dan rerun berikutnya mencoba ulang.
+        for file_hash in file_per_hash:
+            pekerja.lupakan(file_hash)
+
+def bangun_dataset_sinkron(dataset_id, file_per_hash):
+    # Tanpa ETL latar (STUNTING_ETL_LATAR=0): file diproses satu per satu di thread skrip
+    if len(file_per_hash) == 1:
+        file_hash, uploaded_file = next(iter(file_per_hash.items()))
+        return bangun_dataset_upload(file_hash, uploaded_file.getvalue())
+    daftar_file = []
+    for file_hash, uploaded_file in file_per_hash.items():
+        mulai = time.perf_counter()
+        dataset = bangun_dataset_upload(file_hash, uploaded_file.getvalue())
+        daftar_file.append((uploaded_file.name, dataset, time.perf_counter() - mulai))
+    return bangun_dataset_gabungan(dataset_id, daftar_file, sum(detik for _, _, detik in daftar_file))
+
+def bangun_dataset_riwayat(dataset_id, id_waktu):
+    # Hanya partisi periode yang diminta yang dibaca, agregatnya sudah dimaterialisasi di store
+    with tahap('riwayat.muat_fakta'):
+        df_fact, df_wilayah, df_waktu = history_store.muat_riwayat(id_waktu)
+    if df_fact is None:
+        return Dataset(dataset_id, None, None, None, None, False, "Periode tidak ditemukan di riwayat.")
+    with tahap('riwayat.muat_agregat'):
+        df_agg = history_store.muat_agregat(id_waktu)
+    return Dataset(dataset_id, df_fact, df_wilayah, df_waktu, df_agg, True, "Data riwayat berhasil dimuat!")
+
+def lampirkan_dataset(dataset_id, pembuat):
+    # Sesi menempel ke satu dataset; dataset sebelumnya dilepas saat sesi berpindah dataset
+    registry = dataset_registry()
+    sesi_id = get_script_run_ctx().session_id
+    dataset_lama = st.session_state.get('dataset_aktif')
+    if dataset_lama is not None and dataset_lama != dataset_id:
+        registry.lepas(dataset_lama, sesi_id)
+    st.session_state['dataset_aktif'] = dataset_id
+    if dataset_id is None:
+        return None
+    return registry.lampirkan(dataset_id, sesi_id, pembuat)
+
+# Periode riwayat di-cache per versi store, jadi hanya dibaca ulang setelah ada upload baru
+@st.cache_data(show_spinner=False)
+def muat_dim_waktu_cached(versi):
+    return history_store.muat_dim_waktu()
+
+# Rollup tren semua periode: satu file kecil, dibaca ulang hanya setelah ada periode baru
+@st.cache_data(show_spinner=False)
+def muat_tren_cached(versi):
+    with tahap('riwayat.muat_tren'):
+        return history_store.muat_tren()
+
+# Satu cache figure (LRU) untuk seluruh proses Streamlit
+@st.cache_resource(show_spinner=False)
+def figure_cache():
+    return FigureCache(max_entries=FIGURE_CACHE_MAX_ENTRIES)
+
+# Format kolom tabel besar (tanpa Styler), diformat di browser
+KONFIGURASI_KOLOM_TABEL = {
+    **{kolom: st.column_config.NumberColumn(kolom, format="localized") for kolom in KOLOM_JUMLAH},
+    **{kolom: st.column_config.NumberColumn(kolom, format="%.2f%%") for kolom in KOLOM_PERSEN},
+}
+
+# st.plotly_chart dengan waktu serialisasi figure (to_json + protobuf) tercatat di profil
+def plotly_chart(nama, fig, **kwargs):
+    with tahap(f"chart.{nama}"):
+        return st.plotly_chart(fig, **kwargs)
+
+# Nama kecamatan dari klik pada chart (scatter map: hover_name, bar chart horizontal: sumbu y)
+def kecamatan_dari_pilihan(event):
+    for point in event['selection']['points']:
+        nama = point.get('hovertext') or point.get('y')
+        if nama:
+            return nama
+    return None
+
+def render_rincian_puskesmas(kubus, nama_kecamatan, dataset_id, fig_cache):
+    df_puskesmas = kubus.rincian_puskesmas(nama_kecamatan)
+    if df_puskesmas is None:
+        return
+    ringkasan = kubus.ringkasan_kecamatan(nama_kecamatan)
+    kabupaten = kubus.ringkasan_kabupaten()
+    
+    st.markdown(f"#### 🏥 Rincian Puskesmas - Kecamatan {nama_kecamatan}")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.metric("% Stunting Kecamatan", f"{ringkasan['persentase_stunting']:.2f}%",
+                  delta=f"{ringkasan['persentase_stunting'] - kabupaten['persentase_stunting']:+.2f}% vs kabupaten",
+                  delta_color="inverse")
+    with col2:
+        st.metric("Balita Ditimbang", f"{int(ringkasan['jumlah_balita_ditimbang']):,}")
+    with col3:
+        st.metric("Jumlah Puskesmas", int(ringkasan['jumlah_puskesmas']))
+    
+    fig_puskesmas = fig_cache.ambil((dataset_id, 'puskesmas', nama_kecamatan), buat_fig_puskesmas,
+                                    df_puskesmas, nama_kecamatan)
+    plotly_chart('puskesmas', fig_puskesmas, use_container_width=True)
+
+def tampilkan_laporan_validasi(laporan):
+    st.caption(laporan.ringkasan())
+    st.dataframe(laporan.ke_dataframe(), use_container_width=True, hide_index=True)
+
+# Render per tab. Setiap tab adalah fungsi tersendiri agar pada mode lazy hanya tab aktif yang dijalankan.
+def render_tab_peta(df_agg, kubus, dataset_id, fig_cache):
+    st.markdown("### 🗺️ Peta Sebaran Stunting per Kecamatan")
+    
+    # Kecamatan tanpa koordinat tidak diplot, tampilkan agar bisa dilengkapi
+    tanpa_koordinat = wilayah_tanpa_koordinat(df_agg)
+    if tanpa_koordinat:
+        st.warning(f"⚠️ Koordinat tidak ditemukan untuk: {', '.join(tanpa_koordinat)}. Kecamatan ini tidak ditampilkan di peta.")
+    
+    # Pilihan jenis peta
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        st.markdown("#### Pilih Jenis Visualisasi Peta")
+    with col2:
+        jenis_peta = st.radio("Tipe Peta:", ["Scatter Map", "Heatmap"], horizontal=True, key='jenis_peta')
+    
+    if jenis_peta == "Scatter Map":
+        # Peta Scatter (yang sudah ada)
+        fig_map = fig_cache.ambil((dataset_id, 'map'), buat_fig_map, df_agg)
+        event_peta = plotly_chart('map', fig_map, use_container_width=True, on_select="rerun",
+                                     selection_mode="points", key='pilih_peta')
+        
+        st.markdown("""
+        <div class="info-box">
+            <b>💡 Cara membaca Scatter Map:</b><br>
+            • <b>Ukuran lingkaran</b> = Jumlah kasus stunting (lingkaran lebih besar = kasus lebih banyak)<br>
+            • <b>Warna merah</b> = Persentase stunting (merah lebih gelap = persentase lebih tinggi)<br>
+            • <b>Klik lingkaran</b> untuk melihat rincian puskesmas di kecamatan tersebut
+        </div>
+        """, unsafe_allow_html=True)
+        
+        nama_kecamatan = kecamatan_dari_pilihan(event_peta)
+        if nama_kecamatan:
+            render_rincian_puskesmas(kubus, nama_kecamatan, dataset_id, fig_cache)
+    
+    else:
+        # Heatmap: satu figure saja. Nilai slider (di bawah peta) dibaca dari session_state
+        # sehingga perubahan radius/opacity cukup mem-patch trace figure dasar.
+        radius_heat = st.session_state['radius_heat']
+        opacity_heat = st.session_state['opacity_heat']
+        
+        fig_heatmap = fig_cache.ambil((dataset_id, 'heatmap'), buat_fig_heatmap, df_agg)
+        if radius_heat != HEATMAP_RADIUS_DEFAULT or opacity_heat != HEATMAP_OPACITY_DEFAULT:
+            fig_heatmap = fig_cache.ambil((dataset_id, 'heatmap', radius_heat, opacity_heat),
+                                          patch_fig_heatmap, fig_heatmap, radius_heat, opacity_heat)
+        plotly_chart('heatmap', fig_heatmap, use_container_width=True)
+        
+        st.markdown("""
+        <div class="info-box">
+            <b>💡 Cara membaca Heatmap:</b><br>
+            • <b>Warna intensitas</b> = Tingkat persentase stunting di area tersebut<br>
+            • <b>Merah lebih gelap/terang</b> = Konsentrasi stunting lebih tinggi<br>
+            • <b>Area yang menyala</b> menunjukkan zona dengan masalah stunting yang perlu perhatian khusus<br>
+            • Hover pada peta untuk melihat detail per kecamatan
+        </div>
+        """, unsafe_allow_html=True)
+        
+        # Tambahan: Slider untuk mengatur radius heatmap
+        st.markdown("#### Pengaturan Heatmap")
+        col1, col2 = st.columns(2)
+        with col1:
+            st.slider("Radius Intensitas Panas:", 10, 50, step=5, key='radius_heat',
+                      help="Semakin besar radius, semakin luas area yang terpengaruh")
+        with col2:
+            st.slider("Tingkat Transparansi:", 0.3, 1.0, step=0.1, key='opacity_heat',
+                      help="Mengatur tingkat transparansi heatmap")
+    
+    # Tambahan: Highlight kecamatan dengan perhatian khusus
+    st.markdown("### ⚠️ Kecamatan Prioritas")
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 🔴 Persentase Tertinggi (Top 5)")
+        top5_persen = df_agg.nlargest(5, 'persentase_stunting')[['nama_kecamatan', 'persentase_stunting', 'jumlah_balita_stunting']]
+        for idx, row in top5_persen.iterrows():
+            st.markdown(f"**{row['nama_kecamatan']}**: {row['persentase_stunting']:.2f}% ({int(row['jumlah_balita_stunting'])} balita)")
+    
+    with col2:
+        st.markdown("#### 🔢 Jumlah Kasus Tertinggi (Top 5)")
+        top5_jumlah = df_agg.nlargest(5, 'jumlah_balita_stunting')[['nama_kecamatan', 'jumlah_balita_stunting', 'persentase_stunting']]
+        for idx, row in top5_jumlah.iterrows():
+            st.markdown(f"**{row['nama_kecamatan']}**: {int(row['jumlah_balita_stunting'])} balita ({row['persentase_stunting']:.2f}%)")
+
+def render_tab_perbandingan(df_agg, kubus, dataset_id, fig_cache):
+    st.markdown("### 📊 Perbandingan Antar Kecamatan")
+    
+    # Pilihan filter
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        jumlah_kecamatan = st.slider("Jumlah kecamatan yang ditampilkan:", 5, 32, key='jumlah_kecamatan')
+    with col2:
+        urutan = st.radio("Urutkan berdasarkan:", ["Tertinggi", "Terendah"], key='urutan')
+    
+    # Bar chart dengan jumlah dan persentase
+    st.markdown("#### Top Kecamatan dengan Stunting " + urutan)
+    
+    fig_bar = fig_cache.ambil((dataset_id, 'bar', jumlah_kecamatan, urutan), buat_fig_bar,
+                              df_agg, jumlah_kecamatan, urutan)
+    event_bar = plotly_chart('bar', fig_bar, use_container_width=True, on_select="rerun",
+                                selection_mode="points", key='pilih_bar')
+    
+    # Klik batang kecamatan untuk drill-down ke puskesmas
+    nama_kecamatan = kecamatan_dari_pilihan(event_bar)
+    if nama_kecamatan:
+        render_rincian_puskesmas(kubus, nama_kecamatan, dataset_id, fig_cache)
+    else:
+        st.caption("Klik batang kecamatan untuk melihat rincian per puskesmas.")
+    
+    st.markdown("---")
+    
+    # Perbandingan 3 indikator
+    st.markdown("#### Perbandingan Tiga Indikator Gizi")
+    
+    fig_compare = fig_cache.ambil((dataset_id, 'compare'), buat_fig_compare, df_agg)
+    plotly_chart('compare', fig_compare, use_container_width=True)
+    
+    st.markdown("""
+    <div class="info-box">
+        <b>📌 Catatan:</b> Angka di dalam kurung menunjukkan jumlah balita absolut untuk setiap indikator.
+    </div>
+    """, unsafe_allow_html=True)
+
+def render_tab_distribusi(df_fact, df_agg, dataset_id, fig_cache, total_ditimbang, total_stunting, total_kurang_gizi, total_wasting):
+    st.markdown("### 🎯 Distribusi dan Kategori Status Gizi")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### Distribusi Status Gizi Balita")
+        
+        total_normal = total_ditimbang - total_stunting - total_kurang_gizi - total_wasting
+        
+        # Pie chart dengan label yang jelas
+        fig_pie = fig_cache.ambil((dataset_id, 'pie'), buat_fig_pie,
+                                  total_stunting, total_kurang_gizi, total_wasting, total_normal)
+        plotly_chart('pie', fig_pie, use_container_width=True)
+        
+        # Info box dengan detail
+        st.markdown(f"""
+        <div class="info-box">
+            <b>📊 Detail Distribusi:</b><br>
+            • <b style="color: #ff6b6b;">Stunting:</b> {total_stunting:,} balita ({total_stunting/total_ditimbang*100:.2f}%)<br>
+            • <b style="color: #feca57;">Kurang Gizi:</b> {total_kurang_gizi:,} balita ({total_kurang_gizi/total_ditimbang*100:.2f}%)<br>
+            • <b style="color: #ee5a6f;">Wasting:</b> {total_wasting:,} balita ({total_wasting/total_ditimbang*100:.2f}%)<br>
+            • <b style="color: #48dbfb;">Normal/Lainnya:</b> {total_normal:,} balita ({total_normal/total_ditimbang*100:.2f}%)
+        </div>
+        """, unsafe_allow_html=True)
+    
+    with col2:
+        st.markdown("#### Kategori Berdasarkan Tingkat Keparahan")
+        
+        fig_kategori = fig_cache.ambil((dataset_id, 'kategori'), buat_fig_kategori, df_agg)
+        plotly_chart('kategori', fig_kategori, use_container_width=True)
+        
+        # Detail per kategori
+        st.markdown("**📍 Daftar Kecamatan per Kategori:**")
+        for kategori in KATEGORI_STUNTING:
+            kec_list = df_agg[df_agg['kategori'] == kategori]['nama_kecamatan'].tolist()
+            if kec_list:
+                emoji = '🟢' if 'Rendah' in kategori else '🟡' if 'Sedang' in kategori else '🟠' if 'Tinggi' in kategori else '🔴'
+                st.markdown(f"{emoji} **{kategori}**: {', '.join(kec_list)}")
+    
+    st.markdown("---")
+    
+    # Distribusi detail per indikator BB/U, TB/U, BB/TB
+    st.markdown("#### Distribusi Detail Kategori Gizi (BB/U, TB/U, BB/TB)")
+    
+    # Agregasi untuk kategori detail
+    kategori_detail = {
+        'BB/U': ['bb_per_u_sangat_kurang', 'bb_per_u_kurang', 'bb_per_u_normal', 'bb_per_u_risiko_lebih'],
+        'TB/U': ['tb_per_u_sangat_pendek', 'tb_per_u_pendek', 'tb_per_u_normal', 'tb_per_u_tinggi'],
+        'BB/TB': ['bb_per_tb_gizi_buruk', 'bb_per_tb_gizi_kurang', 'bb_per_tb_normal', 
+                 'bb_per_tb_risiko_gizi_lebih', 'bb_per_tb_gizi_lebih', 'bb_per_tb_obesitas']
+    }
+    
+    col1, col2, col3 = st.columns(3)
+    
+    for idx, (col, (indikator, kolom_list)) in enumerate(zip([col1, col2, col3], kategori_detail.items())):
+        with col:
+            st.markdown(f"**{indikator}**")
+            
+            fig_detail = fig_cache.ambil((dataset_id, 'detail', indikator), buat_fig_detail, df_fact, kolom_list)
+            plotly_chart('detail', fig_detail, use_container_width=True)
+    
+    st.markdown("""
+    <div class="info-box">
+        <b>📚 Penjelasan Indikator:</b><br>
+        • <b>BB/U (Berat Badan per Usia):</b> Mengukur kecukupan berat badan anak sesuai usianya<br>
+        • <b>TB/U (Tinggi Badan per Usia):</b> Mengukur stunting atau kekurangan gizi kronis<br>
+        • <b>BB/TB (Berat Badan per Tinggi Badan):</b> Mengukur wasting atau kekurangan gizi akut
+    </div>
+    """, unsafe_allow_html=True)
+
+# Jumlah kecamatan yang ditampilkan di tab tren jika pengguna belum memilih
+TREN_KECAMATAN_DEFAULT = 5
+
+def render_tab_tren(fig_cache, dataset_gabungan=None):
+    st.markdown("### 📈 Tren Bulanan per Kecamatan")
+    
+    if dataset_gabungan is not None:
+        # Upload beberapa file: tren dari periode-periode yang di-upload, bukan dari riwayat
+        kunci_tren, df_tren = dataset_gabungan.dataset_id, dataset_gabungan.df_tren
+    else:
+        versi = history_store.versi_store()
+        kunci_tren, df_tren = f"tren-{versi}", muat_tren_cached(versi)
+    if df_tren['id_waktu'].nunique() < 2:
+        st.info("Tren membutuhkan minimal dua periode di riwayat. Upload data bulan lain untuk melihat tren.")
+        return
+    
+    col1, col2 = st.columns([1, 3])
+    with col1:
+        indikator = st.radio("Indikator:", list(INDIKATOR_TREN), key='indikator_tren')
+    with col2:
+        daftar_kecamatan = st.multiselect("Kecamatan:", sorted(df_tren['nama_kecamatan'].unique()), key='kecamatan_tren')
+    
+    kolom = INDIKATOR_TREN[indikator][0]
+    periode = sorted(df_tren['periode'].unique())
+    df_terakhir = df_tren[df_tren['periode'] == periode[-1]].set_index('nama_kecamatan')[kolom]
+    if not daftar_kecamatan:
+        daftar_kecamatan = df_terakhir.nlargest(TREN_KECAMATAN_DEFAULT).index.tolist()
+        st.caption(f"Menampilkan {len(daftar_kecamatan)} kecamatan dengan persentase {indikator.lower()} tertinggi pada periode terakhir.")
+    
+    fig_tren = fig_cache.ambil((kunci_tren, 'tren', indikator, tuple(daftar_kecamatan)), buat_fig_tren,
+                               df_tren, indikator, daftar_kecamatan)
+    plotly_chart('tren', fig_tren, use_container_width=True)
+    
+    # Perubahan terhadap periode sebelumnya, langsung dari rollup (tanpa membaca partisi fakta).
+    # Periode di riwayat bisa tidak berurutan, jadi kolom diberi nama periodenya
+    sebelumnya, terakhir = pd.Timestamp(periode[-2]), pd.Timestamp(periode[-1])
+    label_sebelumnya = f"{MONTH_MAP[sebelumnya.month]} {sebelumnya.year}"
+    label_terakhir = f"{MONTH_MAP[terakhir.month]} {terakhir.year}"
+    berurutan = (terakhir.year - sebelumnya.year) * 12 + terakhir.month - sebelumnya.month == 1
+    st.markdown("#### Perubahan Dibanding " + ("Bulan Sebelumnya" if berurutan else label_sebelumnya))
+    df_sebelumnya = df_tren[df_tren['periode'] == periode[-2]].set_index('nama_kecamatan')[kolom]
+    df_perubahan = pd.DataFrame({label_sebelumnya: df_sebelumnya, label_terakhir: df_terakhir})
+    df_perubahan['Perubahan (poin %)'] = df_perubahan[label_terakhir] - df_perubahan[label_sebelumnya]
+    df_perubahan = df_perubahan.sort_values('Perubahan (poin %)', ascending=False).rename_axis('Kecamatan')
+    st.dataframe(df_perubahan.style.format('{:.2f}', na_rep='-'), use_container_width=True, height=400)
+
+def render_tab_tabel(df_agg, indeks):
+    st.markdown("### 📋 Data Detail per Kecamatan")
+    
+    # Filter dan pencarian
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        search_term = st.text_input("🔍 Cari kecamatan:", placeholder="Ketik nama kecamatan atau puskesmas...", key='search_term')
+    with col2:
+        sort_by = st.selectbox("Urutkan berdasarkan:", list(URUTAN_TABEL), key='sort_by')
+    
+    # Filter dan urutkan lewat indeks yang sudah dibangun (tanpa scan string dan sort ulang per ketikan)
+    posisi, hasil_mirip = indeks.tampilkan(search_term, sort_by)
+    df_display = df_agg.take(posisi)
+    if hasil_mirip:
+        st.caption(f"Tidak ada nama yang memuat \"{search_term.strip()}\", menampilkan nama yang mirip.")
+    
+    # Format tabel: angka tetap numerik, format tampilan diatur per kolom
+    df_table = siapkan_tabel(df_display)
+    
+    if len(df_table) <= TABEL_STYLER_MAKS_BARIS:
+        # Tambahkan warna untuk kategori (CSS dihitung sekaligus untuk seluruh tabel)
+        st.dataframe(style_tabel(df_table), use_container_width=True, height=500)
+    else:
+        st.dataframe(tandai_kategori(df_table), use_container_width=True, height=500,
+                     column_config=KONFIGURASI_KOLOM_TABEL)
+    
+    st.markdown(f"**Menampilkan {len(df_display)} dari {len(df_agg)} kecamatan**")
+
+def buat_ringkasan(df_agg, total_ditimbang, total_stunting, total_kurang_gizi, total_wasting, avg_stunting):
+    # Nilai tetap numerik (satuan persen di label) agar bisa diekspor ke format bertipe seperti Parquet
+    summary_data = {
+        'Indikator': ['Total Balita Ditimbang', 'Total Stunting', 'Persentase Stunting Rata-rata (%)',
+                     'Total Kurang Gizi', 'Total Wasting', 'Jumlah Kecamatan'],
+        'Nilai': pd.Series([total_ditimbang, total_stunting, round(float(avg_stunting), 2),
+                           total_kurang_gizi, total_wasting, len(df_agg)], dtype=object)
+    }
+    return pd.DataFrame(summary_data)
+
+# File ekspor dibuat saat tombol diklik (data berupa callable), lalu di-cache sebagai bytes per
+# (versi dataset, tabel, format) dan dibagi ke semua sesi
+@st.cache_resource(max_entries=EKSPOR_CACHE_MAX_ENTRIES, ttl=ETL_CACHE_TTL, show_spinner=False)
+def ekspor_cached(dataset_id, nama_tabel, format_file, _buat_data, _pencatat=None):
+    # Data download dibuat di luar rerun skrip, jadi pencatat profil sesi diteruskan eksplisit
+    with tahap(f"ekspor.{nama_tabel}.{format_file}", _pencatat):
+        if format_file == "XLSX":
+            return encode_xlsx(_buat_data())
+        return FORMAT_EKSPOR[format_file][2](_buat_data())
+
+def tombol_download(label, dataset_id, nama_tabel, format_file, buat_data):
+    ekstensi, mime, _ = FORMAT_EKSPOR[format_file]
+    pencatat = profiler.aktif()
+    st.download_button(
+        label=label,
+        data=lambda: ekspor_cached(dataset_id, nama_tabel, format_file, buat_data, pencatat),
+        file_name=f"{nama_tabel}.{ekstensi}",
+        mime=mime,
+        use_container_width=True
+    )
+
+def render_tab_download(df_fact, df_wilayah, df_waktu, df_agg, dataset_id, total_ditimbang, total_stunting, total_kurang_gizi, total_wasting, avg_stunting):
+    st.markdown("### 💾 Download Hasil ETL dan Analisis")
+    
+    format_file = st.radio("Format file:", list(FORMAT_EKSPOR), horizontal=True, key='format_ekspor',
+                           help="CSV.gz dan Parquet jauh lebih kecil untuk data fakta multi-periode")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        st.markdown("#### 📊 Hasil ETL (Star Schema)")
+        st.markdown(f"Download file hasil proses ETL dalam format {format_file}:")
+        
+        # Download Fact Table
+        tombol_download("📥 Download Fact Gizi Balita", dataset_id, "fact_gizi_balita", format_file, lambda: df_fact)
+        
+        # Download Dim Wilayah
+        tombol_download("📥 Download Dimensi Wilayah", dataset_id, "dim_wilayah", format_file, lambda: df_wilayah)
+        
+        # Download Dim Waktu
+        tombol_download("📥 Download Dimensi Waktu", dataset_id, "dim_waktu", format_file, lambda: df_waktu)
+    
+    with col2:
+        st.markdown("#### 📈 Data Analisis")
+        st.markdown("Download data agregat dan analisis per kecamatan:")
+        
+        # Download Data Agregat
+        tombol_download("📥 Download Data Agregat Kecamatan", dataset_id, "data_agregat_kecamatan", format_file,
+                        lambda: df_agg)
+        
+        # Download Summary Report
+        tombol_download("📥 Download Ringkasan Statistik", dataset_id, "ringkasan_statistik", format_file,
+                        lambda: buat_ringkasan(df_agg, total_ditimbang, total_stunting, total_kurang_gizi,
+                                               total_wasting, avg_stunting))
+    
+    # Semua tabel dalam satu workbook Excel
+    pencatat = profiler.aktif()
+    st.download_button(
+        label="📥 Download Semua Tabel (XLSX multi-sheet)",
+        data=lambda: ekspor_cached(dataset_id, "semua_tabel", "XLSX", lambda: {
+            'fact_gizi_balita': df_fact,
+            'dim_wilayah': df_wilayah,
+            'dim_waktu': df_waktu,
+            'agregat_kecamatan': df_agg,
+            'ringkasan_statistik': buat_ringkasan(df_agg, total_ditimbang, total_stunting, total_kurang_gizi,
+                                                  total_wasting, avg_stunting),
+        }, pencatat),
+        file_name="hasil_etl_stunting.xlsx",
+        mime=MIME_XLSX,
+        use_container_width=True
+    )
+    
+    st.markdown("---")
+    
+    # Informasi file
+    st.markdown("#### ℹ️ Informasi File")
+    st.markdown("""
+    - **Fact Gizi Balita**: Tabel fakta berisi semua data gizi per puskesmas/kecamatan
+    - **Dimensi Wilayah**: Daftar puskesmas dan kecamatan
+    - **Dimensi Waktu**: Informasi waktu pengambilan data
+    - **Data Agregat**: Ringkasan data per kecamatan (sudah diagregasi)
+    - **Ringkasan Statistik**: Statistik umum untuk laporan
+    """)
+    
+    st.success("✅ File dibuat saat tombol diklik. CSV mudah dibuka di Excel, CSV.gz dan Parquet lebih ringkas untuk data besar!")
+
+def siapkan_widget_tab():
+    for key, default in WIDGET_TAB_DEFAULTS.items():
+        st.session_state[key] = st.session_state.get(key, default)
+
+def pilih_periode_gabungan(dataset):
+    # Dirender di sidebar: periode upload gabungan yang ditampilkan di tab selain tren (default terbaru)
+    label_periode = {int(row.id_waktu): f"{row.bulan} {row.tahun}" for row in dataset.df_waktu.itertuples()}
+    with st.sidebar:
+        return st.selectbox("Periode ditampilkan:", list(label_periode)[::-1], format_func=label_periode.get)
+
+def tampilkan_ringkasan_file(dataset):
+    with st.expander(f"📂 {len(dataset.ringkasan_file)} file diproses", expanded=not dataset.success):
+        st.dataframe(dataset.ringkasan_file, hide_index=True, use_container_width=True,
+                     column_config={'Waktu ETL (detik)': st.column_config.NumberColumn(format="%.2f")})
+
+def pilih_periode_riwayat():
+    # Dirender di sidebar: mengembalikan (id_waktu terpilih atau None, versi store)
+    versi_riwayat = history_store.versi_store()
+    dim_waktu_riwayat = muat_dim_waktu_cached(versi_riwayat)
+    if dim_waktu_riwayat.empty:
+        st.info("Belum ada data riwayat. Upload file terlebih dahulu.")
+        return None, versi_riwayat
+    label_periode = {int(row.id_waktu): f"{row.bulan} {row.tahun}" for row in dim_waktu_riwayat.itertuples()}
+    id_waktu_riwayat = st.selectbox("Pilih periode:", list(label_periode)[::-1],
+                                    format_func=label_periode.get)
+    return id_waktu_riwayat, versi_riwayat
+
+def tampilkan_dashboard(uploaded_files, id_waktu_riwayat, versi_riwayat):
+    siapkan_widget_tab()
+    st.markdown(CSS_DASHBOARD, unsafe_allow_html=True)
+    
+    if id_waktu_riwayat is not None:
+        dataset_id = f"riwayat-{id_waktu_riwayat}-{versi_riwayat}"
+        with st.spinner("🔄 Memuat data riwayat..."):
+            dataset = lampirkan_dataset(dataset_id, lambda: bangun_dataset_riwayat(dataset_id, id_waktu_riwayat))
+    else:
+        dataset_id, dataset = lampirkan_upload(uploaded_files)
+        if dataset is None:
+            return
+    
+    # Upload beberapa file: tab tren memakai semua periode, tab lain satu periode yang dipilih
+    dataset_gabungan = dataset if isinstance(dataset, DatasetGabungan) else None
+    if dataset_gabungan is not None:
+        tampilkan_ringkasan_file(dataset_gabungan)
+        if dataset_gabungan.success:
+            dataset = dataset_gabungan.periode(pilih_periode_gabungan(dataset_gabungan))
+    # id registry (statistik sesi, penanda riwayat) vs id dataset yang ditampilkan: untuk upload gabungan
+    # yang kedua adalah id tampilan periode, dipakai sebagai kunci cache figure dan ekspor
+    id_registry = dataset_id
+    dataset_id = dataset.dataset_id
+    
+    df_fact, df_wilayah, df_waktu, df_agg = dataset.df_fact, dataset.df_wilayah, dataset.df_waktu, dataset.df_agg
+    success, message, laporan_validasi = dataset.success, dataset.message, dataset.laporan
+    
+    # Dataset di memori server dipakai bersama; tampilkan berapa sesi yang memakainya
+    statistik_dataset = dataset_registry().statistik()
+    with st.sidebar:
+        st.caption(f"🖥️ {len(statistik_dataset)} dataset di memori server "
+                   f"({sum(d['byte'] for d in statistik_dataset) / 1024:,.0f} KB), "
+                   f"dataset ini dipakai {next((d['jumlah_sesi'] for d in statistik_dataset if d['dataset_id'] == id_registry), 0)} sesi")
+    
+    if uploaded_files:
+        # Simpan ke riwayat sekali per upload per sesi (upload ulang bulan yang sama menimpa partisinya)
+        if success and SIMPAN_RIWAYAT and st.session_state.get('riwayat_tersimpan') != id_registry:
+            daftar_periode = [dataset] if dataset_gabungan is None else [
+                dataset_gabungan.periode(int(id_waktu)) for id_waktu in dataset_gabungan.df_waktu['id_waktu']]
+            try:
+                with tahap('riwayat.simpan_periode'):
+                    for periode in daftar_periode:
+                        history_store.simpan_periode(periode.df_fact, periode.df_wilayah, periode.df_waktu)
+                st.session_state['riwayat_tersimpan'] = id_registry
+            except Exception as e:
+                st.warning(f"⚠️ Data tidak dapat disimpan ke riwayat: {e}")
+    
+    if success:
+        st.success(message)
+        if laporan_validasi is not None and laporan_validasi.jumlah_peringatan:
+            with st.expander(f"⚠️ {laporan_validasi.jumlah_peringatan} peringatan validasi data"):
+                tampilkan_laporan_validasi(laporan_validasi)
+        
+        fig_cache = figure_cache()
+        
+        # Ringkasan statistik dengan styling lebih baik
+        st.markdown("### 📈 Ringkasan Data")
+        col1, col2, col3, col4, col5 = st.columns(5)
+        
+        total_ditimbang = int(df_agg['jumlah_balita_ditimbang'].sum())
+        total_stunting = int(df_agg['jumlah_balita_stunting'].sum())
+        total_kurang_gizi = int(df_agg['jumlah_balita_kurang_gizi'].sum())
+        total_wasting = int(df_agg['jumlah_balita_wasting'].sum())
+        avg_stunting = df_agg['persentase_stunting'].mean()
+        
+        with col1:
+            st.metric("Total Balita Ditimbang", f"{total_ditimbang:,}", help="Jumlah total balita yang ditimbang")
+        with col2:
+            st.metric("Total Stunting", f"{total_stunting:,}", f"{avg_stunting:.1f}%", help="Jumlah dan persentase rata-rata stunting")
+        with col3:
+            st.metric("Total Kurang Gizi", f"{total_kurang_gizi:,}", help="Jumlah balita kurang gizi")
+        with col4:
+            st.metric("Total Wasting", f"{total_wasting:,}", help="Jumlah balita wasting")
+        with col5:
+            st.metric("Jumlah Kecamatan", f"{len(df_agg)}", help="Total kecamatan yang dianalisis")
+        
+        st.markdown("---")
+        
+        # Tab untuk visualisasi
+        render_tab = {
+            "🗺️ Peta Sebaran": lambda: render_tab_peta(df_agg, dataset.kubus, dataset_id, fig_cache),
+            "📊 Perbandingan Kecamatan": lambda: render_tab_perbandingan(df_agg, dataset.kubus, dataset_id, fig_cache),
+            "🎯 Distribusi & Kategori": lambda: render_tab_distribusi(df_fact, df_agg, dataset_id, fig_cache, total_ditimbang,
+                                                                   total_stunting, total_kurang_gizi, total_wasting),
+            "📈 Tren Bulanan": lambda: render_tab_tren(fig_cache, dataset_gabungan),
+            "📋 Tabel Data": lambda: render_tab_tabel(df_agg, dataset.indeks_tabel),
+            "💾 Download": lambda: render_tab_download(df_fact, df_wilayah, df_waktu, df_agg, dataset_id, total_ditimbang,
+                                                      total_stunting, total_kurang_gizi, total_wasting, avg_stunting),
+        }
+        
+        if MODE_TAB_LAZY:
+            # Hanya tab yang dipilih yang dihitung; pilihan tab disimpan di session_state
+            tab_aktif = st.radio("Tampilan:", list(render_tab), horizontal=True, key='tab_aktif',
+                                 label_visibility="collapsed")
+            st.markdown("---")
+            with tahap(f"tab.{tab_aktif}"):
+                render_tab[tab_aktif]()
+        else:
+            for tab, (nama_tab, render) in zip(st.tabs(list(render_tab)), render_tab.items()):
+                with tab, tahap(f"tab.{nama_tab}"):
+                    render()
+        
+        # Footer
+        st.markdown("---")
+        waktu_info = f"{df_waktu['tanggal'].iloc[0]} {df_waktu['bulan'].iloc[0]} {df_waktu['tahun'].iloc[0]}, Pukul {df_waktu['jam'].iloc[0]:02d}:{df_waktu['menit'].iloc[0]:02d}"
+        
+        st.markdown(f"""
+        <div style='text-align: center; padding: 2rem; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); 
+                    border-radius: 10px; color: white; margin-top: 2rem;'>
+            <h3 style='margin: 0;'>📅 Data Terakhir Diperbarui</h3>
+            <p style='font-size: 1.3rem; margin: 0.5rem 0;'><b>{waktu_info}</b></p>
+            <p style='margin: 0.5rem 0;'>Dinas Kesehatan Kabupaten Kuningan</p>
+            <p style='margin: 0; font-size: 0.9rem;'>Sistem Informasi Analisis Data Stunting</p>
+        </div>
+        """, unsafe_allow_html=True)
+    
+    else:
+        st.error(f"❌ {message}")
+        if laporan_validasi is not None and laporan_validasi.catatan:
+            st.markdown("### 🩺 Diagnostik Validasi")
+            tampilkan_laporan_validasi(laporan_validasi)
+        st.info("Pastikan file Excel memiliki format yang benar dan sheet 'STATUS GIZI' tersedia.")
+        st.markdown("""
+        ### 🔧 Tips Troubleshooting:
+        - Pastikan nama sheet adalah "STATUS GIZI"
+        - Periksa format tanggal di sel A2
+        - Pastikan data dimulai dari baris ke-6
+        - Cek apakah semua kolom tersedia
+        """)
@@ -0,0 +1,171 @@
+import threading
+import time
+from functools import cached_property
+
+import pandas as pd
+
+from cube import buat_kubus
+from profiler import tahap
+from tables import buat_indeks_tabel
+
+# Satu dataset (hasil ETL satu upload atau satu periode riwayat) yang dipakai bersama oleh semua sesi.
+# Frame tidak boleh dimodifikasi di tempat; dengan Copy-on-Write pandas, operasi di sesi mana pun
+# menghasilkan objek baru sehingga frame bersama tetap utuh. Turunan (kubus drill-down, indeks
+# pencarian) dibangun sekali saat pertama kali diminta.
+class Dataset:
+    def __init__(self, dataset_id, df_fact, df_wilayah, df_waktu, df_agg, success=True, message="", laporan=None):
+        self.dataset_id = dataset_id
+        self.df_fact = df_fact
+        self.df_wilayah = df_wilayah
+        self.df_waktu = df_waktu
+        self.df_agg = df_agg
+        self.success = success
+        self.message = message
+        self.laporan = laporan
+
+    @cached_property
+    def kubus(self):
+        with tahap('dataset.kubus'):
+            return buat_kubus(self.df_fact, self.df_wilayah)
+
+    @cached_property
+    def indeks_tabel(self):
+        with tahap('dataset.indeks_tabel'):
+            return buat_indeks_tabel(self.df_agg, self.df_wilayah)
+
+    def ukuran_byte(self):
+        frames = [self.df_fact, self.df_wilayah, self.df_waktu, self.df_agg]
+        return int(sum(df.memory_usage(deep=True).sum() for df in frames if df is not None))
+
+def _iris(df, mask):
+    # Irisan satu periode; kategori nama yang tidak muncul di periode itu dibuang
+    df = df[mask].reset_index(drop=True)
+    kolom_kategori = [kolom for kolom in df.columns if isinstance(df[kolom].dtype, pd.CategoricalDtype)]
+    return df.assign(**{kolom: df[kolom].cat.remove_unused_categories() for kolom in kolom_kategori})
+
+# Gabungan beberapa file upload (satu periode per file) sebagai satu dataset multi-periode: frame berisi
+# semua periode (id_waktu dari timestamp judul), df_agg berkolom id_waktu, df_tren untuk tab tren, dan
+# ringkasan per file (periode, baris, waktu ETL, status). Tab lain memakai tampilan satu periode yang
+# diiris dari frame gabungan saat pertama diminta, jadi kubus/indeksnya juga dibangun sekali per periode.
+class DatasetGabungan(Dataset):
+    def __init__(self, dataset_id, df_fact, df_wilayah, df_waktu, df_agg, df_tren, ringkasan_file,
+                 success=True, message=""):
+        super().__init__(dataset_id, df_fact, df_wilayah, df_waktu, df_agg, success, message)
+        self.df_tren = df_tren
+        self.ringkasan_file = ringkasan_file
+        self._periode = {}
+        self._lock = threading.Lock()
+
+    def periode(self, id_waktu):
+        with self._lock:
+            dataset = self._periode.get(id_waktu)
+            if dataset is None:
+                df_fact = _iris(self.df_fact, self.df_fact['id_waktu'] == id_waktu)
+                df_wilayah = _iris(self.df_wilayah, self.df_wilayah['id_wilayah'].isin(df_fact['id_wilayah'].unique()))
+                df_waktu = self.df_waktu[self.df_waktu['id_waktu'] == id_waktu].reset_index(drop=True)
+                df_agg = _iris(self.df_agg, self.df_agg['id_waktu'] == id_waktu).drop(columns='id_waktu')
+                dataset = Dataset(f"{self.dataset_id}-{id_waktu}", df_fact, df_wilayah, df_waktu, df_agg,
+                                  True, self.message)
+                self._periode[id_waktu] = dataset
+            return dataset
+
+    def ukuran_byte(self):
+        with self._lock:
+            tampilan = list(self._periode.values())
+        return super().ukuran_byte() + sum(dataset.ukuran_byte() for dataset in tampilan)
+
+class _Entri:
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self.sesi = {}  # sesi_id -> waktu terakhir sesi memakai dataset (lease)
+        self.idle_sejak = None
+
+# Registry dataset untuk seluruh proses: sesi menempel ke dataset berdasarkan dataset_id, jadi memori
+# bertambah menurut jumlah dataset berbeda, bukan jumlah pengguna. Jumlah referensi = jumlah sesi
+# dengan lease aktif. Streamlit tidak memberi kabar saat sesi ditutup, jadi lease yang tidak
+# diperbarui selama lease_ttl detik dianggap lepas. Dataset tanpa sesi disimpan sebentar (paling
+# banyak maks_idle, paling lama lease_ttl) agar upload ulang file yang sama tetap instan.
+class DatasetRegistry:
+    def __init__(self, lease_ttl=3600, maks_idle=16):
+        self.lease_ttl = lease_ttl
+        self.maks_idle = maks_idle
+        self._entri = {}
+        self._lock = threading.Lock()
+        self._lock_bangun = {}
+        self.dibangun = 0
+
+    def lampirkan(self, dataset_id, sesi_id, pembuat):
+        sekarang = time.monotonic()
+        with self._lock:
+            self._bersihkan(sekarang)
+            dataset = self._tempel(dataset_id, sesi_id, sekarang)
+            if dataset is not None:
+                return dataset
+            lock_bangun = self._lock_bangun.setdefault(dataset_id, threading.Lock())
+
+        # Dibangun di luar lock registry; sesi lain yang meminta dataset yang sama menunggu di lock_bangun
+        with lock_bangun:
+            with self._lock:
+                dataset = self._tempel(dataset_id, sesi_id, sekarang)
+            if dataset is not None:
+                return dataset
+            try:
+                dataset = pembuat()
+                with self._lock:
+                    self.dibangun += 1
+                    # Dataset gagal (success=False) tidak disimpan: pesan errornya dikembalikan ke sesi ini
+                    # saja dan permintaan berikutnya membangun ulang (mis. setelah file diperbaiki)
+                    if dataset.success:
+                        entri = _Entri(dataset)
+                        entri.sesi[sesi_id] = sekarang
+                        self._entri[dataset_id] = entri
+            finally:
+                # Juga saat pembuat melempar exception, agar lock per id tidak tertinggal
+                with self._lock:
+                    self._lock_bangun.pop(dataset_id, None)
+            return dataset
+
+    def _tempel(self, dataset_id, sesi_id, sekarang):
+        entri = self._entri.get(dataset_id)
+        if entri is None:
+            return None
+        entri.sesi[sesi_id] = sekarang
+        entri.idle_sejak = None
+        return entri.dataset
+
+    def ada(self, dataset_id):
+        # Cek tanpa menempel/membangun (dipakai sebelum mengirim ETL ke thread latar)
+        with self._lock:
+            return dataset_id in self._entri
+
+    def lepas(self, dataset_id, sesi_id):
+        with self._lock:
+            entri = self._entri.get(dataset_id)
+            if entri is not None and entri.sesi.pop(sesi_id, None) is not None and not entri.sesi:
+                entri.idle_sejak = time.monotonic()
+
+    def _bersihkan(self, sekarang):
+        idle = []
+        for dataset_id, entri in list(self._entri.items()):
+            for sesi_id, terakhir in list(entri.sesi.items()):
+                if sekarang - terakhir > self.lease_ttl:
+                    del entri.sesi[sesi_id]
+            if not entri.sesi:
+                entri.idle_sejak = entri.idle_sejak or sekarang
+                if sekarang - entri.idle_sejak > self.lease_ttl:
+                    del self._entri[dataset_id]
+                else:
+                    idle.append((entri.idle_sejak, dataset_id))
+        # Dataset idle paling lama dibuang lebih dulu
+        for _, dataset_id in sorted(idle)[:max(0, len(idle) - self.maks_idle)]:
+            del self._entri[dataset_id]
+
+    def statistik(self):
+        with self._lock:
+            return [
+                {'dataset_id': dataset_id, 'jumlah_sesi': len(entri.sesi), 'byte': entri.dataset.ukuran_byte()}
+                for dataset_id, entri in self._entri.items()
+            ]
+
+    def __len__(self):
+        return len(self._entri)
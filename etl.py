@@ -0,0 +1,531 @@
+import pandas as pd
+import numpy as np
+import re
+from collections import Counter
+from openpyxl import load_workbook
+
+from profiler import tahap
+
+# Tata letak sheet "STATUS GIZI": judul (timestamp) di sel A2, data mulai baris ke-6,
+# baris terakhir berisi total (footer) sehingga dibuang
+SHEET_STATUS_GIZI = "STATUS GIZI"
+BARIS_JUDUL = 2
+BARIS_AWAL_DATA = 6
+
+GIZI_COLUMN_NAMES = [
+    'No', 'Puskesmas', 'KECMATAN',
+    'BB/U Sangat Kurang', 'BB/U Kurang', 'BB/U Normal', 'BB/U Risiko Lebih', 'BB/U Outlier',
+    'TB/U Sangat Pendek', 'TB/U Pendek', 'TB/U Normal', 'TB/U Tinggi', 'TB/U Outlier',
+    'BB/TB Gizi Buruk', 'BB/TB Gizi Kurang', 'BB/TB Normal', 'BB/TB Risiko Gizi Lebih',
+    'BB/TB Gizi Lebih', 'BB/TB Obesitas', 'BB/TB Outlier'
+]
+
+MONTH_MAP = {
+    1: 'JANUARI', 2: 'FEBRUARI', 3: 'MARET', 4: 'APRIL', 5: 'MEI', 6: 'JUNI',
+    7: 'JULI', 8: 'AGUSTUS', 9: 'SEPTEMBER', 10: 'OKTOBER', 11: 'NOVEMBER', 12: 'DESEMBER'
+}
+BULAN_ANGKA = {nama: angka for angka, nama in MONTH_MAP.items()}
+
+# Data koordinat kecamatan
+KOORDINAT_KECAMATAN = {
+    'CIAWIGEBANG': {'lat': -6.94139, 'lon': 108.58000},
+    'CIBEUREUM': {'lat': -7.0542423389, 'lon': 108.7335485111},
+    'CIBINGBIN': {'lat': -7.0620274806, 'lon': 108.7574305306},
+    'CIDAHU': {'lat': -6.9807440111, 'lon': 108.6430066694},
+    'CIGANDAMEKAR': {'lat': -6.8816537806, 'lon': 108.5276942889},
+    'CIGUGUR': {'lat': -6.96667, 'lon': 108.43306},
+    'CILEBAK': {'lat': -7.1364884306, 'lon': 108.5866935611},
+    'CILIMUS': {'lat': -6.8671659, 'lon': 108.5023500111},
+    'CIMAHI': {'lat': -6.98692555, 'lon': 108.6930708306},
+    'CINIRU': {'lat': -7.0426375806, 'lon': 108.4998609806},
+    'CIPICUNG': {'lat': -6.9423001194, 'lon': 108.5367464806},
+    'CIWARU': {'lat': -7.09250, 'lon': 108.65167},
+    'DARMA': {'lat': -7.02667, 'lon': 108.40444},
+    'GARAWANGI': {'lat': -6.99527306, 'lon': 108.55040389},
+    'HANTARA': {'lat': -7.0586109889, 'lon': 108.4594966806},
+    'JALAKSANA': {'lat': -6.90333, 'lon': 108.48417},
+    'JAPARA': {'lat': -6.8962436111, 'lon': 108.519557},
+    'KADUGEDE': {'lat': -6.99968035, 'lon': 108.4568345306},
+    'KALIMANGGIS': {'lat': -6.9614633389, 'lon': 108.6121274},
+    'KARANGKANCANA': {'lat': -7.0957940806, 'lon': 108.6601490194},
+    'KRAMATMULYA': {'lat': -6.94250, 'lon': 108.49389},
+    'KUNINGAN': {'lat': -6.9766048, 'lon': 108.4849021},
+    'LEBAKWANGI': {'lat': -7.04083, 'lon': 108.57361},
+    'LURAGUNG': {'lat': -7.0186099306, 'lon': 108.6376317611},
+    'MALEBER': {'lat': -7.0286144194, 'lon': 108.5728650306},
+    'MANDIRANCAN': {'lat': -6.8094092889, 'lon': 108.4686848694},
+    'NUSAHERANG': {'lat': -7.0053324806, 'lon': 108.4415909889},
+    'PANCALANG': {'lat': -6.82113125, 'lon': 108.4878855611},
+    'PASAWAHAN': {'lat': -6.80722, 'lon': 108.42917},
+    'SELAJAMBE': {'lat': -7.10417, 'lon': 108.47111},
+    'SINDANGAGUNG': {'lat': -6.9782077611, 'lon': 108.5416392389},
+    'SUBANG': {'lat': -7.13139, 'lon': 108.55917}
+}
+
+# Dimensi koordinat terindeks untuk join vektor; bisa diganti/ditambah dengan dimensi
+# puskesmas atau desa selama indeksnya berisi nama wilayah (huruf besar) dan kolom lat/lon
+DIM_KOORDINAT_KECAMATAN = pd.DataFrame.from_dict(KOORDINAT_KECAMATAN, orient='index')[['lat', 'lon']]
+DIM_KOORDINAT_KECAMATAN.index.name = 'nama_kecamatan'
+
+# Kategori keparahan stunting per kecamatan (batas dalam persen)
+KATEGORI_STUNTING = ['Rendah (<5%)', 'Sedang (5-10%)', 'Tinggi (10-20%)', 'Sangat Tinggi (>20%)']
+BATAS_KATEGORI_STUNTING = [0, 5, 10, 20, 100]
+
+# Fungsi ETL
+def clean_puskesmas_name(puskesmas_str):
+    if isinstance(puskesmas_str, str):
+        cleaned = re.sub(r'^\d+\.\s*', '', puskesmas_str)
+        return cleaned.strip().upper()
+    return puskesmas_str
+
+def normalisasi_nama_kecamatan(nama):
+    # Bentuk kanonik nama kecamatan (kunci KOORDINAT_KECAMATAN): dipakai validasi dan disimpan di
+    # fakta/dim wilayah, jadi ' cigugur ' dan 'CIGUGUR' adalah kecamatan yang sama
+    return str(nama).strip().upper()
+
+def safe_to_numeric(series):
+    return pd.to_numeric(series, errors='coerce').fillna(0)
+
+def clean_db_column_name(col_name):
+    name = str(col_name).lower()
+    name = name.replace('/', '_per_')
+    name = name.replace('%', 'persen')
+    name = re.sub(r'[\s\(\)-]', '_', name)
+    name = re.sub(r'_+', '_', name)
+    name = name.strip('_')
+    return name
+
+def buka_status_gizi(sumber):
+    # Membuka workbook satu kali (read-only, streaming) dan mengembalikan isi sel judul
+    # beserta iterator baris data (nomor_baris, nilai). Workbook ditutup saat iterator habis.
+    wb = load_workbook(sumber, read_only=True, data_only=True, keep_links=False)
+    try:
+        ws = wb[SHEET_STATUS_GIZI]
+        ws.reset_dimensions()
+        rows = ws.iter_rows(values_only=True)
+
+        judul = None
+        for nomor in range(1, BARIS_AWAL_DATA):
+            row = next(rows, None)
+            if row is None:
+                break
+            if nomor == BARIS_JUDUL and len(row) > 0:
+                judul = row[0]
+    except Exception:
+        wb.close()
+        raise
+
+    def iter_data():
+        try:
+            # Lookahead satu baris agar baris footer (terakhir) tidak ikut
+            sebelumnya = None
+            for nomor, row in enumerate(rows, start=BARIS_AWAL_DATA):
+                if all(v is None or v == '' for v in row):
+                    continue
+                if sebelumnya is not None:
+                    yield sebelumnya
+                sebelumnya = (nomor, row)
+        finally:
+            wb.close()
+
+    return judul, iter_data()
+
+def parse_waktu_judul(title_string):
+    match = re.search(r'(\d{4})-(\d{2})-(\d{2})\s+(\d{2}):(\d{2}):(\d{2})', str(title_string))
+
+    if match:
+        tahun_report = int(match.group(1))
+        bulan_int = int(match.group(2))
+        tanggal_report = int(match.group(3))
+        jam_report = int(match.group(4))
+        menit_report = int(match.group(5))
+        bulan_report = MONTH_MAP.get(bulan_int, 'TIDAK DIKETAHUI')
+    else:
+        tahun_report, bulan_report, tanggal_report = 2025, 'TIDAK DIKETAHUI', 1
+        jam_report, menit_report = 0, 0
+
+    return tahun_report, bulan_report, tanggal_report, jam_report, menit_report
+
+def parse_timestamp_judul(title_string):
+    # Timestamp lengkap dari judul (sel A2), dipakai sebagai kunci deduplikasi file
+    match = re.search(r'(\d{4})-(\d{2})-(\d{2})\s+(\d{2}):(\d{2}):(\d{2})', str(title_string))
+    return match.group(0) if match else None
+
+# Validasi streaming: setiap baris diperiksa saat dibaca, masalah dicatat per baris/kolom dalam laporan
+# ringkas (tanpa menyimpan salinan baris yang bermasalah). Masalah tingkat error membuat file ditolak
+# sebelum transformasi dijalankan; setelah MAKS_ERROR_VALIDASI error pembacaan dihentikan.
+TINGKAT_ERROR = 'error'
+TINGKAT_PERINGATAN = 'peringatan'
+KODE_MASALAH = {
+    'JUDUL_TANPA_TANGGAL': (TINGKAT_ERROR, "Sel A2 tidak berisi tanggal data yang valid (YYYY-MM-DD HH:MM:SS)"),
+    'DATA_KOSONG': (TINGKAT_ERROR, "Tidak ada baris data di sheet STATUS GIZI"),
+    'KOLOM_KURANG': (TINGKAT_ERROR, "Jumlah kolom kurang dari format STATUS GIZI"),
+    'BUKAN_ANGKA': (TINGKAT_ERROR, "Nilai jumlah balita bukan angka"),
+    'ANGKA_NEGATIF': (TINGKAT_ERROR, "Nilai jumlah balita negatif"),
+    'BUKAN_BILANGAN_BULAT': (TINGKAT_ERROR, "Nilai jumlah balita bukan bilangan bulat"),
+    'PUSKESMAS_KOSONG': (TINGKAT_ERROR, "Nama puskesmas kosong"),
+    'KECAMATAN_KOSONG': (TINGKAT_ERROR, "Nama kecamatan kosong"),
+    'PUSKESMAS_DUPLIKAT': (TINGKAT_ERROR, "Puskesmas yang sama muncul lebih dari sekali"),
+    'KOLOM_LEBIH': (TINGKAT_PERINGATAN, "Ada isi di luar kolom format STATUS GIZI (diabaikan)"),
+    'TOTAL_TIDAK_COCOK': (TINGKAT_PERINGATAN, "Jumlah sub-kategori tidak sama dengan jumlah balita ditimbang (BB/U)"),
+    'DITIMBANG_NOL': (TINGKAT_PERINGATAN, "Jumlah balita ditimbang 0, persentase dihitung 0"),
+    'KECAMATAN_TIDAK_DIKENAL': (TINGKAT_PERINGATAN, "Kecamatan tidak ada di daftar koordinat (tidak tampil di peta)"),
+}
+MAKS_CATATAN_PER_KODE = 20
+MAKS_ERROR_VALIDASI = 50
+
+# Posisi sub-kategori di antara kolom angka (GIZI_COLUMN_NAMES[3:]): BB/U (= ditimbang), TB/U, BB/TB
+KOLOM_BB_U = slice(0, 5)
+KOLOM_TB_U = slice(5, 10)
+KOLOM_BB_TB = slice(10, 17)
+
+class LaporanValidasi:
+    def __init__(self):
+        self.catatan = []
+        self.jumlah = Counter()
+        self.baris_diperiksa = 0
+        self.dihentikan = False
+
+    def catat(self, baris, kolom, kode, nilai=None):
+        # Semua masalah dihitung, tetapi detail yang disimpan dibatasi per kode
+        self.jumlah[kode] += 1
+        if self.jumlah[kode] <= MAKS_CATATAN_PER_KODE:
+            self.catatan.append((baris, kolom, kode, None if nilai is None else str(nilai)))
+
+    @property
+    def jumlah_error(self):
+        return sum(n for kode, n in self.jumlah.items() if KODE_MASALAH[kode][0] == TINGKAT_ERROR)
+
+    @property
+    def jumlah_peringatan(self):
+        return sum(n for kode, n in self.jumlah.items() if KODE_MASALAH[kode][0] == TINGKAT_PERINGATAN)
+
+    @property
+    def ditolak(self):
+        return self.jumlah_error > 0
+
+    def ringkasan(self):
+        rincian = ", ".join(f"{kode} x{n}" for kode, n in self.jumlah.most_common())
+        teks = (f"{self.jumlah_error} error, {self.jumlah_peringatan} peringatan "
+                f"dari {self.baris_diperiksa} baris diperiksa")
+        if self.dihentikan:
+            teks += f" (dihentikan setelah {MAKS_ERROR_VALIDASI} error)"
+        return f"{teks}: {rincian}" if rincian else teks
+
+    def ke_dataframe(self):
+        df = pd.DataFrame(self.catatan, columns=['baris', 'kolom', 'kode', 'nilai'])
+        df.insert(3, 'tingkat', df['kode'].map(lambda kode: KODE_MASALAH[kode][0]))
+        df.insert(4, 'keterangan', df['kode'].map(lambda kode: KODE_MASALAH[kode][1]))
+        return df
+
+class ValidasiGagal(ValueError):
+    def __init__(self, laporan):
+        super().__init__(f"Validasi gagal - {laporan.ringkasan()}")
+        self.laporan = laporan
+
+def _nilai_jumlah(nilai):
+    # Sel kosong dihitung 0 (sama seperti safe_to_numeric); None jika bukan angka
+    if nilai is None or nilai == '':
+        return 0
+    if isinstance(nilai, (int, float)):
+        return nilai
+    try:
+        return float(nilai)
+    except (TypeError, ValueError):
+        return None
+
+def periksa_judul(title_cell, laporan):
+    # Bulan juga harus valid: bulan menentukan id_waktu periode (kunci_periode)
+    if parse_timestamp_judul(title_cell) is None or parse_waktu_judul(title_cell)[1] not in BULAN_ANGKA:
+        laporan.catat(BARIS_JUDUL, 'A', 'JUDUL_TANPA_TANGGAL', title_cell)
+
+def periksa_baris(baris_data, laporan):
+    # Generator: meneruskan baris (nomor_baris, nilai) apa adanya sambil mencatat masalahnya
+    n_kolom = len(GIZI_COLUMN_NAMES)
+    terlihat = {}
+    for nomor, row in baris_data:
+        laporan.baris_diperiksa += 1
+
+        if len(row) < n_kolom:
+            laporan.catat(nomor, None, 'KOLOM_KURANG', f"{len(row)} dari {n_kolom} kolom")
+        elif any(v is not None and v != '' for v in row[n_kolom:]):
+            laporan.catat(nomor, None, 'KOLOM_LEBIH')
+
+        puskesmas = clean_puskesmas_name(row[1]) if len(row) > 1 else None
+        kecamatan_asli = row[2] if len(row) > 2 else None
+        kecamatan = normalisasi_nama_kecamatan(kecamatan_asli) if kecamatan_asli is not None else None
+        if not puskesmas:
+            laporan.catat(nomor, 'Puskesmas', 'PUSKESMAS_KOSONG')
+        if not kecamatan:
+            laporan.catat(nomor, 'KECMATAN', 'KECAMATAN_KOSONG')
+        elif kecamatan not in KOORDINAT_KECAMATAN:
+            laporan.catat(nomor, 'KECMATAN', 'KECAMATAN_TIDAK_DIKENAL', kecamatan_asli)
+        if puskesmas and kecamatan:
+            kunci = (puskesmas, kecamatan)
+            if kunci in terlihat:
+                laporan.catat(nomor, 'Puskesmas', 'PUSKESMAS_DUPLIKAT', f"{puskesmas} (juga di baris {terlihat[kunci]})")
+            else:
+                terlihat[kunci] = nomor
+
+        angka = []
+        for kolom, nilai in zip(GIZI_COLUMN_NAMES[3:], row[3:n_kolom]):
+            jumlah = _nilai_jumlah(nilai)
+            if jumlah is None:
+                laporan.catat(nomor, kolom, 'BUKAN_ANGKA', nilai)
+                jumlah = 0
+            elif jumlah < 0:
+                laporan.catat(nomor, kolom, 'ANGKA_NEGATIF', nilai)
+            elif jumlah % 1:
+                laporan.catat(nomor, kolom, 'BUKAN_BILANGAN_BULAT', nilai)
+            angka.append(jumlah)
+
+        if len(angka) == n_kolom - 3:
+            ditimbang = sum(angka[KOLOM_BB_U])
+            if ditimbang == 0:
+                laporan.catat(nomor, 'BB/U', 'DITIMBANG_NOL')
+            for label, kolom_sub in (('TB/U', KOLOM_TB_U), ('BB/TB', KOLOM_BB_TB)):
+                total = sum(angka[kolom_sub])
+                if total != ditimbang:
+                    laporan.catat(nomor, label, 'TOTAL_TIDAK_COCOK', f"{total:g} vs {ditimbang:g}")
+
+        if laporan.jumlah_error >= MAKS_ERROR_VALIDASI:
+            laporan.dihentikan = True
+            return
+        yield nomor, row
+
+def validasi_status_gizi(title_cell, baris_data, laporan=None):
+    # Tahap validasi: membaca semua baris (streaming) dan menolak file sebelum transformasi.
+    # Mengembalikan daftar baris yang siap ditransformasi.
+    laporan = LaporanValidasi() if laporan is None else laporan
+    periksa_judul(title_cell, laporan)
+    baris_valid = list(periksa_baris(baris_data, laporan))
+    if laporan.dihentikan and hasattr(baris_data, 'close'):
+        # Sisa baris tidak dibaca; tutup iterator agar workbook langsung dilepas
+        baris_data.close()
+    if not baris_valid and not laporan.dihentikan:
+        laporan.catat(BARIS_AWAL_DATA, None, 'DATA_KOSONG')
+    if laporan.ditolak:
+        raise ValidasiGagal(laporan)
+    return baris_valid
+
+def transformasi_status_gizi(title_cell, baris_data):
+    # Transformasi inti ETL: judul + baris data sheet STATUS GIZI -> (fakta, dim wilayah, dim waktu)
+    title_string = str(title_cell)
+
+    tahun_report, bulan_report, tanggal_report, jam_report, menit_report = parse_waktu_judul(title_string)
+
+    df_gizi_raw = pd.DataFrame([row for _, row in baris_data])
+    gizi_column_names = GIZI_COLUMN_NAMES
+
+    if len(df_gizi_raw.columns) > len(gizi_column_names):
+        df_gizi_raw = df_gizi_raw.iloc[:, :len(gizi_column_names)]
+    elif len(df_gizi_raw.columns) < len(gizi_column_names):
+        missing_cols = len(gizi_column_names) - len(df_gizi_raw.columns)
+        for i in range(missing_cols):
+            df_gizi_raw[f'missing_{i}'] = np.nan
+
+    df_gizi_raw.columns = gizi_column_names
+
+    df_waktu = pd.DataFrame({
+        'tahun': [tahun_report],
+        'bulan': [bulan_report],
+        'tanggal': [tanggal_report],
+        'jam': [jam_report],
+        'menit': [menit_report]
+    })
+    id_waktu = kunci_periode(df_waktu)
+    df_waktu.insert(0, 'id_waktu', id_waktu)
+
+    df_gizi_raw['Puskesmas_clean'] = df_gizi_raw['Puskesmas'].apply(clean_puskesmas_name)
+    df_gizi_raw['KECMATAN'] = df_gizi_raw['KECMATAN'].map(normalisasi_nama_kecamatan, na_action='ignore')
+    df_wilayah = df_gizi_raw[['Puskesmas_clean', 'KECMATAN']].drop_duplicates().reset_index(drop=True)
+    df_wilayah = df_wilayah.rename(columns={'Puskesmas_clean': 'nama_puskesmas', 'KECMATAN': 'nama_kecamatan'})
+    df_wilayah.insert(0, 'id_wilayah', range(1, 1 + len(df_wilayah)))
+
+    df_fact = df_gizi_raw.copy()
+    raw_gizi_cols = gizi_column_names[3:]
+
+    for col in raw_gizi_cols:
+        df_fact[col] = safe_to_numeric(df_fact[col])
+
+    cols_ditimbang = ['BB/U Sangat Kurang', 'BB/U Kurang', 'BB/U Normal', 'BB/U Risiko Lebih', 'BB/U Outlier']
+    df_fact['jumlah_balita_ditimbang'] = df_fact[cols_ditimbang].sum(axis=1)
+
+    cols_kurang_gizi = ['BB/U Sangat Kurang', 'BB/U Kurang']
+    df_fact['jumlah_balita_kurang_gizi'] = df_fact[cols_kurang_gizi].sum(axis=1)
+
+    cols_stunting = ['TB/U Sangat Pendek', 'TB/U Pendek']
+    df_fact['jumlah_balita_stunting'] = df_fact[cols_stunting].sum(axis=1)
+
+    cols_wasting = ['BB/TB Gizi Buruk', 'BB/TB Gizi Kurang']
+    df_fact['jumlah_balita_wasting'] = df_fact[cols_wasting].sum(axis=1)
+
+    pembagi_d = df_fact['jumlah_balita_ditimbang']
+    df_fact['persentase_kurang_gizi'] = (df_fact['jumlah_balita_kurang_gizi'] / pembagi_d * 100).replace([np.inf, -np.inf], 0).fillna(0)
+    df_fact['persentase_stunting'] = (df_fact['jumlah_balita_stunting'] / pembagi_d * 100).replace([np.inf, -np.inf], 0).fillna(0)
+    df_fact['persentase_wasting'] = (df_fact['jumlah_balita_wasting'] / pembagi_d * 100).replace([np.inf, -np.inf], 0).fillna(0)
+
+    df_fact = pd.merge(df_fact, df_wilayah, left_on=['Puskesmas_clean', 'KECMATAN'],
+                      right_on=['nama_puskesmas', 'nama_kecamatan'])
+    df_fact['id_waktu'] = id_waktu
+
+    key_cols = ['id_wilayah', 'nama_kecamatan', 'id_waktu']
+    calc_cols = ['jumlah_balita_ditimbang', 'jumlah_balita_kurang_gizi', 'persentase_kurang_gizi',
+                 'jumlah_balita_stunting', 'persentase_stunting', 'jumlah_balita_wasting', 'persentase_wasting']
+
+    final_fact_columns = key_cols + calc_cols + raw_gizi_cols
+    df_fact_final = df_fact[final_fact_columns]
+    df_fact_final.columns = [clean_db_column_name(col) for col in df_fact_final.columns]
+
+    return (terapkan_skema(df_fact_final, SKEMA_FAKTA), terapkan_skema(df_wilayah, SKEMA_WILAYAH),
+            terapkan_skema(df_waktu, SKEMA_WAKTU))
+
+def proses_etl(uploaded_file, laporan=None, progres=None):
+    # laporan (LaporanValidasi) opsional, diisi hasil validasi untuk ditampilkan pemanggil.
+    # progres(nama_tahap) opsional, dipanggil setiap kali tahap berikutnya dimulai (ETL di thread latar);
+    # jumlah baris yang sudah dibaca ada di laporan.baris_diperiksa
+    progres = progres or (lambda nama_tahap: None)
+    try:
+        progres('buka_workbook')
+        with tahap('etl.buka_workbook'):
+            title_cell, baris_data = buka_status_gizi(uploaded_file)
+        # Baris data dibaca dari workbook (streaming) selama validasi
+        progres('baca_validasi_baris')
+        with tahap('etl.baca_validasi_baris'):
+            baris_valid = validasi_status_gizi(title_cell, baris_data, laporan)
+        progres('transformasi')
+        with tahap('etl.transformasi'):
+            df_fact_final, df_wilayah, df_waktu = transformasi_status_gizi(title_cell, baris_valid)
+        return df_fact_final, df_wilayah, df_waktu, True, "Proses ETL berhasil!"
+
+    except Exception as e:
+        return None, None, None, False, f"Error: {str(e)}"
+
+def gabung_koordinat(df, kolom_nama='nama_kecamatan', dim_koordinat=DIM_KOORDINAT_KECAMATAN):
+    # Join koordinat dalam satu operasi vektor, langsung pada nama yang tersimpan (sudah kanonik sejak
+    # transformasi). Nama yang tidak ada di dimensi mendapat lat/lon NaN (tidak diplot) alih-alih (0, 0);
+    # daftarnya diambil dengan wilayah_tanpa_koordinat.
+    koordinat = dim_koordinat.reindex(df[kolom_nama].astype(str).to_numpy())
+    return df.assign(lat=koordinat['lat'].to_numpy(), lon=koordinat['lon'].to_numpy())
+
+def wilayah_tanpa_koordinat(df, kolom_nama='nama_kecamatan'):
+    return sorted(df.loc[df['lat'].isna(), kolom_nama].astype(str).unique())
+
+# Kolom jumlah yang dijumlahkan pada setiap level agregasi (puskesmas, kecamatan, kabupaten)
+KOLOM_JUMLAH_AGREGAT = [
+    'jumlah_balita_ditimbang',
+    'jumlah_balita_stunting',
+    'jumlah_balita_kurang_gizi',
+    'jumlah_balita_wasting'
+]
+KOLOM_PERSENTASE = ['persentase_stunting', 'persentase_kurang_gizi', 'persentase_wasting']
+
+# Skema tipe data ringkas, diterapkan saat ingestion dan saat membaca riwayat.
+# Jumlah balita per puskesmas per bulan muat di uint16; kolom yang nilainya lebih besar dinaikkan
+# otomatis ke tipe unsigned berikutnya (tidak pernah dipotong). Agregat memakai uint32, begitu juga
+# id_waktu (kunci periode YYYYMM, lihat kunci_periode).
+KOLOM_GIZI_DB = [clean_db_column_name(kolom) for kolom in GIZI_COLUMN_NAMES[3:]]
+SKEMA_FAKTA = {
+    'id_wilayah': 'uint32',
+    'nama_kecamatan': 'category',
+    'id_waktu': 'uint32',
+    **{kolom: 'uint16' for kolom in KOLOM_JUMLAH_AGREGAT + KOLOM_GIZI_DB},
+    **{kolom: 'float32' for kolom in KOLOM_PERSENTASE},
+}
+SKEMA_WILAYAH = {'id_wilayah': 'uint32', 'nama_puskesmas': 'category', 'nama_kecamatan': 'category'}
+SKEMA_WAKTU = {'id_waktu': 'uint32', 'tahun': 'uint16', 'tanggal': 'uint8', 'jam': 'uint8', 'menit': 'uint8'}
+SKEMA_AGREGAT = {
+    'nama_kecamatan': 'category',
+    'id_waktu': 'uint32',
+    **{kolom: 'uint32' for kolom in KOLOM_JUMLAH_AGREGAT},
+    **{kolom: 'float32' for kolom in KOLOM_PERSENTASE + ['lat', 'lon']},
+}
+
+def _tipe_unsigned(series, tipe):
+    # Tipe unsigned terkecil mulai dari `tipe` yang memuat nilai maksimum kolom.
+    # Kolom dengan nilai negatif/NaN/pecahan dibiarkan (tidak dipaksa ke unsigned, yang memotong pecahan).
+    if len(series) == 0:
+        return tipe
+    if series.isna().any() or series.min() < 0:
+        return None
+    if series.dtype.kind == 'f' and not (series % 1 == 0).all():
+        return None
+    maksimum = series.max()
+    for kandidat in ('uint8', 'uint16', 'uint32', 'uint64'):
+        if np.dtype(kandidat).itemsize >= np.dtype(tipe).itemsize and maksimum <= np.iinfo(kandidat).max:
+            return kandidat
+    return None
+
+def terapkan_skema(df, skema):
+    tipe = {}
+    for kolom, tipe_kolom in skema.items():
+        if kolom not in df.columns:
+            continue
+        if tipe_kolom.startswith('uint'):
+            tipe_kolom = _tipe_unsigned(df[kolom], tipe_kolom)
+            if tipe_kolom is None:
+                continue
+        if df[kolom].dtype != tipe_kolom:
+            tipe[kolom] = tipe_kolom
+    return df.astype(tipe) if tipe else df
+
+def hitung_persentase(df_agg):
+    # Persentase dihitung ulang dari jumlah pada level agregat (bukan rata-rata persentase baris)
+    df_agg['persentase_stunting'] = (df_agg['jumlah_balita_stunting'] / df_agg['jumlah_balita_ditimbang'] * 100).fillna(0)
+    df_agg['persentase_kurang_gizi'] = (df_agg['jumlah_balita_kurang_gizi'] / df_agg['jumlah_balita_ditimbang'] * 100).fillna(0)
+    df_agg['persentase_wasting'] = (df_agg['jumlah_balita_wasting'] / df_agg['jumlah_balita_ditimbang'] * 100).fillna(0)
+    return df_agg
+
+def agregasi_kecamatan(df_fact):
+    # Agregat per kecamatan (jumlah, persentase, koordinat, kategori) untuk satu periode
+    with tahap('etl.agregasi_kecamatan'):
+        return lengkapi_agregat(df_fact.groupby('nama_kecamatan')[KOLOM_JUMLAH_AGREGAT].sum().reset_index())
+
+def lengkapi_agregat(df_agg):
+    # Jumlah per kecamatan (dari groupby pandas atau GROUP BY di database) -> frame agregat lengkap
+    hitung_persentase(df_agg)
+
+    # Tambahkan koordinat
+    df_agg = gabung_koordinat(df_agg)
+
+    # Kategorisasi kecamatan berdasarkan persentase stunting
+    df_agg['kategori'] = pd.cut(
+        df_agg['persentase_stunting'],
+        bins=BATAS_KATEGORI_STUNTING,
+        labels=KATEGORI_STUNTING
+    )
+    return terapkan_skema(df_agg, SKEMA_AGREGAT)
+
+def kunci_periode(df_waktu):
+    # id_waktu satu-satunya untuk sebuah periode, diturunkan dari timestamp judul (YYYYMM): dipakai dataset
+    # upload, gabungan beberapa upload, dan history store, jadi periode yang sama selalu ber-id sama.
+    # Urutan id sama dengan urutan kronologis dan tidak bergantung pada urutan file
+    baris = df_waktu.iloc[0]
+    if baris['bulan'] not in BULAN_ANGKA:
+        raise ValueError(f"Bulan periode tidak dikenal: {baris['bulan']}")
+    return int(baris['tahun']) * 100 + BULAN_ANGKA[baris['bulan']]
+
+def gabung_periode(daftar_hasil):
+    # Hasil ETL beberapa file [(fakta, dim wilayah, dim waktu, agregat)], satu periode per file
+    # -> satu star schema multi-periode. id_wilayah disatukan per (puskesmas, kecamatan),
+    # agregat kecamatan tiap periode diberi kolom id_waktu.
+    kunci = ['nama_puskesmas', 'nama_kecamatan']
+    df_wilayah = (pd.concat([wilayah[kunci].astype(str) for _, wilayah, _, _ in daftar_hasil], ignore_index=True)
+                  .drop_duplicates().reset_index(drop=True))
+    df_wilayah.insert(0, 'id_wilayah', range(1, 1 + len(df_wilayah)))
+
+    daftar_fakta, daftar_waktu, daftar_agg = [], [], []
+    for df_fact, wilayah, df_waktu, df_agg in daftar_hasil:
+        # Fakta dan dim waktu setiap file sudah ber-id_waktu kunci_periode dari transformasi
+        id_waktu = int(df_waktu['id_waktu'].iloc[0])
+        peta = wilayah.astype({k: str for k in kunci}).merge(df_wilayah, on=kunci, suffixes=('_lokal', ''))
+        id_global = dict(zip(peta['id_wilayah_lokal'], peta['id_wilayah']))
+        daftar_fakta.append(df_fact.assign(id_wilayah=df_fact['id_wilayah'].map(id_global)))
+        daftar_waktu.append(df_waktu)
+        daftar_agg.append(df_agg.assign(id_waktu=id_waktu))
+
+    # Kategori nama berbeda antar file; skema diterapkan ulang setelah digabung
+    df_waktu = pd.concat(daftar_waktu, ignore_index=True).sort_values('id_waktu').reset_index(drop=True)
+    return (terapkan_skema(pd.concat(daftar_fakta, ignore_index=True), SKEMA_FAKTA),
+            terapkan_skema(df_wilayah, SKEMA_WILAYAH), terapkan_skema(df_waktu, SKEMA_WAKTU),
+            terapkan_skema(pd.concat(daftar_agg, ignore_index=True), SKEMA_AGREGAT))
@@ -0,0 +1,39 @@
+import gzip
+import io
+
+import pandas as pd
+import pyarrow as pa
+
+# Encoder ekspor: semua mengembalikan bytes agar bisa di-cache dan langsung dikirim ke download_button
+def encode_csv(df):
+    return df.to_csv(index=False).encode('utf-8')
+
+def encode_csv_gz(df):
+    return gzip.compress(encode_csv(df), compresslevel=6)
+
+def encode_parquet(df):
+    buffer = io.BytesIO()
+    try:
+        df.to_parquet(buffer, index=False)
+    except (pa.ArrowInvalid, pa.ArrowTypeError):
+        # Kolom object berisi campuran tipe (mis. angka dan teks) tidak punya tipe Arrow; ditulis sebagai teks
+        kolom_object = df.select_dtypes(include='object').columns
+        buffer = io.BytesIO()
+        df.astype({kolom: str for kolom in kolom_object}).to_parquet(buffer, index=False)
+    return buffer.getvalue()
+
+def encode_xlsx(sheets):
+    # sheets: {nama_sheet: DataFrame}, ditulis sebagai satu workbook multi-sheet
+    buffer = io.BytesIO()
+    with pd.ExcelWriter(buffer, engine='openpyxl') as writer:
+        for nama_sheet, df in sheets.items():
+            df.to_excel(writer, sheet_name=nama_sheet[:31], index=False)
+    return buffer.getvalue()
+
+# format -> (ekstensi file, mime type, encoder)
+FORMAT_EKSPOR = {
+    "CSV": ("csv", "text/csv", encode_csv),
+    "CSV.gz": ("csv.gz", "application/gzip", encode_csv_gz),
+    "Parquet": ("parquet", "application/vnd.apache.parquet", encode_parquet),
+}
+MIME_XLSX = "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
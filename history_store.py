@@ -0,0 +1,359 @@
+import numbers
+import os
+import tempfile
+import threading
+from contextlib import contextmanager
+
+import pandas as pd
+from pyarrow import feather
+
+from etl import (BULAN_ANGKA, KOLOM_JUMLAH_AGREGAT, SKEMA_AGREGAT, SKEMA_FAKTA, SKEMA_WAKTU, SKEMA_WILAYAH,
+                 agregasi_kecamatan, kunci_periode, lengkapi_agregat, terapkan_skema)
+import sql_store
+
+try:
+    import fcntl
+except ImportError:  # Windows: hanya lock antar-thread
+    fcntl = None
+
+# Penyimpanan riwayat multi-periode dalam bentuk star schema (Arrow IPC / Feather v2):
+#
+#   <root>/dim_waktu.arrow
+#   <root>/dim_wilayah.arrow
+#   <root>/fact_gizi_balita/tahun=2025/bulan=08/part-0.arrow
+#   <root>/agg_kecamatan/tahun=2025/bulan=08/part-0.arrow   (agregat kecamatan, dimaterialisasi)
+#   <root>/tren_kecamatan.arrow                              (rollup semua periode untuk tab tren)
+#
+# id_waktu setiap periode adalah kunci YYYYMM (etl.kunci_periode), sama dengan id periode itu di dataset
+# upload dan ekspornya. Upload ulang untuk bulan yang sama menimpa partisinya dengan id_waktu yang sama.
+# Store lama dengan surrogate key berurutan (1, 2, ...) dimigrasi sekali saat dim_waktu dibaca.
+#
+# File ditulis tanpa kompresi agar bisa di-memory-map: kolom numerik dibaca langsung dari page cache
+# (zero-copy), dan beberapa proses worker berbagi halaman yang sama. Store lama berformat Parquet
+# (file .parquet di lokasi yang sama) tetap terbaca; partisi yang ditulis ulang menjadi .arrow.
+DEFAULT_STORE_DIR = os.environ.get(
+    "STUNTING_STORE_DIR",
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "data_store")
+)
+
+FACT_DIR = "fact_gizi_balita"
+AGG_KECAMATAN_DIR = "agg_kecamatan"
+EKSTENSI = ".arrow"
+EKSTENSI_LAMA = ".parquet"
+DIM_WAKTU_FILE = "dim_waktu" + EKSTENSI
+DIM_WILAYAH_FILE = "dim_wilayah" + EKSTENSI
+TREN_KECAMATAN_FILE = "tren_kecamatan" + EKSTENSI
+
+# Backend SQL opsional (<root>/star_schema.sqlite): setiap periode yang disimpan ikut dimuat ke database,
+# dan agregat lintas periode (tren di tab Tren Bulanan lewat muat_tren, serta muat_agregat untuk
+# semua/beberapa periode) dijalankan sebagai GROUP BY di sana alih-alih membaca setiap partisi ke pandas.
+# Agregat satu periode tetap dibaca dari partisinya yang sudah dimaterialisasi.
+SQL_BACKEND = os.environ.get("STUNTING_SQL_BACKEND", "0") == "1"
+SQL_DB_FILE = "star_schema.sqlite"
+
+KOLOM_DIM_WAKTU = ['id_waktu', 'tahun', 'bulan', 'tanggal', 'jam', 'menit']
+KOLOM_DIM_WILAYAH = ['id_wilayah', 'nama_puskesmas', 'nama_kecamatan']
+KOLOM_TREN = (['id_waktu', 'tahun', 'bulan', 'nama_kecamatan'] + KOLOM_JUMLAH_AGREGAT +
+              ['persentase_stunting', 'persentase_kurang_gizi', 'persentase_wasting'])
+
+# Penulisan store adalah read-modify-write (dim_waktu, dim_wilayah, rollup tren). Sesi Streamlit adalah
+# thread dalam satu proses, jadi dikunci dengan lock proses; ingest_cli.py berjalan sebagai proses lain,
+# jadi juga dikunci dengan file lock <root>/.lock. Lock bisa diambil ulang oleh thread yang sama
+# (mis. migrasi id_waktu dari muat_dim_waktu di dalam bagian yang sudah terkunci).
+LOCK_FILE = ".lock"
+_lock_tulis = threading.RLock()
+_lokal = threading.local()
+
+@contextmanager
+def _kunci_store(root):
+    with _lock_tulis:
+        dipegang = _lokal.__dict__.setdefault('root_terkunci', set())
+        if root in dipegang:
+            yield
+            return
+        dipegang.add(root)
+        try:
+            with _kunci_file(root):
+                yield
+        finally:
+            dipegang.discard(root)
+
+@contextmanager
+def _kunci_file(root):
+    os.makedirs(root, exist_ok=True)
+    with open(os.path.join(root, LOCK_FILE), 'a') as f:
+        if fcntl is not None:
+            fcntl.flock(f, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+def _tulis_tabel(df, path):
+    # Tulis ke file sementara (nama unik) lalu rename agar pembaca tidak melihat file setengah jadi.
+    # Di POSIX pembaca yang masih me-map file lama tetap memegang versi lamanya.
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix=os.path.basename(path) + ".", suffix=".tmp")
+    os.close(fd)
+    try:
+        feather.write_feather(df.reset_index(drop=True), tmp_path, compression='uncompressed')
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    lama = _path_lama(path)
+    if os.path.exists(lama):
+        os.remove(lama)
+
+def _path_lama(path):
+    return path[:-len(EKSTENSI)] + EKSTENSI_LAMA
+
+def _ada(path):
+    return os.path.exists(path) or os.path.exists(_path_lama(path))
+
+def _baca_tabel(path, kolom=None):
+    if os.path.exists(path):
+        # split_blocks: setiap kolom jadi blok sendiri sehingga kolom numerik tanpa null tidak disalin
+        return feather.read_table(path, memory_map=True).to_pandas(split_blocks=True)
+    if os.path.exists(_path_lama(path)):
+        return pd.read_parquet(_path_lama(path))
+    return pd.DataFrame(columns=kolom)
+
+def path_partisi(tahun, bulan, root=DEFAULT_STORE_DIR, tabel=FACT_DIR):
+    bulan_angka = BULAN_ANGKA.get(bulan, 0)
+    return os.path.join(root, tabel, f"tahun={int(tahun)}", f"bulan={bulan_angka:02d}", "part-0" + EKSTENSI)
+
+def versi_store(root=DEFAULT_STORE_DIR):
+    # Berubah setiap kali ada periode yang ditambahkan/ditimpa; dipakai sebagai kunci cache
+    path = os.path.join(root, DIM_WAKTU_FILE)
+    if not os.path.exists(path):
+        path = _path_lama(path)
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+
+def _versi_file(path):
+    if not os.path.exists(path):
+        path = _path_lama(path)
+    return os.stat(path).st_mtime_ns if os.path.exists(path) else 0
+
+def path_sql(root=DEFAULT_STORE_DIR):
+    return os.path.join(root, SQL_DB_FILE)
+
+def sinkronkan_sql(root=DEFAULT_STORE_DIR, dim_waktu=None):
+    # Muat ke database partisi yang belum ada atau sudah ditulis ulang sejak dimuat (mis. disimpan
+    # saat backend SQL nonaktif), lalu buang periode yang sudah tidak ada di store
+    dim_waktu = muat_dim_waktu(root) if dim_waktu is None else dim_waktu
+    path = path_sql(root)
+    sudah = sql_store.versi_partisi(path)
+    dim_wilayah = None
+    for row in dim_waktu.itertuples():
+        path_fakta = path_partisi(row.tahun, row.bulan, root)
+        versi = _versi_file(path_fakta)
+        if sudah.get(int(row.id_waktu)) == versi:
+            continue
+        dim_wilayah = muat_dim_wilayah(root) if dim_wilayah is None else dim_wilayah
+        baris_waktu = dim_waktu[dim_waktu['id_waktu'] == row.id_waktu]
+        sql_store.simpan_periode(path, _baca_tabel(path_fakta), dim_wilayah, baris_waktu, versi)
+    if set(sudah) - set(dim_waktu['id_waktu'].astype(int)):
+        sql_store.hapus_periode_lain(path, dim_waktu['id_waktu'])
+
+def muat_dim_waktu(root=DEFAULT_STORE_DIR):
+    dim_waktu = _baca_dim_waktu(root)
+    if (dim_waktu['id_waktu'].astype(int) != _kunci_waktu(dim_waktu)).any():
+        with _kunci_store(root):
+            dim_waktu = _migrasi_id_waktu(root)
+    return dim_waktu
+
+def _kunci_waktu(dim_waktu):
+    # kunci_periode (YYYYMM) untuk setiap baris dim_waktu
+    return dim_waktu['tahun'].astype(int) * 100 + dim_waktu['bulan'].map(BULAN_ANGKA).fillna(0).astype(int)
+
+def _baca_dim_waktu(root):
+    df_waktu = _baca_tabel(os.path.join(root, DIM_WAKTU_FILE), KOLOM_DIM_WAKTU)
+    if df_waktu.empty:
+        return df_waktu
+    df_waktu = terapkan_skema(df_waktu, SKEMA_WAKTU)
+    return df_waktu.assign(_urutan=_kunci_waktu(df_waktu)).sort_values('_urutan').drop(columns='_urutan').reset_index(drop=True)
+
+def _migrasi_id_waktu(root):
+    # Store lama: surrogate key berurutan diganti kunci YYYYMM. Partisi fakta dan rollup tren ditulis ulang,
+    # dim_waktu terakhir (penanda versi store); database SQL menyusul lewat sinkronkan_sql karena versi
+    # partisinya berubah. Dipanggil di dalam _kunci_store dan aman diulang jika sempat terhenti.
+    dim_waktu = _baca_dim_waktu(root)
+    kunci = _kunci_waktu(dim_waktu)
+    lama = dim_waktu['id_waktu'].astype(int) != kunci
+    if not lama.any():
+        return dim_waktu
+    peta_id = dict(zip(dim_waktu['id_waktu'].astype(int), kunci.astype(int)))
+    for row in dim_waktu[lama].itertuples():
+        path_fakta = path_partisi(row.tahun, row.bulan, root)
+        if _ada(path_fakta):
+            fakta = _baca_tabel(path_fakta)
+            _tulis_tabel(terapkan_skema(fakta.assign(id_waktu=peta_id[int(row.id_waktu)]), SKEMA_FAKTA), path_fakta)
+    path_tren = os.path.join(root, TREN_KECAMATAN_FILE)
+    if _ada(path_tren):
+        # Baris yang id lamanya tidak dikenal dibuang; muat_tren mengisinya lagi dari agregat partisi
+        tren = _baca_tabel(path_tren, KOLOM_TREN)
+        tren = tren[tren['id_waktu'].astype(int).isin(peta_id)]
+        _tulis_tabel(tren.assign(id_waktu=tren['id_waktu'].astype(int).map(peta_id)), path_tren)
+    _tulis_tabel(terapkan_skema(dim_waktu.assign(id_waktu=kunci), SKEMA_WAKTU), os.path.join(root, DIM_WAKTU_FILE))
+    return _baca_dim_waktu(root)
+
+def muat_dim_wilayah(root=DEFAULT_STORE_DIR):
+    return terapkan_skema(_baca_tabel(os.path.join(root, DIM_WILAYAH_FILE), KOLOM_DIM_WILAYAH), SKEMA_WILAYAH)
+
+def _baris_tren(df_agg, id_waktu, tahun, bulan):
+    # Satu periode agregat kecamatan dalam bentuk baris rollup tren
+    return df_agg.assign(id_waktu=int(id_waktu), tahun=int(tahun), bulan=bulan)[KOLOM_TREN]
+
+def _perbarui_tren(tren, baris_baru, id_waktu):
+    # Ganti baris periode id_waktu (jika upload ulang bulan yang sama) lalu tambahkan yang baru
+    tren = tren[tren['id_waktu'] != id_waktu]
+    return pd.concat([tren, baris_baru], ignore_index=True) if len(tren) else baris_baru.reset_index(drop=True)
+
+def simpan_periode(df_fact, df_wilayah, df_waktu, root=DEFAULT_STORE_DIR):
+    # Menambahkan hasil proses_etl (satu periode) ke store, mengembalikan id_waktu (kunci_periode)
+    with _kunci_store(root):
+        return _simpan_periode(df_fact, df_wilayah, df_waktu, root)
+
+def _simpan_periode(df_fact, df_wilayah, df_waktu, root):
+    dim_waktu = _migrasi_id_waktu(root)
+    dim_wilayah = muat_dim_wilayah(root)
+
+    periode = df_waktu.iloc[0]
+    tahun, bulan = int(periode['tahun']), periode['bulan']
+
+    # Kunci periode YYYYMM: upload ulang bulan yang sama menggantikan baris dim_waktu-nya
+    id_waktu = kunci_periode(df_waktu)
+    dim_waktu = dim_waktu[dim_waktu['id_waktu'].astype(int) != id_waktu]
+
+    baris_waktu = df_waktu[KOLOM_DIM_WAKTU].iloc[[0]].copy()
+    baris_waktu['id_waktu'] = id_waktu
+    dim_waktu = pd.concat([dim_waktu, baris_waktu], ignore_index=True) if len(dim_waktu) else baris_waktu
+
+    # Surrogate key wilayah: cocokkan (puskesmas, kecamatan), tambahkan id baru untuk yang belum ada
+    kunci = ['nama_puskesmas', 'nama_kecamatan']
+    peta_wilayah = df_wilayah.merge(dim_wilayah, on=kunci, how='left', suffixes=('_lokal', ''))
+    baru = peta_wilayah['id_wilayah'].isna()
+    if baru.any():
+        id_awal = int(dim_wilayah['id_wilayah'].max()) + 1 if len(dim_wilayah) else 1
+        peta_wilayah.loc[baru, 'id_wilayah'] = range(id_awal, id_awal + int(baru.sum()))
+        wilayah_baru = peta_wilayah.loc[baru, KOLOM_DIM_WILAYAH]
+        dim_wilayah = pd.concat([dim_wilayah, wilayah_baru], ignore_index=True) if len(dim_wilayah) else wilayah_baru
+    dim_wilayah = terapkan_skema(dim_wilayah.astype({'id_wilayah': int}), SKEMA_WILAYAH)
+    id_global = dict(zip(peta_wilayah['id_wilayah_lokal'], peta_wilayah['id_wilayah'].astype(int)))
+
+    fact = df_fact.copy()
+    fact['id_wilayah'] = fact['id_wilayah'].map(id_global)
+    fact['id_waktu'] = id_waktu
+    fact = terapkan_skema(fact, SKEMA_FAKTA)
+
+    # Partisi fakta dan agregatnya ditulis lebih dulu; dim_waktu terakhir karena menjadi penanda versi store.
+    # Hanya agregat periode baru yang dihitung, periode lain tidak disentuh.
+    df_agg = agregasi_kecamatan(fact)
+    _tulis_tabel(fact, path_partisi(tahun, bulan, root))
+    _tulis_tabel(df_agg, path_partisi(tahun, bulan, root, AGG_KECAMATAN_DIR))
+    path_tren = os.path.join(root, TREN_KECAMATAN_FILE)
+    tren = _perbarui_tren(_baca_tabel(path_tren, KOLOM_TREN), _baris_tren(df_agg, id_waktu, tahun, bulan), id_waktu)
+    _tulis_tabel(tren, path_tren)
+    _tulis_tabel(dim_wilayah.reset_index(drop=True), os.path.join(root, DIM_WILAYAH_FILE))
+    if SQL_BACKEND:
+        sql_store.simpan_periode(path_sql(root), fact, dim_wilayah, baris_waktu,
+                                 _versi_file(path_partisi(tahun, bulan, root)))
+    _tulis_tabel(dim_waktu.reset_index(drop=True), os.path.join(root, DIM_WAKTU_FILE))
+    return id_waktu
+
+def muat_riwayat(id_waktu=None, root=DEFAULT_STORE_DIR):
+    # Membaca hanya partisi periode yang diminta (semua periode jika id_waktu None)
+    dim_waktu = muat_dim_waktu(root)
+    if id_waktu is not None:
+        daftar_id = [id_waktu] if isinstance(id_waktu, numbers.Integral) else list(id_waktu)
+        dim_waktu = dim_waktu[dim_waktu['id_waktu'].isin(daftar_id)].reset_index(drop=True)
+
+    potongan = [_baca_tabel(path_partisi(row.tahun, row.bulan, root)) for row in dim_waktu.itertuples()]
+    if not potongan:
+        return None, None, dim_waktu
+    # Kategori nama bisa berbeda antar partisi; skema diterapkan ulang setelah digabung
+    df_fact = terapkan_skema(pd.concat(potongan, ignore_index=True), SKEMA_FAKTA)
+
+    dim_wilayah = muat_dim_wilayah(root)
+    df_wilayah = dim_wilayah[dim_wilayah['id_wilayah'].isin(df_fact['id_wilayah'].unique())].reset_index(drop=True)
+    return df_fact, df_wilayah, dim_waktu
+
+def muat_agregat(id_waktu=None, root=DEFAULT_STORE_DIR):
+    # Agregat satu periode sudah dimaterialisasi per partisi (periode lama yang belum punya agregat
+    # dihitung dari partisi faktanya sekali lalu disimpan); backend SQL dipakai untuk lintas periode
+    if SQL_BACKEND and not isinstance(id_waktu, numbers.Integral):
+        return _muat_agregat_sql(id_waktu, root)
+    dim_waktu = muat_dim_waktu(root)
+    if id_waktu is not None:
+        daftar_id = [id_waktu] if isinstance(id_waktu, numbers.Integral) else list(id_waktu)
+        dim_waktu = dim_waktu[dim_waktu['id_waktu'].isin(daftar_id)]
+
+    potongan = []
+    for row in dim_waktu.itertuples():
+        path_agg = path_partisi(row.tahun, row.bulan, root, AGG_KECAMATAN_DIR)
+        if _ada(path_agg):
+            df_agg = _baca_tabel(path_agg)
+        else:
+            df_agg = agregasi_kecamatan(_baca_tabel(path_partisi(row.tahun, row.bulan, root)))
+            _tulis_tabel(df_agg, path_agg)
+        potongan.append(df_agg.assign(id_waktu=int(row.id_waktu)) if id_waktu is None else df_agg)
+    if not potongan:
+        return None
+    return terapkan_skema(pd.concat(potongan, ignore_index=True), SKEMA_AGREGAT)
+
+def _muat_agregat_sql(id_waktu, root):
+    dim_waktu = muat_dim_waktu(root)
+    if dim_waktu.empty:
+        return None
+    sinkronkan_sql(root, dim_waktu)
+    df_jumlah = sql_store.jumlah_per_kecamatan(path_sql(root), id_waktu)
+    if df_jumlah.empty:
+        return None
+    # Bentuk kolom sama dengan jalur file: id_waktu hanya disertakan (di akhir) jika semua periode diminta
+    df_agg = lengkapi_agregat(df_jumlah[['nama_kecamatan'] + KOLOM_JUMLAH_AGREGAT])
+    if id_waktu is None:
+        df_agg = df_agg.assign(id_waktu=df_jumlah['id_waktu'].to_numpy())
+    return terapkan_skema(df_agg, SKEMA_AGREGAT)
+
+def muat_tren(root=DEFAULT_STORE_DIR):
+    # Rollup tren semua periode dari satu file kecil. Periode yang belum masuk rollup (store lama)
+    # diisi dari agregat partisinya sekali lalu rollup ditulis ulang.
+    # Dengan backend SQL, tren (tab Tren Bulanan) dihitung dari agg_kecamatan di database.
+    dim_waktu = muat_dim_waktu(root)
+    if SQL_BACKEND and len(dim_waktu):
+        return _muat_tren_sql(root, dim_waktu)
+    path_tren = os.path.join(root, TREN_KECAMATAN_FILE)
+    tren = _baca_tabel(path_tren, KOLOM_TREN)
+
+    if (~dim_waktu['id_waktu'].isin(tren['id_waktu'])).any():
+        with _kunci_store(root):
+            # Dibaca ulang di dalam lock: simpan_periode lain mungkin sudah memperbarui rollup
+            dim_waktu = _migrasi_id_waktu(root)
+            tren = _baca_tabel(path_tren, KOLOM_TREN)
+            belum_ada = dim_waktu[~dim_waktu['id_waktu'].isin(tren['id_waktu'])]
+            for row in belum_ada.itertuples():
+                baris = _baris_tren(muat_agregat(int(row.id_waktu), root), row.id_waktu, row.tahun, row.bulan)
+                tren = _perbarui_tren(tren, baris, int(row.id_waktu))
+            if len(belum_ada):
+                _tulis_tabel(tren, path_tren)
+
+    # Hanya periode yang sudah tercatat di dim_waktu, urut kronologis
+    return lengkapi_tren(tren[tren['id_waktu'].isin(dim_waktu['id_waktu'])])
+
+def _muat_tren_sql(root, dim_waktu):
+    sinkronkan_sql(root, dim_waktu)
+    df_jumlah = sql_store.jumlah_per_kecamatan(path_sql(root))
+    return lengkapi_tren(lengkapi_agregat(df_jumlah)[KOLOM_TREN])
+
+def lengkapi_tren(tren):
+    # Baris KOLOM_TREN -> frame tren siap plot (kolom periode, urut kronologis); dipakai juga untuk
+    # gabungan beberapa upload yang tidak berasal dari store
+    periode = pd.to_datetime(pd.DataFrame({
+        'year': tren['tahun'].astype(int),
+        'month': tren['bulan'].map(BULAN_ANGKA).fillna(1).astype(int),
+        'day': 1
+    }))
+    tren = terapkan_skema(tren.assign(periode=periode), SKEMA_AGREGAT)
+    return tren.sort_values(['periode', 'nama_kecamatan']).reset_index(drop=True)
@@ -0,0 +1,89 @@
+# Ingestion batch dari banyak file ekspor "STATUS GIZI" ke store riwayat, tanpa Streamlit.
+#
+#   python ingest_cli.py data/2024/ "data/2025/*.xlsx" --workers 4
+#   python ingest_cli.py ekspor/ --store /srv/stunting/data_store
+#   python ingest_cli.py ekspor/ --sql    (ikut memuat ke backend SQL, lihat history_store.SQL_BACKEND)
+import argparse
+import glob
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from etl import LaporanValidasi, buka_status_gizi, parse_timestamp_judul, transformasi_status_gizi, validasi_status_gizi
+import history_store
+
+def kumpulkan_file(sumber_list):
+    # Direktori -> semua .xlsx di dalamnya; selain itu diperlakukan sebagai pola glob
+    hasil = []
+    for sumber in sumber_list:
+        if os.path.isdir(sumber):
+            pola = os.path.join(sumber, '**', '*.xlsx')
+            hasil.extend(glob.glob(pola, recursive=True))
+        else:
+            hasil.extend(glob.glob(sumber, recursive=True))
+    # Abaikan file lock Excel (~$nama.xlsx) dan duplikat path
+    hasil = [p for p in hasil if not os.path.basename(p).startswith('~$')]
+    return sorted(set(os.path.abspath(p) for p in hasil))
+
+def proses_file(path):
+    # Dijalankan di proses worker: logika yang sama dengan proses_etl, ditambah timestamp judul
+    mulai = time.perf_counter()
+    laporan = LaporanValidasi()
+    try:
+        title_cell, baris_data = buka_status_gizi(path)
+        baris_valid = validasi_status_gizi(title_cell, baris_data, laporan)
+        df_fact, df_wilayah, df_waktu = transformasi_status_gizi(title_cell, baris_valid)
+        timestamp = parse_timestamp_judul(title_cell) or str(title_cell)
+        return path, timestamp, (df_fact, df_wilayah, df_waktu), None, laporan, time.perf_counter() - mulai
+    except Exception as e:
+        return path, None, None, f"Error: {str(e)}", laporan, time.perf_counter() - mulai
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Ingestion batch file STATUS GIZI ke store riwayat.")
+    parser.add_argument('sumber', nargs='+', help="Direktori atau pola glob file .xlsx")
+    parser.add_argument('--store', default=history_store.DEFAULT_STORE_DIR, help="Direktori store riwayat")
+    parser.add_argument('--workers', type=int, default=os.cpu_count(), help="Jumlah proses worker")
+    parser.add_argument('--sql', action='store_true', help="Muat juga ke backend SQL (star_schema.sqlite di store)")
+    args = parser.parse_args(argv)
+    if args.sql:
+        history_store.SQL_BACKEND = True
+
+    daftar_file = kumpulkan_file(args.sumber)
+    if not daftar_file:
+        print("Tidak ada file .xlsx yang ditemukan.", file=sys.stderr)
+        return 1
+
+    print(f"Memproses {len(daftar_file)} file dengan {args.workers} worker...")
+    mulai = time.perf_counter()
+    hasil_per_timestamp = {}
+    jumlah_gagal = 0
+    jumlah_duplikat = 0
+
+    with ProcessPoolExecutor(max_workers=args.workers) as executor:
+        for path, timestamp, hasil, error, laporan, durasi in executor.map(proses_file, daftar_file):
+            nama = os.path.relpath(path)
+            if error:
+                jumlah_gagal += 1
+                print(f"  GAGAL     {durasi * 1000:8.1f} ms  {nama}: {error}")
+            elif timestamp in hasil_per_timestamp:
+                jumlah_duplikat += 1
+                print(f"  DUPLIKAT  {durasi * 1000:8.1f} ms  {nama} (sama dengan {os.path.relpath(hasil_per_timestamp[timestamp][0])})")
+            else:
+                hasil_per_timestamp[timestamp] = (path, hasil)
+                peringatan = f", {laporan.jumlah_peringatan} peringatan" if laporan.jumlah_peringatan else ""
+                print(f"  OK        {durasi * 1000:8.1f} ms  {nama} [{timestamp}, {len(hasil[0])} baris{peringatan}]")
+
+    # Ditulis berurutan dari timestamp terlama, sehingga ekspor terbaru untuk bulan yang sama yang tersimpan
+    for timestamp in sorted(hasil_per_timestamp):
+        df_fact, df_wilayah, df_waktu = hasil_per_timestamp[timestamp][1]
+        history_store.simpan_periode(df_fact, df_wilayah, df_waktu, root=args.store)
+
+    durasi_total = time.perf_counter() - mulai
+    print(f"Selesai: {len(hasil_per_timestamp)} periode disimpan, {jumlah_duplikat} duplikat, "
+          f"{jumlah_gagal} gagal dalam {durasi_total:.2f} s "
+          f"({len(daftar_file) / durasi_total:.1f} file/detik) -> {args.store}")
+    return 1 if jumlah_gagal else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,100 @@
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Jumlah thread ETL latar untuk seluruh proses Streamlit
+ETL_WORKER_MAKS = int(os.environ.get("STUNTING_ETL_WORKERS", "2"))
+
+# Satu pekerjaan ETL (parsing satu workbook) yang berjalan di thread latar. Progres ditulis oleh
+# thread pekerja dan dibaca sesi yang melakukan polling; nilainya hanya atribut sederhana
+# (nama tahap, laporan validasi yang menghitung baris), jadi dibaca tanpa lock.
+class Pekerjaan:
+    def __init__(self, id_pekerjaan):
+        self.id_pekerjaan = id_pekerjaan
+        self.tahap = 'antre'
+        self.laporan = None
+        self.dikirim = time.monotonic()
+        self.mulai = None
+        self.selesai_pada = None
+        self.future = None
+
+    def lapor_tahap(self, nama_tahap):
+        self.tahap = nama_tahap
+
+    @property
+    def baris_dibaca(self):
+        return self.laporan.baris_diperiksa if self.laporan is not None else 0
+
+    @property
+    def selesai(self):
+        return self.future is not None and self.future.done()
+
+    @property
+    def durasi(self):
+        akhir = self.selesai_pada or time.monotonic()
+        return akhir - (self.mulai or akhir)
+
+    def hasil(self):
+        # Mengangkat ulang exception dari thread pekerja
+        return self.future.result()
+
+# Pool ETL untuk seluruh proses: pekerjaan diberi id (hash file), jadi file yang sama dikirim berkali-kali
+# (rerun karena klik pengguna, atau sesi lain yang meng-upload file yang sama) tetap diparse sekali.
+# Pekerjaan yang selesai disimpan sampai diambil (lupakan) atau lebih lama dari ttl detik.
+class PekerjaETL:
+    def __init__(self, maks_worker=ETL_WORKER_MAKS, ttl=3600):
+        self.ttl = ttl
+        self._pool = ThreadPoolExecutor(max_workers=maks_worker, thread_name_prefix='etl')
+        self._pekerjaan = {}
+        self._lock = threading.Lock()
+        self.dijalankan = 0
+
+    def kirim(self, id_pekerjaan, fungsi):
+        # fungsi(pekerjaan) dijalankan di thread pekerja dan melaporkan progres lewat objek pekerjaan
+        with self._lock:
+            self._bersihkan(time.monotonic())
+            pekerjaan = self._pekerjaan.get(id_pekerjaan)
+            if pekerjaan is not None:
+                return pekerjaan
+            pekerjaan = Pekerjaan(id_pekerjaan)
+            # Context sesi pengirim ikut dibawa, jadi tahap ETL tercatat di profiler sesi tersebut
+            konteks = contextvars.copy_context()
+            pekerjaan.future = self._pool.submit(konteks.run, self._jalankan, pekerjaan, fungsi)
+            self._pekerjaan[id_pekerjaan] = pekerjaan
+            self.dijalankan += 1
+            return pekerjaan
+
+    @staticmethod
+    def _jalankan(pekerjaan, fungsi):
+        pekerjaan.mulai = time.monotonic()
+        try:
+            return fungsi(pekerjaan)
+        finally:
+            pekerjaan.selesai_pada = time.monotonic()
+            pekerjaan.tahap = 'selesai'
+
+    def ambil(self, id_pekerjaan):
+        with self._lock:
+            return self._pekerjaan.get(id_pekerjaan)
+
+    def lupakan(self, id_pekerjaan):
+        with self._lock:
+            self._pekerjaan.pop(id_pekerjaan, None)
+
+    def _bersihkan(self, sekarang):
+        for id_pekerjaan, pekerjaan in list(self._pekerjaan.items()):
+            if pekerjaan.selesai and sekarang - pekerjaan.selesai_pada > self.ttl:
+                del self._pekerjaan[id_pekerjaan]
+
+    def statistik(self):
+        with self._lock:
+            return [
+                {'id_pekerjaan': id_pekerjaan, 'tahap': pekerjaan.tahap, 'baris': pekerjaan.baris_dibaca,
+                 'detik': round(pekerjaan.durasi, 2)}
+                for id_pekerjaan, pekerjaan in self._pekerjaan.items()
+            ]
+
+    def __len__(self):
+        return len(self._pekerjaan)
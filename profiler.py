@@ -0,0 +1,81 @@
+import contextvars
+import json
+import math
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+# Profil latensi rerun per tahap (opt-in lewat ?profil=1 atau toggle di sidebar, lihat Code_Dashboard.py).
+# Setiap sesi punya satu PencatatProfil di session_state; pencatat sesi yang sedang dijalankan dipasang
+# di context variable, jadi modul lain (etl, charts, dataset_registry) cukup membungkus tahapnya dengan
+# `with tahap(...)` tanpa bergantung pada Streamlit. Tanpa pencatat aktif, tahap() tidak mengukur apa pun.
+MAKS_CATATAN = 5000
+
+class PencatatProfil:
+    def __init__(self, maks_catatan=MAKS_CATATAN):
+        self._catatan = deque(maxlen=maks_catatan)
+        self._lock = threading.Lock()
+        self.rerun = 0
+
+    def mulai_rerun(self):
+        self.rerun += 1
+
+    def catat(self, nama_tahap, ms):
+        with self._lock:
+            self._catatan.append({'waktu': time.time(), 'rerun': self.rerun, 'tahap': nama_tahap, 'ms': round(ms, 3)})
+
+    def catatan(self):
+        with self._lock:
+            return list(self._catatan)
+
+    def kosongkan(self):
+        with self._lock:
+            self._catatan.clear()
+
+    def ringkasan(self):
+        # p50/p95 per tahap (nearest-rank), diurutkan dari p95 terbesar
+        per_tahap = {}
+        for entri in self.catatan():
+            per_tahap.setdefault(entri['tahap'], []).append(entri['ms'])
+        hasil = []
+        for nama_tahap, daftar_ms in per_tahap.items():
+            terakhir = daftar_ms[-1]
+            daftar_ms = sorted(daftar_ms)
+            hasil.append({
+                'tahap': nama_tahap,
+                'n': len(daftar_ms),
+                'p50 (ms)': _persentil(daftar_ms, 0.50),
+                'p95 (ms)': _persentil(daftar_ms, 0.95),
+                'maks (ms)': daftar_ms[-1],
+                'terakhir (ms)': terakhir,
+            })
+        return sorted(hasil, key=lambda baris: -baris['p95 (ms)'])
+
+    def ke_jsonl(self):
+        return "".join(json.dumps(entri) + "\n" for entri in self.catatan())
+
+def _persentil(urut, q):
+    return urut[min(len(urut) - 1, max(0, math.ceil(q * len(urut)) - 1))]
+
+_pencatat_aktif = contextvars.ContextVar('pencatat_profil', default=None)
+
+def pasang(pencatat):
+    # Dipanggil di awal setiap rerun (None = profil nonaktif untuk rerun ini)
+    _pencatat_aktif.set(pencatat)
+
+def aktif():
+    return _pencatat_aktif.get()
+
+@contextmanager
+def tahap(nama_tahap, pencatat=None):
+    # pencatat eksplisit untuk kode yang dijalankan di luar thread skrip (mis. data download_button)
+    pencatat = pencatat or _pencatat_aktif.get()
+    if pencatat is None:
+        yield
+        return
+    mulai = time.perf_counter()
+    try:
+        yield
+    finally:
+        pencatat.catat(nama_tahap, (time.perf_counter() - mulai) * 1000)
@@ -0,0 +1,106 @@
+import numbers
+import sqlite3
+from contextlib import closing
+
+import pandas as pd
+
+from etl import KOLOM_GIZI_DB, KOLOM_JUMLAH_AGREGAT, KOLOM_PERSENTASE
+
+# Backend SQL tertanam (SQLite, modul standar Python) untuk star schema yang sama dengan history store:
+# fact_gizi_balita, dim_wilayah, dim_waktu dengan surrogate key yang sama. Database ini cerminan
+# store file dan dipakai untuk agregasi lintas periode: filter id_waktu dan GROUP BY kecamatan
+# dijalankan oleh engine lewat indeks, hanya hasil per kecamatan yang masuk ke pandas.
+# agg_kecamatan berisi jumlah per (periode, kecamatan) yang dihitung database saat periode dimuat,
+# jadi query lintas periode membaca puluhan baris per periode, bukan seluruh baris fakta.
+# Tabel `partisi` mencatat versi (mtime) partisi fakta yang sudah dimuat, agar partisi yang
+# ditulis ulang di store file ikut dimuat ulang.
+KOLOM_FAKTA_SQL = ['id_waktu', 'id_wilayah', 'nama_kecamatan'] + KOLOM_JUMLAH_AGREGAT + KOLOM_PERSENTASE + KOLOM_GIZI_DB
+KOLOM_DIM_WAKTU_SQL = ['id_waktu', 'tahun', 'bulan', 'tanggal', 'jam', 'menit']
+KOLOM_DIM_WILAYAH_SQL = ['id_wilayah', 'nama_puskesmas', 'nama_kecamatan']
+
+DDL = [
+    """CREATE TABLE IF NOT EXISTS dim_waktu (
+        id_waktu INTEGER PRIMARY KEY, tahun INTEGER NOT NULL, bulan TEXT NOT NULL,
+        tanggal INTEGER, jam INTEGER, menit INTEGER)""",
+    """CREATE TABLE IF NOT EXISTS dim_wilayah (
+        id_wilayah INTEGER PRIMARY KEY, nama_puskesmas TEXT NOT NULL, nama_kecamatan TEXT NOT NULL)""",
+    "CREATE TABLE IF NOT EXISTS fact_gizi_balita (id_waktu INTEGER NOT NULL, id_wilayah INTEGER NOT NULL, "
+    "nama_kecamatan TEXT NOT NULL, "
+    + ", ".join(f"{kolom} INTEGER" for kolom in KOLOM_JUMLAH_AGREGAT) + ", "
+    + ", ".join(f"{kolom} REAL" for kolom in KOLOM_PERSENTASE) + ", "
+    + ", ".join(f"{kolom} INTEGER" for kolom in KOLOM_GIZI_DB) + ")",
+    "CREATE TABLE IF NOT EXISTS agg_kecamatan (id_waktu INTEGER NOT NULL, nama_kecamatan TEXT NOT NULL, "
+    + ", ".join(f"{kolom} INTEGER" for kolom in KOLOM_JUMLAH_AGREGAT)
+    + ", PRIMARY KEY (id_waktu, nama_kecamatan)) WITHOUT ROWID",
+    "CREATE TABLE IF NOT EXISTS partisi (id_waktu INTEGER PRIMARY KEY, versi INTEGER NOT NULL)",
+    # Indeks penutup: GROUP BY kecamatan per periode dijawab dari indeks tanpa membaca baris tabel
+    "CREATE INDEX IF NOT EXISTS idx_fact_waktu_kecamatan ON fact_gizi_balita (id_waktu, nama_kecamatan, "
+    + ", ".join(KOLOM_JUMLAH_AGREGAT) + ")",
+    "CREATE INDEX IF NOT EXISTS idx_fact_wilayah_waktu ON fact_gizi_balita (id_wilayah, id_waktu)",
+    "CREATE INDEX IF NOT EXISTS idx_wilayah_kecamatan ON dim_wilayah (nama_kecamatan)",
+]
+
+def buka(path):
+    # Satu koneksi per operasi: aman dipakai dari thread sesi Streamlit mana pun.
+    # WAL membuat pembaca tidak terblokir saat periode baru sedang dimuat.
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    for perintah in DDL:
+        conn.execute(perintah)
+    return conn
+
+def _baris(df, kolom):
+    # tolist() mengembalikan tipe Python (int/float/str) yang bisa langsung dipakai sqlite3
+    return list(zip(*(df[k].tolist() for k in kolom)))
+
+def _placeholder(kolom):
+    return f"({', '.join(kolom)}) VALUES ({', '.join('?' * len(kolom))})"
+
+def simpan_periode(path, fact, dim_wilayah, baris_waktu, versi):
+    # Bulk load satu periode dalam satu transaksi; periode yang sama dihapus dulu (upload ulang)
+    id_waktu = int(baris_waktu['id_waktu'].iloc[0])
+    with closing(buka(path)) as conn, conn:
+        conn.execute("DELETE FROM fact_gizi_balita WHERE id_waktu = ?", (id_waktu,))
+        conn.execute("DELETE FROM agg_kecamatan WHERE id_waktu = ?", (id_waktu,))
+        conn.executemany(f"INSERT OR REPLACE INTO dim_waktu {_placeholder(KOLOM_DIM_WAKTU_SQL)}",
+                         _baris(baris_waktu, KOLOM_DIM_WAKTU_SQL))
+        conn.executemany(f"INSERT OR REPLACE INTO dim_wilayah {_placeholder(KOLOM_DIM_WILAYAH_SQL)}",
+                         _baris(dim_wilayah, KOLOM_DIM_WILAYAH_SQL))
+        conn.executemany(f"INSERT INTO fact_gizi_balita {_placeholder(KOLOM_FAKTA_SQL)}",
+                         _baris(fact.assign(id_waktu=id_waktu), KOLOM_FAKTA_SQL))
+        kolom_jumlah = ", ".join(KOLOM_JUMLAH_AGREGAT)
+        kolom_sum = ", ".join(f"SUM({kolom})" for kolom in KOLOM_JUMLAH_AGREGAT)
+        conn.execute(f"INSERT INTO agg_kecamatan (id_waktu, nama_kecamatan, {kolom_jumlah}) "
+                     f"SELECT id_waktu, nama_kecamatan, {kolom_sum} FROM fact_gizi_balita "
+                     f"WHERE id_waktu = ? GROUP BY id_waktu, nama_kecamatan", (id_waktu,))
+        conn.execute("INSERT OR REPLACE INTO partisi (id_waktu, versi) VALUES (?, ?)", (id_waktu, versi))
+
+def versi_partisi(path):
+    with closing(buka(path)) as conn:
+        return dict(conn.execute("SELECT id_waktu, versi FROM partisi").fetchall())
+
+def hapus_periode_lain(path, daftar_id):
+    # Periode yang tidak lagi ada di dim_waktu store file
+    daftar_id = [int(i) for i in daftar_id]
+    filter_id = f"id_waktu NOT IN ({', '.join('?' * len(daftar_id))})" if daftar_id else "1"
+    with closing(buka(path)) as conn, conn:
+        for tabel in ('fact_gizi_balita', 'agg_kecamatan', 'dim_waktu', 'partisi'):
+            conn.execute(f"DELETE FROM {tabel} WHERE {filter_id}", daftar_id)
+
+def _filter_waktu(id_waktu):
+    # id_waktu: None (semua periode), satu id (termasuk skalar numpy dari DataFrame), atau daftar id
+    if id_waktu is None:
+        return "", []
+    daftar_id = [int(id_waktu)] if isinstance(id_waktu, numbers.Integral) else [int(i) for i in id_waktu]
+    return f"WHERE a.id_waktu IN ({', '.join('?' * len(daftar_id))})", daftar_id
+
+def jumlah_per_kecamatan(path, id_waktu=None):
+    # Jumlah balita per (periode, kecamatan); filter periode dikerjakan SQLite lewat primary key
+    where, parameter = _filter_waktu(id_waktu)
+    kolom_jumlah = ", ".join(f"a.{kolom}" for kolom in KOLOM_JUMLAH_AGREGAT)
+    query = (f"SELECT a.id_waktu, w.tahun, w.bulan, a.nama_kecamatan, {kolom_jumlah} "
+             f"FROM agg_kecamatan a JOIN dim_waktu w ON w.id_waktu = a.id_waktu {where} "
+             f"ORDER BY a.id_waktu, a.nama_kecamatan")
+    with closing(buka(path)) as conn:
+        return pd.read_sql_query(query, conn, params=parameter)
@@ -0,0 +1,142 @@
+from difflib import get_close_matches
+
+import numpy as np
+import pandas as pd
+
+from etl import KATEGORI_STUNTING
+
+# Kolom tabel kecamatan (tab "Tabel Data"): nama kolom sumber -> judul kolom
+KOLOM_TABEL = {
+    'nama_kecamatan': 'Kecamatan',
+    'jumlah_balita_ditimbang': 'Jml Ditimbang',
+    'jumlah_balita_stunting': 'Jml Stunting',
+    'persentase_stunting': '% Stunting',
+    'jumlah_balita_kurang_gizi': 'Jml Kurang Gizi',
+    'persentase_kurang_gizi': '% Kurang Gizi',
+    'jumlah_balita_wasting': 'Jml Wasting',
+    'persentase_wasting': '% Wasting',
+    'kategori': 'Kategori',
+}
+KOLOM_JUMLAH = ['Jml Ditimbang', 'Jml Stunting', 'Jml Kurang Gizi', 'Jml Wasting']
+KOLOM_PERSEN = ['% Stunting', '% Kurang Gizi', '% Wasting']
+
+# Format tampilan per kolom; nilai di DataFrame tetap numerik
+FORMAT_KOLOM = {**{kolom: '{:,.0f}' for kolom in KOLOM_JUMLAH}, **{kolom: '{:.2f}%' for kolom in KOLOM_PERSEN}}
+
+WARNA_KATEGORI = dict(zip(KATEGORI_STUNTING, ['#ccffcc', '#fff4cc', '#ffe6cc', '#ffcccc']))
+WARNA_KATEGORI_DEFAULT = '#ccffcc'
+PENANDA_KATEGORI = dict(zip(KATEGORI_STUNTING, ['🟢', '🟡', '🟠', '🔴']))
+
+# Di atas jumlah baris ini tabel ditampilkan tanpa pandas Styler (Styler selalu memformat per sel di Python)
+TABEL_STYLER_MAKS_BARIS = 2000
+
+def siapkan_tabel(df_display):
+    return df_display[list(KOLOM_TABEL)].rename(columns=KOLOM_TABEL)
+
+def css_baris_kategori(df_table):
+    # Satu lookup per kategori lalu disebar ke semua kolom, tanpa fungsi Python per baris
+    warna = df_table['Kategori'].map(WARNA_KATEGORI).astype(object).fillna(WARNA_KATEGORI_DEFAULT)
+    css = ('background-color: ' + warna).to_numpy(dtype=object)
+    return pd.DataFrame(np.repeat(css[:, None], df_table.shape[1], axis=1),
+                        index=df_table.index, columns=df_table.columns)
+
+def style_tabel(df_table):
+    return df_table.style.apply(css_baris_kategori, axis=None).format(FORMAT_KOLOM)
+
+def tandai_kategori(df_table):
+    # Pengganti warna baris untuk tabel besar: penanda warna di label kategori (rename kategori, bukan per sel)
+    kategori = df_table['Kategori']
+    if isinstance(kategori.dtype, pd.CategoricalDtype):
+        kategori = kategori.cat.rename_categories(
+            lambda label: f"{PENANDA_KATEGORI.get(label, '')} {label}".strip()
+        )
+    return df_table.assign(Kategori=kategori)
+
+# Pilihan "Urutkan berdasarkan" di tab tabel: label -> (kolom, ascending)
+URUTAN_TABEL = {
+    "Nama Kecamatan": ('nama_kecamatan', True),
+    "% Stunting": ('persentase_stunting', False),
+    "Jml Stunting": ('jumlah_balita_stunting', False),
+    "Jml Ditimbang": ('jumlah_balita_ditimbang', False),
+}
+
+# Batas kemiripan difflib untuk pencarian fuzzy (dipakai jika tidak ada nama yang memuat kata kunci)
+FUZZY_CUTOFF = 0.6
+FUZZY_MAKS_HASIL = 10
+FUZZY_MIN_PANJANG = 3
+
+class IndeksTabel:
+    # Indeks pencarian nama wilayah dan urutan tabel yang dibangun sekali per dataset.
+    # nama_per_baris: pasangan (nama, posisi baris) - satu baris kecamatan bisa punya beberapa nama
+    # (nama kecamatan, nama puskesmas, nanti desa/posyandu).
+    def __init__(self, df_agg, nama_per_baris):
+        pasangan = sorted({(str(nama).upper(), int(posisi)) for nama, posisi in nama_per_baris})
+        self.jumlah_baris = len(df_agg)
+
+        # Suffix array: semua akhiran dari setiap nama, terurut. Pencarian substring (termasuk awalan)
+        # menjadi pencarian awalan di atas akhiran, cukup dua searchsorted per kata kunci.
+        akhiran = np.array([nama[i:] for nama, _ in pasangan for i in range(len(nama))], dtype=str)
+        posisi_akhiran = np.repeat(np.array([posisi for _, posisi in pasangan], dtype=np.int64),
+                                   [len(nama) for nama, _ in pasangan])
+        urut = np.argsort(akhiran, kind='stable')
+        self._akhiran = akhiran[urut]
+        self._posisi_akhiran = posisi_akhiran[urut]
+
+        # Awalan nama utuh (pasangan sudah terurut berdasarkan nama)
+        self._nama = np.array([nama for nama, _ in pasangan], dtype=str)
+        self._posisi_nama = np.array([posisi for _, posisi in pasangan], dtype=np.int64)
+
+        # Kandidat fuzzy: nama utuh dan setiap katanya
+        self._fuzzy = {}
+        for nama, posisi in pasangan:
+            for kunci in {nama, *nama.split()}:
+                self._fuzzy.setdefault(kunci, set()).add(posisi)
+
+        # Urutan baris untuk tiap pilihan sort_by (stabil, jadi hasil filter tidak perlu diurutkan lagi)
+        self.urutan = {
+            label: df_agg[kolom].reset_index(drop=True).sort_values(ascending=ascending, kind='stable').index.to_numpy()
+            for label, (kolom, ascending) in URUTAN_TABEL.items()
+        }
+
+    @staticmethod
+    def _rentang(kunci, teks):
+        return np.searchsorted(kunci, [teks, teks + '\uffff'])
+
+    def awalan(self, teks):
+        awal, akhir = self._rentang(self._nama, teks.upper())
+        return np.unique(self._posisi_nama[awal:akhir])
+
+    def substring(self, teks):
+        awal, akhir = self._rentang(self._akhiran, teks.upper())
+        return np.unique(self._posisi_akhiran[awal:akhir])
+
+    def fuzzy(self, teks):
+        mirip = get_close_matches(teks.upper(), self._fuzzy, n=FUZZY_MAKS_HASIL, cutoff=FUZZY_CUTOFF)
+        return np.array(sorted(set().union(*(self._fuzzy[nama] for nama in mirip))), dtype=np.int64)
+
+    def cari(self, teks):
+        # Kembalikan (posisi baris, True jika hasil berasal dari pencarian fuzzy)
+        teks = teks.strip()
+        if not teks:
+            return np.arange(self.jumlah_baris), False
+        posisi = self.substring(teks)
+        if len(posisi) == 0 and len(teks) >= FUZZY_MIN_PANJANG:
+            return self.fuzzy(teks), True
+        return posisi, False
+
+    def tampilkan(self, teks, sort_by):
+        # Posisi baris hasil pencarian, dalam urutan sort_by yang sudah dihitung
+        posisi, mirip = self.cari(teks)
+        urutan = self.urutan[sort_by]
+        cocok = np.zeros(self.jumlah_baris, dtype=bool)
+        cocok[posisi] = True
+        return urutan[cocok[urutan]], mirip
+
+def buat_indeks_tabel(df_agg, df_wilayah=None):
+    # Nama yang bisa dicari untuk setiap baris agregat: nama kecamatan ditambah nama puskesmas di kecamatan itu
+    posisi_kecamatan = pd.Series(np.arange(len(df_agg)), index=df_agg['nama_kecamatan'].to_numpy())
+    nama_per_baris = list(zip(df_agg['nama_kecamatan'], posisi_kecamatan.to_numpy()))
+    if df_wilayah is not None and 'nama_puskesmas' in df_wilayah.columns:
+        puskesmas = df_wilayah[df_wilayah['nama_kecamatan'].isin(posisi_kecamatan.index)]
+        nama_per_baris += zip(puskesmas['nama_puskesmas'], posisi_kecamatan.loc[puskesmas['nama_kecamatan']].to_numpy())
+    return IndeksTabel(df_agg, nama_per_baris)
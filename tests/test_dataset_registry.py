@@ -0,0 +1,24 @@
+import pytest
+
+from dataset_registry import Dataset, DatasetRegistry
+
+def test_pembuat_gagal_tidak_meninggalkan_lock():
+    registry = DatasetRegistry()
+
+    def meledak():
+        raise RuntimeError("ETL gagal")
+
+    with pytest.raises(RuntimeError):
+        registry.lampirkan("a", "sesi-1", meledak)
+    assert registry._lock_bangun == {}
+    assert not registry.ada("a")
+
+    dataset = registry.lampirkan("a", "sesi-1", lambda: Dataset("a", None, None, None, None))
+    assert registry.ada("a") and registry._lock_bangun == {}
+    assert registry.lampirkan("a", "sesi-2", meledak) is dataset
+
+def test_dataset_gagal_tidak_disimpan():
+    registry = DatasetRegistry()
+    gagal = registry.lampirkan("a", "sesi-1", lambda: Dataset("a", None, None, None, None, False, "Error"))
+    assert not gagal.success
+    assert not registry.ada("a") and registry._lock_bangun == {}
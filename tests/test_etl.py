@@ -0,0 +1,75 @@
+import pandas as pd
+import pytest
+
+from etl import (SKEMA_FAKTA, LaporanValidasi, ValidasiGagal, agregasi_kecamatan, gabung_koordinat, kunci_periode,
+                 terapkan_skema, transformasi_status_gizi, validasi_status_gizi, wilayah_tanpa_koordinat)
+
+JUDUL = "Status Gizi Balita 2025-03-15 10:20:30"
+
+def baris_gizi(nomor, puskesmas, kecamatan, ditimbang=10, stunting=2):
+    # BB/U (5 kolom), TB/U (5 kolom), BB/TB (7 kolom); total tiap kelompok = ditimbang
+    bb_u = [1, 1, ditimbang - 2, 0, 0]
+    tb_u = [stunting, 0, ditimbang - stunting, 0, 0]
+    bb_tb = [0, 1, ditimbang - 1, 0, 0, 0, 0]
+    return nomor, [nomor, puskesmas, kecamatan] + bb_u + tb_u + bb_tb
+
+def proses(daftar_baris):
+    laporan = LaporanValidasi()
+    baris_valid = validasi_status_gizi(JUDUL, iter(daftar_baris), laporan)
+    df_fact, df_wilayah, df_waktu = transformasi_status_gizi(JUDUL, baris_valid)
+    return laporan, df_fact, df_wilayah, df_waktu
+
+def test_nama_kecamatan_dinormalisasi_sebelum_disimpan():
+    laporan, df_fact, df_wilayah, _ = proses([
+        baris_gizi(1, "1. PKM CIGUGUR", "CIGUGUR"),
+        baris_gizi(2, "2. PKM CISANTANA", " cigugur "),
+        baris_gizi(3, "3. PKM DARMA", "Darma"),
+    ])
+    assert laporan.jumlah['KECAMATAN_TIDAK_DIKENAL'] == 0
+    assert sorted(df_wilayah['nama_kecamatan'].astype(str).unique()) == ['CIGUGUR', 'DARMA']
+
+    df_agg = agregasi_kecamatan(df_fact)
+    assert sorted(df_agg['nama_kecamatan'].astype(str)) == ['CIGUGUR', 'DARMA']
+    cigugur = df_agg[df_agg['nama_kecamatan'] == 'CIGUGUR'].iloc[0]
+    assert cigugur['jumlah_balita_ditimbang'] == 20
+    assert cigugur['jumlah_balita_stunting'] == 4
+    assert wilayah_tanpa_koordinat(df_agg) == []
+
+def test_puskesmas_duplikat_dengan_nama_kecamatan_berbeda_format():
+    laporan = LaporanValidasi()
+    daftar_baris = [baris_gizi(1, "PKM X", "CIGUGUR"), baris_gizi(2, "PKM X", " cigugur ")]
+    with pytest.raises(ValidasiGagal):
+        validasi_status_gizi(JUDUL, iter(daftar_baris), laporan)
+    assert laporan.jumlah['PUSKESMAS_DUPLIKAT'] == 1
+
+def test_kecamatan_tidak_dikenal_tetap_dilaporkan():
+    laporan, _, _, _ = proses([baris_gizi(1, "PKM X", "cigugurr")])
+    assert laporan.jumlah['KECAMATAN_TIDAK_DIKENAL'] == 1
+
+def test_nama_tidak_kanonik_tidak_mendapat_koordinat():
+    df = gabung_koordinat(pd.DataFrame({'nama_kecamatan': ['CIGUGUR', ' cigugur ']}))
+    assert df['lat'].notna().tolist() == [True, False]
+    assert wilayah_tanpa_koordinat(df) == [' cigugur ']
+
+def test_jumlah_pecahan_ditolak():
+    nomor, row = baris_gizi(1, "PKM X", "CIGUGUR")
+    row[5] = 12.7
+    laporan = LaporanValidasi()
+    with pytest.raises(ValidasiGagal):
+        validasi_status_gizi(JUDUL, iter([(nomor, row)]), laporan)
+    assert laporan.jumlah['BUKAN_BILANGAN_BULAT'] == 1
+
+def test_skema_tidak_memotong_pecahan():
+    df = terapkan_skema(pd.DataFrame({'jumlah_balita_stunting': [12.7, 3.0],
+                                      'jumlah_balita_ditimbang': [20.0, 10.0]}), SKEMA_FAKTA)
+    assert df['jumlah_balita_stunting'].tolist() == [12.7, 3.0]
+    assert df['jumlah_balita_ditimbang'].dtype == 'uint16'
+
+def test_judul_dengan_bulan_tidak_valid_ditolak():
+    laporan = LaporanValidasi()
+    with pytest.raises(ValidasiGagal):
+        validasi_status_gizi("Status Gizi Balita 2025-13-01 10:20:30", iter([baris_gizi(1, "PKM X", "CIGUGUR")]), laporan)
+    assert laporan.jumlah['JUDUL_TANPA_TANGGAL'] == 1
+
+    with pytest.raises(ValueError):
+        kunci_periode(pd.DataFrame({'tahun': [2025], 'bulan': ['TIDAK DIKETAHUI']}))
@@ -0,0 +1,45 @@
+import os
+
+from pyarrow import feather
+
+import history_store
+from etl import transformasi_status_gizi
+
+def periode_etl(judul):
+    baris = [(1, [1, "PKM CIGUGUR", "CIGUGUR", 1, 1, 8, 0, 0, 2, 0, 8, 0, 0, 0, 1, 9, 0, 0, 0, 0])]
+    return transformasi_status_gizi(judul, baris)
+
+def test_id_waktu_upload_sama_dengan_store(tmp_path):
+    root = str(tmp_path)
+    df_fact, df_wilayah, df_waktu = periode_etl("Status Gizi 2025-03-15 10:20:30")
+    assert df_waktu['id_waktu'].tolist() == [202503]
+    assert df_fact['id_waktu'].unique().tolist() == [202503]
+
+    assert history_store.simpan_periode(df_fact, df_wilayah, df_waktu, root) == 202503
+    # Upload ulang bulan yang sama memakai id yang sama
+    assert history_store.simpan_periode(*periode_etl("Status Gizi 2025-03-20 08:00:00"), root) == 202503
+    assert history_store.muat_dim_waktu(root)['id_waktu'].tolist() == [202503]
+
+def test_store_lama_dimigrasi_ke_kunci_periode(tmp_path):
+    root = str(tmp_path)
+    for judul in ("Status Gizi 2025-01-10 10:00:00", "Status Gizi 2025-02-10 10:00:00"):
+        history_store.simpan_periode(*periode_etl(judul), root)
+    tren_awal = history_store.muat_tren(root)
+
+    # Tiru store lama: surrogate key berurutan di dim_waktu, partisi fakta, dan rollup tren
+    peta_lama = {202501: 1, 202502: 2}
+    for nama in (history_store.DIM_WAKTU_FILE, history_store.TREN_KECAMATAN_FILE):
+        path = os.path.join(root, nama)
+        df = feather.read_table(path).to_pandas()
+        feather.write_feather(df.assign(id_waktu=df['id_waktu'].map(peta_lama)), path)
+    for bulan in ('JANUARI', 'FEBRUARI'):
+        path = history_store.path_partisi(2025, bulan, root)
+        df = feather.read_table(path).to_pandas()
+        feather.write_feather(df.assign(id_waktu=df['id_waktu'].map(peta_lama)), path)
+
+    assert history_store.muat_dim_waktu(root)['id_waktu'].tolist() == [202501, 202502]
+    df_fact, _, _ = history_store.muat_riwayat(202502, root)
+    assert df_fact['id_waktu'].unique().tolist() == [202502]
+    tren = history_store.muat_tren(root)
+    assert tren['id_waktu'].tolist() == tren_awal['id_waktu'].tolist()
+    assert tren['jumlah_balita_stunting'].tolist() == tren_awal['jumlah_balita_stunting'].tolist()
@@ -0,0 +1,23 @@
+import numpy as np
+
+import history_store
+import sql_store
+from test_history_store import periode_etl
+
+def test_filter_periode_menerima_skalar_numpy(tmp_path):
+    root = str(tmp_path)
+    for judul in ("Status Gizi 2025-01-10 10:00:00", "Status Gizi 2025-02-10 10:00:00"):
+        history_store.simpan_periode(*periode_etl(judul), root)
+    history_store.sinkronkan_sql(root)
+    path = history_store.path_sql(root)
+
+    id_waktu = history_store.muat_dim_waktu(root)['id_waktu'].iloc[-1]
+    assert isinstance(id_waktu, np.integer)
+    for kunci in (id_waktu, np.int64(id_waktu), int(id_waktu), [id_waktu]):
+        hasil = sql_store.jumlah_per_kecamatan(path, kunci)
+        assert hasil['id_waktu'].tolist() == [202502]
+    assert sql_store.jumlah_per_kecamatan(path)['id_waktu'].tolist() == [202501, 202502]
+
+    df_fact, _, _ = history_store.muat_riwayat(id_waktu, root)
+    assert df_fact['id_waktu'].unique().tolist() == [202502]
+    assert len(history_store.muat_agregat(id_waktu, root)) == 1